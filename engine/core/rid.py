@@ -45,7 +45,8 @@ class RID:
         return self._id >= other._id
 
     def __hash__(self):
-        return hash(self._id)
+        # Ids are small non-negative ints, which already hash to themselves
+        return self._id
 
     def __repr__(self):
         return f"RID({self._id})"
\ No newline at end of file
@@ -1,6 +1,9 @@
 from __future__ import annotations
+from typing import Sequence
 from engine.math.datatypes.vector3 import Vector3
 
+_AXIS_ORDERS = ((0, 1, 2), (1, 2, 0), (2, 0, 1))
+
 
 class AABB:
     """
@@ -28,5 +31,94 @@ class AABB:
             or self.position.z >= other.end.z
         )
 
+    def intersects_axis_first(self, other: "AABB", axis: int) -> bool:
+        """
+        Same test as intersects(), starting with ``axis`` (0=x, 1=y, 2=z) so
+        that the axis most likely to separate the boxes rejects first.
+        """
+        lo_a = self.position.data
+        lo_b = other.position.data
+        hi_a = (lo_a + self.size.data).tolist()
+        hi_b = (lo_b + other.size.data).tolist()
+        lo_a = lo_a.tolist()
+        lo_b = lo_b.tolist()
+        for i in _AXIS_ORDERS[axis]:
+            if hi_a[i] <= lo_b[i] or lo_a[i] >= hi_b[i]:
+                return False
+        return True
+
+    def intersects_segment(self, from_pos: Vector3, to_pos: Vector3) -> bool:
+        """True if the segment from_pos -> to_pos enters this AABB (slab test)"""
+        ox, oy, oz = from_pos.data.tolist()
+        tx, ty, tz = to_pos.data.tolist()
+        lo = self.position.data
+        return segment_hits_bounds(
+            ox,
+            oy,
+            oz,
+            tx - ox,
+            ty - oy,
+            tz - oz,
+            lo.tolist(),
+            (lo + self.size.data).tolist(),
+        )
+
+    def encloses(self, other: "AABB") -> bool:
+        """True if ``other`` lies completely inside this AABB"""
+        end = self.end
+        other_end = other.end
+        return (
+            self.position.x <= other.position.x
+            and self.position.y <= other.position.y
+            and self.position.z <= other.position.z
+            and end.x >= other_end.x
+            and end.y >= other_end.y
+            and end.z >= other_end.z
+        )
+
+    def grow(self, by: float) -> "AABB":
+        """Copy expanded by ``by`` on every side"""
+        margin = Vector3(by, by, by)
+        return AABB(self.position - margin, self.size + margin * 2.0)
+
     def __repr__(self):
         return f"AABB(position={self.position}, size={self.size})"
+
+
+def segment_hits_bounds(
+    ox: float,
+    oy: float,
+    oz: float,
+    dx: float,
+    dy: float,
+    dz: float,
+    lo: Sequence[float],
+    hi: Sequence[float],
+) -> bool:
+    """Slab test of the segment origin + t * direction, t in [0, 1]"""
+    t_min = 0.0
+    t_max = 1.0
+
+    for o, d, low, high in (
+        (ox, dx, lo[0], hi[0]),
+        (oy, dy, lo[1], hi[1]),
+        (oz, dz, lo[2], hi[2]),
+    ):
+        if d == 0.0:
+            if o < low or o > high:
+                return False
+            continue
+
+        inv = 1.0 / d
+        t0 = (low - o) * inv
+        t1 = (high - o) * inv
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > t_min:
+            t_min = t0
+        if t1 < t_max:
+            t_max = t1
+        if t_min > t_max:
+            return False
+
+    return True
@@ -104,11 +104,19 @@ class Transform2D:
             return self.xform(other)
 
         elif isinstance(other, Transform2D):
-            new_x = self.x * other.x.x + self.y * other.x.y
-            new_y = self.x * other.y.x + self.y * other.y.y
-            new_origin = self.x * other.origin.x + self.y * other.origin.y + self.origin
-
-            return Transform2D(new_x, new_y, new_origin)
+            # Scalar form: one Vector2 per result column and no temporaries
+            axx, axy = self.x.data.tolist()
+            ayx, ayy = self.y.data.tolist()
+            aox, aoy = self.origin.data.tolist()
+            bxx, bxy = other.x.data.tolist()
+            byx, byy = other.y.data.tolist()
+            box, boy = other.origin.data.tolist()
+
+            return Transform2D(
+                Vector2(axx * bxx + ayx * bxy, axy * bxx + ayy * bxy),
+                Vector2(axx * byx + ayx * byy, axy * byx + ayy * byy),
+                Vector2(axx * box + ayx * boy + aox, axy * box + ayy * boy + aoy),
+            )
 
         raise TypeError(f"Invalid type for Transform2D multiplication: {type(other)}")
 
@@ -1,4 +1,5 @@
 from typing import Tuple
+import numpy as np
 from engine.math.utils import EPSILON
 from engine.math.datatypes.vector3 import Vector3
 from engine.math.datatypes.transform_3d import Transform3D
@@ -68,39 +69,19 @@ def closest_point_segment_to_box(
     p: Vector3, q: Vector3, box_transform: Transform3D, half_extents: Vector3
 ) -> Vector3:
     """Find point on segment closest to box"""
-    best_point = p
-    best_dist_sq = float("inf")
+    basis = box_transform.basis._m
+    origin = box_transform.origin.data
+    extents = half_extents.data
 
     samples = 16
-    for i in range(samples + 1):
-        t = i / samples
-        sample = p + (q - p) * t
-
-        delta = sample - box_transform.origin
-        local = Vector3(
-            delta.dot(box_transform.basis.x),
-            delta.dot(box_transform.basis.y),
-            delta.dot(box_transform.basis.z),
-        )
-
-        clamped = Vector3(
-            max(-half_extents.x, min(half_extents.x, local.x)),
-            max(-half_extents.y, min(half_extents.y, local.y)),
-            max(-half_extents.z, min(half_extents.z, local.z)),
-        )
-
-        clamped_world = box_transform.origin + (
-            box_transform.basis.x * clamped.x
-            + box_transform.basis.y * clamped.y
-            + box_transform.basis.z * clamped.z
-        )
-
-        dist_sq = (sample - clamped_world).length_squared()
-        if dist_sq < best_dist_sq:
-            best_dist_sq = dist_sq
-            best_point = sample
-
-    return best_point
+    t = np.linspace(0.0, 1.0, samples + 1)[:, None]
+    points = p.data + (q.data - p.data) * t
+
+    # Rows are points: local = basis^T (x - o) becomes (x - o) @ basis. The
+    # basis is a rotation, so distances can be measured in box space
+    local = (points - origin) @ basis
+    dist_sq = ((local - np.clip(local, -extents, extents)) ** 2).sum(axis=1)
+    return Vector3.from_numpy(points[int(dist_sq.argmin())])
 
 
 def get_perpendicular(v: Vector3) -> Vector3:
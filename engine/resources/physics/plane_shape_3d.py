@@ -14,9 +14,9 @@ class PlaneShape3D(Resource):
         self._normal = normal.normalized()
 
         physics = PhysicsServer3D.get_singleton()
-        self._rid: RID = physics.shape_create(PhysicsServer3D.SHAPE_PLANE)
-
-        physics.shape_set_data(self._rid, {"normal": self._normal, "d": 0.0})
+        self._rid: RID = physics.shape_create_with_data(
+            PhysicsServer3D.SHAPE_PLANE, {"normal": self._normal, "d": 0.0}
+        )
 
     def get_rid(self) -> RID:
         return self._rid
@@ -3,11 +3,37 @@ from engine.math.datatypes.vector3 import Vector3
 from engine.math.datatypes.transform_3d import Transform3D
 from engine.core.rid import RID
 from engine.servers.physics.bodies.contact_3d import Contact3D
+from engine.servers.physics.bodies.shape_slot import ShapeSlot
+from engine.servers.physics.storage.body_state import BodyStateArrays
 
 if TYPE_CHECKING:
     from engine.servers.physics.spaces.space_3d import Space3D
 
 
+def _vector_row(name: str) -> property:
+    """Vector3 view of the body's row in a BodyStateArrays vector column"""
+
+    def get(self) -> Vector3:
+        return Vector3.from_numpy(getattr(self.state, name)[self.slot])
+
+    def set(self, value: Vector3):
+        getattr(self.state, name)[self.slot] = value.data
+
+    return property(get, set)
+
+
+def _scalar_row(name: str) -> property:
+    """float view of the body's row in a BodyStateArrays scalar column"""
+
+    def get(self) -> float:
+        return float(getattr(self.state, name)[self.slot])
+
+    def set(self, value: float):
+        getattr(self.state, name)[self.slot] = value
+
+    return property(get, set)
+
+
 class Body3D:
     """
     Runtime physics body.
@@ -16,29 +42,22 @@ class Body3D:
     __slots__ = (
         "rid",
         "space",
+        "state",
+        "slot",
         "transform",
-        "linear_velocity",
-        "angular_velocity",
         "mode",
         "mass",
-        "inverse_mass",
         "inertia",
-        "inverse_inertia",
         "center_of_mass",
-        "gravity_scale",
         "linear_damp",
         "angular_damp",
-        "total_gravity",
-        "total_linear_damp",
-        "total_angular_damp",
-        "applied_force",
-        "applied_torque",
         "biased_linear_velocity",
         "biased_angular_velocity",
         "contacts",
         "collision_layer",
         "collision_mask",
         "shapes",
+        "disabled_shapes",
         "disabled",
         "axis_lock",
         "continuous_cd",
@@ -46,9 +65,29 @@ class Body3D:
         "island_index",
         "island_step",
         "_in_tree",
+        "_aabb_cache",
+        "_shape_view",
     )
 
-    def __init__(self, rid: RID, space: "Space3D", mode: int):
+    linear_velocity = _vector_row("linear_velocity")
+    angular_velocity = _vector_row("angular_velocity")
+    applied_force = _vector_row("applied_force")
+    applied_torque = _vector_row("applied_torque")
+    total_gravity = _vector_row("total_gravity")
+    inverse_inertia = _vector_row("inverse_inertia")
+    inverse_mass = _scalar_row("inverse_mass")
+    gravity_scale = _scalar_row("gravity_scale")
+    total_linear_damp = _scalar_row("total_linear_damp")
+    total_angular_damp = _scalar_row("total_angular_damp")
+
+    def __init__(
+        self,
+        rid: RID,
+        space: "Space3D",
+        mode: int,
+        state: BodyStateArrays = None,
+        slot: int = -1,
+    ):
         """
         Initialize runtime body.
 
@@ -56,17 +95,26 @@ class Body3D:
             rid: Resource ID linking to BodyData
             space: The Space3D this body belongs to
             mode: Body mode (STATIC, KINEMATIC, RIGID, etc.)
+            state: Arrays holding the motion state; a private one-row set
+                is made when omitted
+            slot: Row of ``state`` owned by this body
         """
         self.rid = rid
         self.space = space
         self.mode = mode
 
+        # Motion state lives in the state rows; velocities are kept as found,
+        # so a body re-entering a space carries them over
+        if state is None:
+            state = BodyStateArrays(1)
+            slot = state.allocate()
+        self.state = state
+        self.slot = slot
+
         # Transform state
         self.transform = Transform3D()
 
         # Motion state
-        self.linear_velocity = Vector3()
-        self.angular_velocity = Vector3()
         self.biased_linear_velocity = Vector3()
         self.biased_angular_velocity = Vector3()
 
@@ -95,7 +143,9 @@ class Body3D:
         self.contacts: List[Contact3D] = []
         self.collision_layer = 1
         self.collision_mask = 1
-        self.shapes: List = []
+        self.shapes: List[ShapeSlot] = []
+        # Bit i is set while shapes[i] is disabled
+        self.disabled_shapes = 0
 
         # Flags
         self.disabled = False
@@ -108,6 +158,11 @@ class Body3D:
         self.island_step = 0
         self._in_tree = False
 
+        # (transform/shape key, world AABB) from compute_body_aabb
+        self._aabb_cache = None
+        # (shape key, enabled shapes) from Space3D._shape_view
+        self._shape_view = None
+
     def is_static(self) -> bool:
         """Check if body is static (mode 0)"""
         from engine.servers.physics.enums import PhysicsServer3DEnums
@@ -0,0 +1,17 @@
+from typing import Optional, Tuple
+from engine.core.rid import RID
+from engine.math.datatypes.transform_3d import Transform3D
+
+
+class ShapeSlot:
+    """A shape attached to a body, with its local transform"""
+
+    __slots__ = ("shape", "transform", "disabled", "ray_transforms")
+
+    def __init__(self, shape: RID, transform: Transform3D, disabled: bool = False):
+        self.shape = shape
+        self.transform = transform
+        self.disabled = disabled
+        # (body transform key, local transform, global, inverse), kept by
+        # DirectSpaceState3D for ray tests
+        self.ray_transforms: Optional[Tuple] = None
@@ -1,8 +1,14 @@
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 from engine.math.datatypes.transform_3d import Transform3D
 from engine.servers.physics.enums import PhysicsServer3DEnums
 from engine.servers.physics.solver.result import CollisionResult
 
+SHAPE_TYPES = [
+    value
+    for name, value in vars(PhysicsServer3DEnums).items()
+    if name.startswith("SHAPE_")
+]
+
 
 class CollisionSolver3D:
     """
@@ -10,6 +16,9 @@ class CollisionSolver3D:
     Routes shape-pair collisions to appropriate narrowphase algorithms.
     """
 
+    # (type A, type B) -> narrowphase function, built on first use
+    _pair_solvers: Dict[Tuple, Callable] = {}
+
     @staticmethod
     def solve_static(
         shape_A_type: int,
@@ -36,89 +45,92 @@ class CollisionSolver3D:
         Returns:
             CollisionResult if collision, None otherwise
         """
-        from engine.servers.physics.solver.sat import box_vs_box_sat
-        from engine.servers.physics.solver.capsule import (
-            capsule_vs_capsule,
-            capsule_vs_sphere,
-            capsule_vs_box,
-            capsule_vs_plane,
+        return CollisionSolver3D.get_pair_solver(shape_A_type, shape_B_type)(
+            transform_A, data_A, transform_B, data_B
+        )
+
+    @staticmethod
+    def get_pair_solver(shape_A_type: int, shape_B_type: int) -> Callable:
+        """
+        Narrowphase function for one shape type pair. It takes
+        (transform_A, data_A, transform_B, data_B).
+        """
+        solvers = CollisionSolver3D._pair_solvers
+        key = (shape_A_type, shape_B_type)
+        solver = solvers.get(key)
+        if solver is None:
+            solver = solvers[key] = _build_pair_solver(shape_A_type, shape_B_type)
+        return solver
+
+    @staticmethod
+    def get_solver_for(shape_A_type: int) -> Dict[int, Callable]:
+        """
+        Narrowphase functions for every B shape type, with A fixed to
+        ``shape_A_type``. Lets callers that test one shape against many
+        resolve the type dispatch once.
+        """
+        return {
+            shape_B_type: CollisionSolver3D.get_pair_solver(shape_A_type, shape_B_type)
+            for shape_B_type in SHAPE_TYPES
+        }
+
+
+def _build_pair_solver(shape_A_type: int, shape_B_type: int) -> Callable:
+    from engine.servers.physics.solver.sat import box_vs_box_sat
+    from engine.servers.physics.solver.capsule import (
+        capsule_vs_capsule,
+        capsule_vs_sphere,
+        capsule_vs_box,
+        capsule_vs_plane,
+    )
+    from engine.servers.physics.solver.gjk import solve_gjk_epa
+    from engine.servers.physics.solver.primitives import (
+        sphere_vs_sphere,
+        sphere_vs_box,
+        sphere_vs_plane,
+        box_vs_plane,
+    )
+
+    SHAPE_SPHERE = PhysicsServer3DEnums.SHAPE_SPHERE
+    SHAPE_BOX = PhysicsServer3DEnums.SHAPE_BOX
+    SHAPE_CAPSULE = PhysicsServer3DEnums.SHAPE_CAPSULE
+    SHAPE_PLANE = PhysicsServer3DEnums.SHAPE_PLANE
+
+    # (A, B) -> solver; a (B, A) entry is used with the shapes swapped and the
+    # normal negated
+    direct = {
+        (SHAPE_SPHERE, SHAPE_SPHERE): sphere_vs_sphere,
+        (SHAPE_BOX, SHAPE_BOX): box_vs_box_sat,
+        (SHAPE_CAPSULE, SHAPE_CAPSULE): capsule_vs_capsule,
+        (SHAPE_CAPSULE, SHAPE_SPHERE): capsule_vs_sphere,
+        (SHAPE_CAPSULE, SHAPE_BOX): capsule_vs_box,
+        (SHAPE_CAPSULE, SHAPE_PLANE): capsule_vs_plane,
+        (SHAPE_SPHERE, SHAPE_BOX): sphere_vs_box,
+        (SHAPE_SPHERE, SHAPE_PLANE): sphere_vs_plane,
+        (SHAPE_BOX, SHAPE_PLANE): box_vs_plane,
+    }
+
+    solver = direct.get((shape_A_type, shape_B_type))
+    if solver is not None:
+        return solver
+
+    solver = direct.get((shape_B_type, shape_A_type))
+    if solver is not None:
+        return _swapped(solver)
+
+    def solve_gjk(transform_A, data_A, transform_B, data_B):
+        return solve_gjk_epa(
+            shape_A_type, transform_A, data_A, shape_B_type, transform_B, data_B
         )
-        from engine.servers.physics.solver.gjk import solve_gjk_epa
-
-        if (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_SPHERE
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_SPHERE
-        ):
-            return solve_gjk_epa(
-                shape_A_type, transform_A, data_A, shape_B_type, transform_B, data_B
-            )
-
-        elif (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_BOX
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_BOX
-        ):
-            return box_vs_box_sat(transform_A, data_A, transform_B, data_B)
-
-        elif (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_CAPSULE
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_CAPSULE
-        ):
-            return capsule_vs_capsule(transform_A, data_A, transform_B, data_B)
-
-        elif (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_CAPSULE
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_SPHERE
-        ):
-            return capsule_vs_sphere(transform_A, data_A, transform_B, data_B)
-        elif (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_SPHERE
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_CAPSULE
-        ):
-            result = capsule_vs_sphere(transform_B, data_B, transform_A, data_A)
-            if result:
-                result.normal = -result.normal
-            return result
-
-        elif (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_CAPSULE
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_BOX
-        ):
-            return capsule_vs_box(transform_A, data_A, transform_B, data_B)
-        elif (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_BOX
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_CAPSULE
-        ):
-            result = capsule_vs_box(transform_B, data_B, transform_A, data_A)
-            if result:
-                result.normal = -result.normal
-            return result
-
-        elif (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_CAPSULE
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_PLANE
-        ):
-            return capsule_vs_plane(transform_A, data_A, transform_B, data_B)
-        elif (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_PLANE
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_CAPSULE
-        ):
-            result = capsule_vs_plane(transform_B, data_B, transform_A, data_A)
-            if result:
-                result.normal = -result.normal
-            return result
-
-        elif (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_SPHERE
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_BOX
-        ) or (
-            shape_A_type == PhysicsServer3DEnums.SHAPE_BOX
-            and shape_B_type == PhysicsServer3DEnums.SHAPE_SPHERE
-        ):
-            return solve_gjk_epa(
-                shape_A_type, transform_A, data_A, shape_B_type, transform_B, data_B
-            )
-
-        else:
-            return solve_gjk_epa(
-                shape_A_type, transform_A, data_A, shape_B_type, transform_B, data_B
-            )
+
+    return solve_gjk
+
+
+def _swapped(solver: Callable) -> Callable:
+    def solve(transform_A, data_A, transform_B, data_B):
+        result = solver(transform_B, data_B, transform_A, data_A)
+        if result:
+            result.normal = -result.normal
+        return result
+
+    return solve
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict
 from engine.core.rid import RID
 from engine.math.datatypes.vector3 import Vector3
@@ -44,10 +45,9 @@ class PhysicsServer3DSoftware(PhysicsServer3DStorage):
             "collision_unsafe_fraction": 1.0,
         }
 
-        if body not in self._bodies:
+        body_data = self._bodies.get(body.get_id())
+        if body_data is None:
             return result
-
-        body_data = self._bodies[body]
         space_rid = body_data.space
 
         if not space_rid or space_rid not in self._spaces:
@@ -87,7 +87,10 @@ class PhysicsServer3DSoftware(PhysicsServer3DStorage):
         Execute physics step for all active spaces.
 
         This is the main simulation driver.
-        Calls Space3D.step() for each active space.
+        Calls Space3D.step() for each active space. Spaces share no bodies,
+        areas or broadphase, so with more than one they are stepped
+        concurrently on a worker pool. Solver state shared between spaces,
+        the CollisionResult pool, is kept per thread.
 
         Args:
             delta: Time step in seconds
@@ -95,13 +98,18 @@ class PhysicsServer3DSoftware(PhysicsServer3DStorage):
         if delta <= 0:
             return
 
+        spaces = []
         for space_rid in list(self._active_spaces):
-            if space_rid not in self._spaces:
-                continue
+            space_data = self._spaces.get(space_rid)
+            if space_data is not None and space_data.space_3d:
+                spaces.append(space_data.space_3d)
 
-            space_data = self._spaces[space_rid]
-            if space_data.space_3d:
-                space_data.space_3d.step(delta)
+        if len(spaces) == 1:
+            spaces[0].step(delta)
+        elif spaces:
+            # Consumed so a failing step raises here, as it would serially
+            for _ in _get_space_executor().map(lambda s: s.step(delta), spaces):
+                pass
 
     def flush_queries(self):
         """
@@ -121,9 +129,17 @@ class PhysicsServer3DSoftware(PhysicsServer3DStorage):
             runtime_body = body_data.runtime_body
             if runtime_body:
                 body_data.transform = runtime_body.transform
-                body_data.linear_velocity = runtime_body.linear_velocity
-                body_data.angular_velocity = runtime_body.angular_velocity
 
     def set_active(self, active: bool):
         """Enable/disable physics processing globally"""
         pass
+
+
+_space_executor = None
+
+
+def _get_space_executor() -> ThreadPoolExecutor:
+    global _space_executor
+    if _space_executor is None:
+        _space_executor = ThreadPoolExecutor(thread_name_prefix="physics_space")
+    return _space_executor
@@ -19,15 +19,16 @@ class PhysicsServer3DStorage(BodyStorage, ShapeStorage, SpaceStorage):
 
         Determines type and calls appropriate free method.
         """
-        if rid in self._bodies:
-            body_data = self._bodies[rid]
+        body_data = self._bodies.get(rid.get_id())
+        if body_data is not None:
             if body_data.space and body_data.space in self._spaces:
                 space_data = self._spaces[body_data.space]
-                space_data.body_rids.discard(rid)
+                space_data.body_ids.discard(rid.get_id())
                 if space_data.space_3d:
                     space_data.space_3d.remove_body(rid)
 
-            del self._bodies[rid]
+            self._body_state.release(body_data.slot)
+            del self._bodies[rid.get_id()]
 
         elif rid in self._shapes:
             self._free_shape(rid)
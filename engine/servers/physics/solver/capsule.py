@@ -7,9 +7,10 @@ from engine.math.geometry import (
     closest_point_on_segment,
     closest_point_segment_to_box,
 )
-from engine.servers.physics.solver.result import CollisionResult
+from engine.servers.physics.solver.result import CollisionResult, get_result
 from engine.servers.physics.solver.primitives import (
     EPSILON,
+    box_inside_push_out,
 )
 
 
@@ -43,7 +44,7 @@ def capsule_vs_capsule(
     if distance_sq >= radius_sum * radius_sum:
         return None
 
-    result = CollisionResult()
+    result = get_result()
 
     result.collided = True
     distance = distance_sq**0.5
@@ -86,14 +87,15 @@ def capsule_vs_sphere(
     sphere_center = transform_sphere.origin
     closest = closest_point_on_segment(sphere_center, p1, p2)
 
-    delta = sphere_center - closest
+    # Normal points from the sphere (B) towards the capsule (A)
+    delta = closest - sphere_center
     distance_sq = delta.length_squared()
     radius_sum = radius_capsule + radius_sphere
 
     if distance_sq >= radius_sum * radius_sum:
         return None
 
-    result = CollisionResult()
+    result = get_result()
     result.collided = True
     distance = distance_sq**0.5
 
@@ -106,7 +108,7 @@ def capsule_vs_sphere(
 
     result.point = closest
     result.point_a = closest - result.normal * radius_capsule
-    result.point_b = sphere_center - result.normal * radius_sphere
+    result.point_b = sphere_center + result.normal * radius_sphere
 
     return result
 
@@ -132,12 +134,9 @@ def capsule_vs_box(
         p1, p2, transform_box, half_extents
     )
 
+    basis = transform_box.basis._m
     delta_to_box = closest_on_segment - transform_box.origin
-    local_point = Vector3(
-        delta_to_box.dot(transform_box.basis.x),
-        delta_to_box.dot(transform_box.basis.y),
-        delta_to_box.dot(transform_box.basis.z),
-    )
+    local_point = Vector3.from_numpy(basis.T @ delta_to_box.data)
 
     clamped = Vector3(
         max(-half_extents.x, min(half_extents.x, local_point.x)),
@@ -145,11 +144,7 @@ def capsule_vs_box(
         max(-half_extents.z, min(half_extents.z, local_point.z)),
     )
 
-    closest_on_box = transform_box.origin + (
-        transform_box.basis.x * clamped.x
-        + transform_box.basis.y * clamped.y
-        + transform_box.basis.z * clamped.z
-    )
+    closest_on_box = Vector3.from_numpy(transform_box.origin.data + basis @ clamped.data)
 
     delta = closest_on_segment - closest_on_box
     distance_sq = delta.length_squared()
@@ -157,7 +152,7 @@ def capsule_vs_box(
     if distance_sq >= radius * radius:
         return None
 
-    result = CollisionResult()
+    result = get_result()
     result.collided = True
     distance = distance_sq**0.5
 
@@ -168,22 +163,9 @@ def capsule_vs_box(
     )
 
     if is_inside:
-        dx = half_extents.x - abs(local_point.x)
-        dy = half_extents.y - abs(local_point.y)
-        dz = half_extents.z - abs(local_point.z)
-
-        if dx < dy and dx < dz:
-            sign = 1 if local_point.x > 0 else -1
-            result.normal = transform_box.basis.x * sign
-            result.depth = radius + dx
-        elif dy < dz:
-            sign = 1 if local_point.y > 0 else -1
-            result.normal = transform_box.basis.y * sign
-            result.depth = radius + dy
-        else:
-            sign = 1 if local_point.z > 0 else -1
-            result.normal = transform_box.basis.z * sign
-            result.depth = radius + dz
+        result.normal, result.depth = box_inside_push_out(
+            local_point.data, half_extents.data, basis, radius
+        )
     else:
         if distance < EPSILON:
             result.normal = Vector3(1, 0, 0)
@@ -216,11 +198,7 @@ def capsule_vs_plane(
     plane_normal_local = data_plane.get("normal", Vector3(0, 1, 0))
     plane_d = data_plane.get("d", 0.0)
 
-    plane_normal_world = (
-        transform_plane.basis.x * plane_normal_local.x
-        + transform_plane.basis.y * plane_normal_local.y
-        + transform_plane.basis.z * plane_normal_local.z
-    ).normalized()
+    plane_normal_world = transform_plane.basis.xform(plane_normal_local).normalized()
 
     plane_d_world = plane_d - plane_normal_world.dot(transform_plane.origin)
 
@@ -243,7 +221,7 @@ def capsule_vs_plane(
     if closest_dist > radius:
         return None
 
-    result = CollisionResult()
+    result = get_result()
     result.collided = True
 
     result.normal = plane_normal_world
@@ -1,151 +1,176 @@
-from typing import Dict, List, Optional
+import math
+from typing import Callable, List, Optional
+import numpy as np
 from engine.math.datatypes.vector3 import Vector3
 from engine.math.datatypes.transform_3d import Transform3D
-from engine.servers.physics.solver.result import CollisionResult, SupportPoint
-from engine.servers.physics.solver.primitives import EPSILON, support
+from engine.servers.physics.solver.result import (
+    CollisionResult,
+    SupportShape,
+    get_result,
+)
+from engine.servers.physics.solver.primitives import EPSILON
 
 EPA_MAX_ITERATIONS = 64
 EPA_MAX_FACES = 64
 
-
-class EPAFace:
-    def __init__(self, a: int, b: int, c: int):
-        self.indices = [a, b, c]
-        self.normal = Vector3()
-        self.distance = 0.0
+_INF = float("inf")
 
 
 def run_epa(
-    simplex: List[SupportPoint],
-    shape_A_type: int,
+    simplex_mink: np.ndarray,
+    simplex_a: np.ndarray,
+    simplex_b: np.ndarray,
+    pair_support: Callable,
     transform_A: Transform3D,
-    data_A: Dict,
-    shape_B_type: int,
+    shape_A: SupportShape,
     transform_B: Transform3D,
-    data_B: Dict,
+    shape_B: SupportShape,
 ) -> Optional[CollisionResult]:
     """
     Expanding Polytope Algorithm for penetration depth.
     Expands simplex tetrahedron towards origin to find closest face.
-    """
-    points = simplex[:]
-    faces = []
-
-    faces.append(EPAFace(0, 1, 2))
-    faces.append(EPAFace(0, 2, 3))
-    faces.append(EPAFace(0, 3, 1))
-    faces.append(EPAFace(1, 3, 2))
-
-    for face in faces:
-        a = points[face.indices[0]].minkowski
-        b = points[face.indices[1]].minkowski
-        c = points[face.indices[2]].minkowski
-
-        ab = b - a
-        ac = c - a
-        normal = ab.cross(ac)
-
-        length = normal.length()
-        if length > EPSILON:
-            normal = normal / length
 
-        # Ensure normal points towards origin
-        if normal.dot(a) > 0:
-            normal = -normal
-            face.indices[0], face.indices[1] = face.indices[1], face.indices[0]
+    Takes GJK's final (4, 3) simplex rows and its resolved pair support.
+    Polytope vertices are kept as float tuples and faces as flat lists
+    ``[i0, i1, i2, nx, ny, nz, distance]``, so the loop builds no Vector3s.
+    """
+    # Every iteration adds at most one vertex; witness rows are written in place
+    capacity = 4 + EPA_MAX_ITERATIONS
+    mink = np.empty((capacity, 3))
+    rows_a = np.empty((capacity, 3))
+    rows_b = np.empty((capacity, 3))
+    mink[:4] = simplex_mink
+    rows_a[:4] = simplex_a
+    rows_b[:4] = simplex_b
+    points = [tuple(p) for p in simplex_mink.tolist()]
 
-        face.normal = normal
-        face.distance = abs(normal.dot(a))
+    faces = []
+    for i0, i1, i2 in ((0, 1, 2), (0, 2, 3), (0, 3, 1), (1, 3, 2)):
+        # Ensure normal points away from the opposite vertex; the origin may
+        # sit on a face plane when GJK terminates on a touching simplex
+        face = _make_face(points, i0, i1, i2)
+        ox, oy, oz = points[6 - i0 - i1 - i2]
+        ax, ay, az = points[i0]
+        if face[3] * (ox - ax) + face[4] * (oy - ay) + face[5] * (oz - az) > 0:
+            face = _flip_face(face)
+        faces.append(face)
+
+    direction = np.empty(3)
 
     # EPA iteration
     for iteration in range(EPA_MAX_ITERATIONS):
-        min_face_idx = 0
-        min_distance = faces[0].distance
+        closest = faces[_closest_face(faces)]
+        min_distance = closest[6]
 
-        for i in range(1, len(faces)):
-            if faces[i].distance < min_distance:
-                min_distance = faces[i].distance
-                min_face_idx = i
-
-        support_pt = support(
-            faces[min_face_idx].normal,
-            shape_A_type,
+        new_point_idx = len(points)
+        direction[0], direction[1], direction[2] = closest[3], closest[4], closest[5]
+        pair_support(
+            direction,
             transform_A,
-            data_A,
-            shape_B_type,
+            shape_A,
             transform_B,
-            data_B,
+            shape_B,
+            mink[new_point_idx],
+            rows_a[new_point_idx],
+            rows_b[new_point_idx],
         )
+        sx, sy, sz = mink[new_point_idx].tolist()
 
-        support_distance = faces[min_face_idx].normal.dot(support_pt.minkowski)
+        support_distance = closest[3] * sx + closest[4] * sy + closest[5] * sz
 
         if support_distance - min_distance < EPSILON:
-            result = CollisionResult()
-            result.collided = True
-            result.normal = faces[min_face_idx].normal
-            result.depth = min_distance
-
-            face = faces[min_face_idx]
-            p0 = points[face.indices[0]].point_a
-            p1 = points[face.indices[1]].point_a
-            p2 = points[face.indices[2]].point_a
-            result.point_a = (p0 + p1 + p2) / 3.0
+            return _build_result(rows_a, rows_b, closest)
 
-            p0 = points[face.indices[0]].point_b
-            p1 = points[face.indices[1]].point_b
-            p2 = points[face.indices[2]].point_b
-            result.point_b = (p0 + p1 + p2) / 3.0
-
-            result.point = (result.point_a + result.point_b) * 0.5
-            return result
-
-        points.append(support_pt)
-        new_point_idx = len(points) - 1
+        points.append((sx, sy, sz))
 
         edges = []
-        faces_to_remove = []
-
-        for i, face in enumerate(faces):
-            a = points[face.indices[0]].minkowski
-            if face.normal.dot(support_pt.minkowski - a) > 0:
-                for j in range(3):
-                    edge = (face.indices[j], face.indices[(j + 1) % 3])
+        kept = []
+
+        for face in faces:
+            ax, ay, az = points[face[0]]
+            if face[3] * (sx - ax) + face[4] * (sy - ay) + face[5] * (sz - az) > 0:
+                for edge in (
+                    (face[0], face[1]),
+                    (face[1], face[2]),
+                    (face[2], face[0]),
+                ):
                     reverse_edge = (edge[1], edge[0])
                     if reverse_edge in edges:
                         edges.remove(reverse_edge)
                     else:
                         edges.append(edge)
-                faces_to_remove.append(i)
+            else:
+                kept.append(face)
 
-        for i in reversed(faces_to_remove):
-            faces.pop(i)
+        faces = kept
+        for i0, i1 in edges:
+            face = _make_face(points, i0, i1, new_point_idx)
+            ax, ay, az = points[i0]
+            if face[3] * ax + face[4] * ay + face[5] * az < 0:
+                face = _flip_face(face)
+            faces.append(face)
 
-        for edge in edges:
-            new_face = EPAFace(edge[0], edge[1], new_point_idx)
-            a = points[new_face.indices[0]].minkowski
-            b = points[new_face.indices[1]].minkowski
-            c = points[new_face.indices[2]].minkowski
+        if len(faces) > EPA_MAX_FACES:
+            break
 
-            ab = b - a
-            ac = c - a
-            normal = ab.cross(ac)
+    # Curved shapes converge slowly; out of budget, the closest face so far is
+    # still a good estimate of the penetration
+    face = faces[_closest_face(faces)]
+    if face[6] == _INF:
+        return None
+    return _build_result(rows_a, rows_b, face)
 
-            length = normal.length()
-            if length > EPSILON:
-                normal = normal / length
 
-            if normal.dot(a) > 0:
-                normal = -normal
-                new_face.indices[0], new_face.indices[1] = (
-                    new_face.indices[1],
-                    new_face.indices[0],
-                )
+def _make_face(points: List[tuple], i0: int, i1: int, i2: int) -> list:
+    ax, ay, az = points[i0]
+    bx, by, bz = points[i1]
+    cx, cy, cz = points[i2]
 
-            new_face.normal = normal
-            new_face.distance = abs(normal.dot(a))
-            faces.append(new_face)
+    abx, aby, abz = bx - ax, by - ay, bz - az
+    acx, acy, acz = cx - ax, cy - ay, cz - az
+    nx = aby * acz - abz * acy
+    ny = abz * acx - abx * acz
+    nz = abx * acy - aby * acx
 
-        if len(faces) > EPA_MAX_FACES:
-            break
+    length = math.sqrt(nx * nx + ny * ny + nz * nz)
+    if length <= EPSILON:
+        # Degenerate faces have no usable normal; never pick them as closest
+        return [i0, i1, i2, nx, ny, nz, _INF]
+
+    inv = 1.0 / length
+    nx, ny, nz = nx * inv, ny * inv, nz * inv
+    return [i0, i1, i2, nx, ny, nz, abs(nx * ax + ny * ay + nz * az)]
+
+
+def _flip_face(face: list) -> list:
+    i0, i1, i2, nx, ny, nz, distance = face
+    return [i1, i0, i2, -nx, -ny, -nz, distance]
+
+
+def _closest_face(faces: List[list]) -> int:
+    min_face_idx = 0
+    min_distance = faces[0][6]
+
+    for i in range(1, len(faces)):
+        if faces[i][6] < min_distance:
+            min_distance = faces[i][6]
+            min_face_idx = i
+
+    return min_face_idx
+
+
+def _build_result(
+    rows_a: np.ndarray, rows_b: np.ndarray, face: list
+) -> CollisionResult:
+    indices = face[:3]
 
-    return None
+    # Faces point out of A - B, so the closest one faces from A towards B;
+    # report it from B towards A like the analytic solvers
+    result = get_result()
+    result.collided = True
+    result.normal = Vector3(-face[3], -face[4], -face[5])
+    result.depth = face[6]
+    result.point_a = Vector3.from_numpy(rows_a[indices].sum(axis=0) / 3.0)
+    result.point_b = Vector3.from_numpy(rows_b[indices].sum(axis=0) / 3.0)
+    result.point = (result.point_a + result.point_b) * 0.5
+    return result
@@ -1,8 +1,18 @@
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
+import numpy as np
+from engine.math.datatypes.aabb import AABB
 from engine.math.datatypes.vector3 import Vector3
 from engine.math.datatypes.transform_3d import Transform3D
-from engine.servers.physics.solver.result import CollisionResult, SupportPoint
-from engine.servers.physics.solver.primitives import EPSILON, support
+from engine.servers.physics.solver.result import (
+    CollisionResult,
+    SupportShape,
+)
+from engine.servers.physics.solver.primitives import (
+    EPSILON,
+    EPSILON_SQ,
+    get_aabb,
+    get_pair_support,
+)
 from engine.servers.physics.solver.epa import run_epa
 
 GJK_MAX_ITERATIONS = 64
@@ -15,158 +25,255 @@ def solve_gjk_epa(
     shape_B_type: int,
     transform_B: Transform3D,
     data_B: Dict,
+    cached_aabbs: Optional[Tuple[AABB, AABB]] = None,
 ) -> Optional[CollisionResult]:
     """
     General collision detection using GJK for intersection test
     and EPA for penetration depth calculation.
+
+    Disjoint world AABBs reject the pair before any support call; callers
+    that already hold both AABBs can pass them in as ``cached_aabbs``.
     """
-    simplex = []
+    if cached_aabbs is None:
+        aabb_A = get_aabb(shape_A_type, transform_A, data_A)
+        aabb_B = get_aabb(shape_B_type, transform_B, data_B)
+    else:
+        aabb_A, aabb_B = cached_aabbs
+    if not aabb_A.intersects(aabb_B):
+        return None
+
+    shape_A = SupportShape.from_data(data_A)
+    shape_B = SupportShape.from_data(data_B)
+
+    # Simplex kept as parallel (4, 3) rows: Minkowski point, point on A,
+    # point on B; only the first ``count`` rows are live
+    simplex_mink = np.empty((4, 3))
+    simplex_a = np.empty((4, 3))
+    simplex_b = np.empty((4, 3))
+
     direction = transform_A.origin - transform_B.origin
 
     if direction.length_squared() < EPSILON:
         direction = Vector3(1, 0, 0)
 
-    supp = support(
-        direction, shape_A_type, transform_A, data_A, shape_B_type, transform_B, data_B
+    # Both shape types are fixed for the whole query: resolve the support once
+    pair_support = get_pair_support(shape_A_type, shape_B_type)
+
+    d = direction.data
+    pair_support(
+        d,
+        transform_A,
+        shape_A,
+        transform_B,
+        shape_B,
+        simplex_mink[0],
+        simplex_a[0],
+        simplex_b[0],
     )
-    simplex.append(supp)
-    direction = -supp.minkowski
+    count = 1
+    np.negative(simplex_mink[0], out=d)
 
     for iteration in range(GJK_MAX_ITERATIONS):
-        supp = support(
-            direction,
-            shape_A_type,
+        pair_support(
+            d,
             transform_A,
-            data_A,
-            shape_B_type,
+            shape_A,
             transform_B,
-            data_B,
+            shape_B,
+            simplex_mink[count],
+            simplex_a[count],
+            simplex_b[count],
         )
 
-        if supp.minkowski.dot(direction) <= 0:
+        if simplex_mink[count] @ d <= 0:
             return None  # No intersection
 
-        simplex.append(supp)
+        count += 1
 
-        if process_simplex(simplex, direction):
+        count = process_simplex(simplex_mink, simplex_a, simplex_b, count, direction)
+        if count == 4:
             return run_epa(
-                simplex,
-                shape_A_type,
+                simplex_mink,
+                simplex_a,
+                simplex_b,
+                pair_support,
                 transform_A,
-                data_A,
-                shape_B_type,
+                shape_A,
                 transform_B,
-                data_B,
+                shape_B,
             )
 
     return None
 
 
-def process_simplex(simplex: List[SupportPoint], direction: Vector3) -> bool:
+def process_simplex(
+    simplex_mink: np.ndarray,
+    simplex_a: np.ndarray,
+    simplex_b: np.ndarray,
+    count: int,
+    direction: Vector3,
+) -> int:
     """
     Process simplex and update search direction.
-    Returns True if simplex contains origin.
+    Returns the new simplex size; 4 means the tetrahedron contains the origin.
+
+    Works on plain floats pulled from the Minkowski rows and writes the new
+    search direction straight into ``direction.data``; no Vector3 temporaries.
     """
-    if len(simplex) == 2:
-        a = simplex[1].minkowski
-        b = simplex[0].minkowski
-        ab = b - a
-        ao = -a
-
-        if ab.dot(ao) > 0:
-            direction.x = ab.y * ao.z - ab.z * ao.y
-            direction.y = ab.z * ao.x - ab.x * ao.z
-            direction.z = ab.x * ao.y - ab.y * ao.x
-
-            temp = direction
-            direction.x = temp.y * ab.z - temp.z * ab.y
-            direction.y = temp.z * ab.x - temp.x * ab.z
-            direction.z = temp.x * ab.y - temp.y * ab.x
-        else:
-            simplex.pop(0)
-            direction.x = ao.x
-            direction.y = ao.y
-            direction.z = ao.z
-        return False
-
-    elif len(simplex) == 3:
-        a = simplex[2].minkowski
-        b = simplex[1].minkowski
-        c = simplex[0].minkowski
-
-        ab = b - a
-        ac = c - a
-        ao = -a
-
-        abc = ab.cross(ac)
-
-        if ac.cross(abc).dot(ao) > 0:
-            if ac.dot(ao) > 0:
-                simplex.pop(1)
-                temp = ac.cross(ao)
-                direction.x = temp.y * ac.z - temp.z * ac.y
-                direction.y = temp.z * ac.x - temp.x * ac.z
-                direction.z = temp.x * ac.y - temp.y * ac.x
-            else:
-                if ab.dot(ao) > 0:
-                    simplex.pop(0)
-                    temp = ab.cross(ao)
-                    direction.x = temp.y * ab.z - temp.z * ab.y
-                    direction.y = temp.z * ab.x - temp.x * ab.z
-                    direction.z = temp.x * ab.y - temp.y * ab.x
-                else:
-                    simplex[:] = [simplex[2]]
-                    direction.x = ao.x
-                    direction.y = ao.y
-                    direction.z = ao.z
+    d = direction.data
+
+    if count == 4:
+        (dx, dy, dz), (cx, cy, cz), (bx, by, bz), (ax, ay, az) = (
+            simplex_mink.tolist()
+        )
+
+        abx, aby, abz = bx - ax, by - ay, bz - az
+        acx, acy, acz = cx - ax, cy - ay, cz - az
+        adx, ady, adz = dx - ax, dy - ay, dz - az
+        aox, aoy, aoz = -ax, -ay, -az
+
+        # abc = ab x ac
+        if (
+            (aby * acz - abz * acy) * aox
+            + (abz * acx - abx * acz) * aoy
+            + (abx * acy - aby * acx) * aoz
+        ) > 0:
+            _remove(simplex_mink, simplex_a, simplex_b, count, 0)
+        # acd = ac x ad
+        elif (
+            (acy * adz - acz * ady) * aox
+            + (acz * adx - acx * adz) * aoy
+            + (acx * ady - acy * adx) * aoz
+        ) > 0:
+            _remove(simplex_mink, simplex_a, simplex_b, count, 2)
+        # adb = ad x ab
+        elif (
+            (ady * abz - adz * aby) * aox
+            + (adz * abx - adx * abz) * aoy
+            + (adx * aby - ady * abx) * aoz
+        ) > 0:
+            _remove(simplex_mink, simplex_a, simplex_b, count, 1)
         else:
-            if abc.cross(ab).dot(ao) > 0:
-                if ab.dot(ao) > 0:
-                    simplex.pop(0)
-                    temp = ab.cross(ao)
-                    direction.x = temp.y * ab.z - temp.z * ab.y
-                    direction.y = temp.z * ab.x - temp.x * ab.z
-                    direction.z = temp.x * ab.y - temp.y * ab.x
-                else:
-                    simplex[:] = [simplex[2]]
-                    direction.x = ao.x
-                    direction.y = ao.y
-                    direction.z = ao.z
+            return 4
+
+        # The origin is outside the culled face; carry on with the triangle
+        count = 3
+
+    if count == 3:
+        (cx, cy, cz), (bx, by, bz), (ax, ay, az) = simplex_mink[:3].tolist()
+
+        abx, aby, abz = bx - ax, by - ay, bz - az
+        acx, acy, acz = cx - ax, cy - ay, cz - az
+        aox, aoy, aoz = -ax, -ay, -az
+
+        # abc = ab x ac
+        nx = aby * acz - abz * acy
+        ny = abz * acx - abx * acz
+        nz = abx * acy - aby * acx
+
+        ab_ao = abx * aox + aby * aoy + abz * aoz
+        ac_ao = acx * aox + acy * aoy + acz * aoz
+
+        # (abc x ac) . ao: origin beyond edge ac
+        ac_edge = (
+            (ny * acz - nz * acy) * aox
+            + (nz * acx - nx * acz) * aoy
+            + (nx * acy - ny * acx) * aoz
+        )
+        # (ab x abc) . ao: origin beyond edge ab
+        ab_edge = (
+            (aby * nz - abz * ny) * aox
+            + (abz * nx - abx * nz) * aoy
+            + (abx * ny - aby * nx) * aoz
+        )
+
+        if ac_edge > 0:
+            if ac_ao > 0:
+                _remove(simplex_mink, simplex_a, simplex_b, count, 1)
+                _edge_normal(acx, acy, acz, aox, aoy, aoz, d)
+                return 2
+        elif not ab_edge > 0:
+            if nx * aox + ny * aoy + nz * aoz > 0:
+                d[0], d[1], d[2] = nx, ny, nz
             else:
-                if abc.dot(ao) > 0:
-                    direction.x = abc.x
-                    direction.y = abc.y
-                    direction.z = abc.z
-                else:
-                    simplex[0], simplex[1] = simplex[1], simplex[0]
-                    direction.x = -abc.x
-                    direction.y = -abc.y
-                    direction.z = -abc.z
-        return False
+                _swap(simplex_mink, simplex_a, simplex_b, 0, 1)
+                d[0], d[1], d[2] = -nx, -ny, -nz
+            return 3
 
-    else:
-        a = simplex[3].minkowski
-        b = simplex[2].minkowski
-        c = simplex[1].minkowski
-        d = simplex[0].minkowski
-
-        ab = b - a
-        ac = c - a
-        ad = d - a
-        ao = -a
-
-        abc = ab.cross(ac)
-        acd = ac.cross(ad)
-        adb = ad.cross(ab)
-
-        if abc.dot(ao) > 0:
-            simplex.pop(0)
-            return process_simplex(simplex, direction)
-        if acd.dot(ao) > 0:
-            simplex.pop(2)
-            return process_simplex(simplex, direction)
-        if adb.dot(ao) > 0:
-            simplex.pop(1)
-            return process_simplex(simplex, direction)
-
-        return True
+        if ab_ao > 0:
+            _remove(simplex_mink, simplex_a, simplex_b, count, 0)
+            _edge_normal(abx, aby, abz, aox, aoy, aoz, d)
+            return 2
+
+        simplex_mink[0] = simplex_mink[2]
+        simplex_a[0] = simplex_a[2]
+        simplex_b[0] = simplex_b[2]
+        d[0], d[1], d[2] = aox, aoy, aoz
+        return 1
+
+    # Line case
+    (bx, by, bz), (ax, ay, az) = simplex_mink[:2].tolist()
+
+    abx, aby, abz = bx - ax, by - ay, bz - az
+    aox, aoy, aoz = -ax, -ay, -az
+
+    if abx * aox + aby * aoy + abz * aoz > 0:
+        if _edge_normal(abx, aby, abz, aox, aoy, aoz, d) < EPSILON_SQ:
+            # Origin lies on the segment: any direction normal to it works
+            d[0], d[1], d[2] = _perpendicular(abx, aby, abz)
+        return 2
+
+    _remove(simplex_mink, simplex_a, simplex_b, count, 0)
+    d[0], d[1], d[2] = aox, aoy, aoz
+    return 1
+
+
+def _edge_normal(
+    ex: float, ey: float, ez: float, ox: float, oy: float, oz: float, out: np.ndarray
+) -> float:
+    """
+    Write (e x o) x e into ``out``: the normal of edge e pointing towards o.
+    Returns |e x o|^2, which is zero when o lies on the edge's line.
+    """
+    tx = ey * oz - ez * oy
+    ty = ez * ox - ex * oz
+    tz = ex * oy - ey * ox
+    out[0] = ty * ez - tz * ey
+    out[1] = tz * ex - tx * ez
+    out[2] = tx * ey - ty * ex
+    return tx * tx + ty * ty + tz * tz
+
+
+def _remove(
+    simplex_mink: np.ndarray,
+    simplex_a: np.ndarray,
+    simplex_b: np.ndarray,
+    count: int,
+    i: int,
+) -> None:
+    """Drop row ``i`` by shifting the live rows after it down by one."""
+    simplex_mink[i : count - 1] = simplex_mink[i + 1 : count]
+    simplex_a[i : count - 1] = simplex_a[i + 1 : count]
+    simplex_b[i : count - 1] = simplex_b[i + 1 : count]
+
+
+def _swap(
+    simplex_mink: np.ndarray,
+    simplex_a: np.ndarray,
+    simplex_b: np.ndarray,
+    i: int,
+    j: int,
+) -> None:
+    simplex_mink[[i, j]] = simplex_mink[[j, i]]
+    simplex_a[[i, j]] = simplex_a[[j, i]]
+    simplex_b[[i, j]] = simplex_b[[j, i]]
+
+
+def _perpendicular(x: float, y: float, z: float) -> Tuple[float, float, float]:
+    """Any vector perpendicular to (x, y, z), crossed with its least-aligned axis."""
+    ax, ay, az = abs(x), abs(y), abs(z)
+    if ax < ay and ax < az:
+        return 0.0, -z, y
+    elif ay < az:
+        return -z, 0.0, x
+    return -y, x, 0.0
@@ -1,96 +1,192 @@
-from typing import Dict, Tuple, Optional
+import math
+from typing import Callable, Dict, Tuple, Optional
+import numpy as np
 from engine.math import EPSILON
 from engine.math.datatypes.aabb import AABB
 from engine.math.datatypes.vector3 import Vector3
 from engine.math.datatypes.transform_3d import Transform3D
 from engine.servers.physics.enums import PhysicsServer3DEnums
-from engine.servers.physics.solver.result import CollisionResult, SupportPoint
+from engine.servers.physics.solver.result import (
+    CollisionResult,
+    SupportPoint,
+    SupportShape,
+    get_result,
+)
+
+EPSILON_SQ = EPSILON * EPSILON
 
 
 def support(
     direction: Vector3,
     shape_A_type: int,
     transform_A: Transform3D,
-    data_A: Dict,
+    shape_A: SupportShape,
     shape_B_type: int,
     transform_B: Transform3D,
-    data_B: Dict,
+    shape_B: SupportShape,
 ) -> SupportPoint:
     """
     Compute support point in Minkowski difference (A - B).
     Returns furthest point in given direction.
     """
-    point_a = get_support_point(direction, shape_A_type, transform_A, data_A)
-    point_b = get_support_point(-direction, shape_B_type, transform_B, data_B)
+    point_a = get_support_point(direction, shape_A_type, transform_A, shape_A)
+    point_b = get_support_point(-direction, shape_B_type, transform_B, shape_B)
     return SupportPoint(point_a - point_b, point_a, point_b)
 
 
 def get_support_point(
-    direction: Vector3, shape_type: int, transform: Transform3D, data: Dict
+    direction: Vector3, shape_type: int, transform: Transform3D, shape: SupportShape
 ) -> Vector3:
     """Get support point for individual shape in given direction"""
+    return Vector3.from_numpy(
+        _support_array(direction.data, shape_type, transform, shape)
+    )
+
 
-    local_dir = Vector3(
-        direction.dot(transform.basis.x),
-        direction.dot(transform.basis.y),
-        direction.dot(transform.basis.z),
+def support_into(
+    direction: np.ndarray,
+    shape_A_type: int,
+    transform_A: Transform3D,
+    shape_A: SupportShape,
+    shape_B_type: int,
+    transform_B: Transform3D,
+    shape_B: SupportShape,
+    out_minkowski: np.ndarray,
+    out_a: np.ndarray,
+    out_b: np.ndarray,
+):
+    """
+    Same as support(), but writes the Minkowski point and both witness points
+    into caller-owned rows instead of allocating a SupportPoint.
+    """
+    get_pair_support(shape_A_type, shape_B_type)(
+        direction,
+        transform_A,
+        shape_A,
+        transform_B,
+        shape_B,
+        out_minkowski,
+        out_a,
+        out_b,
     )
 
-    local_support = Vector3()
 
-    if shape_type == PhysicsServer3DEnums.SHAPE_SPHERE:
-        radius = data.get("radius", 0.5)
-        length = local_dir.length()
-        if length > EPSILON:
-            local_support = local_dir / length * radius
+def get_pair_support(shape_A_type: int, shape_B_type: int) -> Callable:
+    """
+    Minkowski support function specialized for one (A, B) shape type pair.
 
-    elif shape_type == PhysicsServer3DEnums.SHAPE_BOX:
-        half_extents = data.get("half_extents", Vector3(0.5, 0.5, 0.5))
-        local_support = Vector3(
-            half_extents.x if local_dir.x > 0 else -half_extents.x,
-            half_extents.y if local_dir.y > 0 else -half_extents.y,
-            half_extents.z if local_dir.z > 0 else -half_extents.z,
+    The returned callable takes ``(direction, transform_A, shape_A,
+    transform_B, shape_B, out_minkowski, out_a, out_b)`` and writes rows like
+    support_into(). Look it up once per query and reuse it in the loop.
+    """
+    pair_support = _PAIR_SUPPORT.get((shape_A_type, shape_B_type))
+    if pair_support is None:
+        pair_support = _make_pair_support(
+            _SUPPORT_FUNCTIONS.get(shape_A_type, _support_origin),
+            _SUPPORT_FUNCTIONS.get(shape_B_type, _support_origin),
         )
+    return pair_support
+
+
+def _make_pair_support(support_A: Callable, support_B: Callable) -> Callable:
+    def pair_support(
+        direction: np.ndarray,
+        transform_A: Transform3D,
+        shape_A: SupportShape,
+        transform_B: Transform3D,
+        shape_B: SupportShape,
+        out_minkowski: np.ndarray,
+        out_a: np.ndarray,
+        out_b: np.ndarray,
+    ):
+        out_a[:] = support_A(direction, transform_A, shape_A)
+        out_b[:] = support_B(-direction, transform_B, shape_B)
+        np.subtract(out_a, out_b, out=out_minkowski)
+
+    return pair_support
+
+
+def _support_array(
+    direction: np.ndarray, shape_type: int, transform: Transform3D, shape: SupportShape
+) -> np.ndarray:
+    return _SUPPORT_FUNCTIONS.get(shape_type, _support_origin)(
+        direction, transform, shape
+    )
 
-    elif shape_type == PhysicsServer3DEnums.SHAPE_CAPSULE:
-        radius = data.get("radius", 0.5)
-        height = data.get("height", 2.0)
-        half_height = max(0, (height - 2 * radius) * 0.5)
 
-        if local_dir.y > 0:
-            axis_point = Vector3(0, half_height, 0)
-        else:
-            axis_point = Vector3(0, -half_height, 0)
+def _support_box(
+    direction: np.ndarray, transform: Transform3D, shape: SupportShape
+) -> np.ndarray:
+    basis = transform.basis._m
+    # The farthest corner takes the sign of the local direction per axis
+    local_support = np.copysign(shape.half_extents, basis.T @ direction)
+    return transform.origin.data + basis @ local_support
 
-        radial_dir = Vector3(local_dir.x, 0, local_dir.z)
-        radial_len = radial_dir.length()
-        if radial_len > EPSILON:
-            radial_dir = radial_dir / radial_len * radius
 
-        local_support = axis_point + radial_dir
+def _support_sphere(
+    direction: np.ndarray, transform: Transform3D, shape: SupportShape
+) -> np.ndarray:
+    basis = transform.basis._m
+    lx, ly, lz = (basis.T @ direction).tolist()
 
-    elif shape_type == PhysicsServer3DEnums.SHAPE_CYLINDER:
-        radius = data.get("radius", 0.5)
-        height = data.get("height", 2.0)
-        half_height = height * 0.5
+    length_sq = lx * lx + ly * ly + lz * lz
+    if length_sq > EPSILON_SQ:
+        scale = shape.radius / math.sqrt(length_sq)
+        local_support = (lx * scale, ly * scale, lz * scale)
+    else:
+        local_support = (0.0, 0.0, 0.0)
 
-        if local_dir.y > 0:
-            axis_point = Vector3(0, half_height, 0)
-        else:
-            axis_point = Vector3(0, -half_height, 0)
+    return transform.origin.data + basis @ np.array(local_support, dtype=np.float32)
 
-        radial_dir = Vector3(local_dir.x, 0, local_dir.z)
-        radial_len = radial_dir.length()
-        if radial_len > EPSILON:
-            radial_dir = radial_dir / radial_len * radius
 
-        local_support = axis_point + radial_dir
+def _support_capsule(
+    direction: np.ndarray, transform: Transform3D, shape: SupportShape
+) -> np.ndarray:
+    half_height = max(0, (shape.height - 2 * shape.radius) * 0.5)
+    return _support_column(direction, transform, shape.radius, half_height)
 
-    return transform.origin + (
-        transform.basis.x * local_support.x
-        + transform.basis.y * local_support.y
-        + transform.basis.z * local_support.z
-    )
+
+def _support_cylinder(
+    direction: np.ndarray, transform: Transform3D, shape: SupportShape
+) -> np.ndarray:
+    return _support_column(direction, transform, shape.radius, shape.height * 0.5)
+
+
+def _support_column(
+    direction: np.ndarray, transform: Transform3D, radius: float, half_height: float
+) -> np.ndarray:
+    """Y-aligned column: axis end point plus the radial direction scaled to radius"""
+    basis = transform.basis._m
+    lx, ly, lz = (basis.T @ direction).tolist()
+
+    radial_sq = lx * lx + lz * lz
+    if radial_sq > EPSILON_SQ:
+        scale = radius / math.sqrt(radial_sq)
+        lx *= scale
+        lz *= scale
+
+    local_support = (lx, half_height if ly > 0 else -half_height, lz)
+    return transform.origin.data + basis @ np.array(local_support, dtype=np.float32)
+
+
+def _support_origin(
+    direction: np.ndarray, transform: Transform3D, shape: SupportShape
+) -> np.ndarray:
+    return transform.origin.data.copy()
+
+
+_SUPPORT_FUNCTIONS: Dict[int, Callable] = {
+    PhysicsServer3DEnums.SHAPE_BOX: _support_box,
+    PhysicsServer3DEnums.SHAPE_SPHERE: _support_sphere,
+    PhysicsServer3DEnums.SHAPE_CAPSULE: _support_capsule,
+    PhysicsServer3DEnums.SHAPE_CYLINDER: _support_cylinder,
+}
+
+_PAIR_SUPPORT: Dict[Tuple[int, int], Callable] = {
+    (type_A, type_B): _make_pair_support(support_A, support_B)
+    for type_A, support_A in _SUPPORT_FUNCTIONS.items()
+    for type_B, support_B in _SUPPORT_FUNCTIONS.items()
+}
 
 
 def sphere_vs_sphere(
@@ -111,10 +207,10 @@ def sphere_vs_sphere(
     if distance_sq >= radius_sum * radius_sum:
         return None
 
-    result = CollisionResult()
+    result = get_result()
     result.collided = True
 
-    distance = distance_sq**0.5
+    distance = math.sqrt(distance_sq)
 
     if distance < EPSILON:
         # Spheres are at same position, use arbitrary normal
@@ -132,6 +228,42 @@ def sphere_vs_sphere(
     return result
 
 
+def sphere_vs_sphere_batch(
+    centers_A: np.ndarray,
+    radii_A: np.ndarray,
+    centers_B: np.ndarray,
+    radii_B: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    sphere_vs_sphere over N pairs at once.
+
+    Takes (N, 3) centers and (N,) radii. Returns the indices of the
+    colliding pairs and, for those only, their normals, depths and the
+    contact points on A and B. ``point`` equals ``point_a`` for every hit.
+    """
+    delta = centers_A - centers_B
+    distance_sq = np.einsum("ij,ij->i", delta, delta)
+    radius_sum = radii_A + radii_B
+
+    hits = np.flatnonzero(distance_sq < radius_sum * radius_sum)
+    delta = delta[hits]
+    radius_sum = radius_sum[hits]
+    distance = np.sqrt(distance_sq[hits])
+
+    # Coincident centers get the same arbitrary normal as sphere_vs_sphere
+    coincident = distance < EPSILON
+    normals = np.empty_like(delta)
+    normals[:] = (1.0, 0.0, 0.0)
+    separated = ~coincident
+    normals[separated] = delta[separated] / distance[separated, None]
+    depths = np.where(coincident, radius_sum, radius_sum - distance)
+
+    points_A = centers_A[hits] - normals * radii_A[hits, None]
+    points_B = centers_B[hits] + normals * radii_B[hits, None]
+
+    return hits, normals, depths, points_A, points_B
+
+
 def sphere_vs_box(
     transform_sphere: Transform3D,
     data_sphere: Dict,
@@ -146,12 +278,9 @@ def sphere_vs_box(
     sphere_center = transform_sphere.origin
 
     # Transform sphere center to box local space
+    basis = transform_box.basis._m
     box_to_sphere = sphere_center - transform_box.origin
-    local_sphere = Vector3(
-        box_to_sphere.dot(transform_box.basis.x),
-        box_to_sphere.dot(transform_box.basis.y),
-        box_to_sphere.dot(transform_box.basis.z),
-    )
+    local_sphere = Vector3.from_numpy(basis.T @ box_to_sphere.data)
 
     # Find closest point on box (in local space)
     closest_local = Vector3(
@@ -161,10 +290,8 @@ def sphere_vs_box(
     )
 
     # Convert back to world space
-    closest_world = transform_box.origin + (
-        transform_box.basis.x * closest_local.x
-        + transform_box.basis.y * closest_local.y
-        + transform_box.basis.z * closest_local.z
+    closest_world = Vector3.from_numpy(
+        transform_box.origin.data + basis @ closest_local.data
     )
 
     # Check distance
@@ -174,10 +301,10 @@ def sphere_vs_box(
     if distance_sq >= radius * radius:
         return None
 
-    result = CollisionResult()
+    result = get_result()
     result.collided = True
 
-    distance = distance_sq**0.5
+    distance = math.sqrt(distance_sq)
 
     # Check if sphere center is inside box
     is_inside = (
@@ -187,26 +314,9 @@ def sphere_vs_box(
     )
 
     if is_inside:
-        # Find closest face
-        dx = half_extents.x - abs(local_sphere.x)
-        dy = half_extents.y - abs(local_sphere.y)
-        dz = half_extents.z - abs(local_sphere.z)
-
-        if dx < dy and dx < dz:
-            # Closest to X face
-            sign = 1 if local_sphere.x > 0 else -1
-            result.normal = transform_box.basis.x * sign
-            result.depth = radius + dx
-        elif dy < dz:
-            # Closest to Y face
-            sign = 1 if local_sphere.y > 0 else -1
-            result.normal = transform_box.basis.y * sign
-            result.depth = radius + dy
-        else:
-            # Closest to Z face
-            sign = 1 if local_sphere.z > 0 else -1
-            result.normal = transform_box.basis.z * sign
-            result.depth = radius + dz
+        result.normal, result.depth = box_inside_push_out(
+            local_sphere.data, half_extents.data, basis, radius
+        )
     else:
         if distance < EPSILON:
             # On surface, use box normal
@@ -223,6 +333,88 @@ def sphere_vs_box(
     return result
 
 
+def sphere_vs_plane(
+    transform_sphere: Transform3D,
+    data_sphere: Dict,
+    transform_plane: Transform3D,
+    data_plane: Dict,
+) -> Optional[CollisionResult]:
+    """Sphere vs Plane collision using the signed distance of the center"""
+    radius = data_sphere.get("radius", 0.5)
+    normal, plane_d = _world_plane(transform_plane, data_plane)
+
+    center = transform_sphere.origin
+    distance = center.dot(normal) + plane_d
+    if distance > radius:
+        return None
+
+    result = get_result()
+    result.collided = True
+    result.normal = normal
+    result.depth = radius - distance
+    result.point = center - normal * distance
+    result.point_a = center - normal * radius
+    result.point_b = result.point
+
+    return result
+
+
+def box_vs_plane(
+    transform_box: Transform3D,
+    data_box: Dict,
+    transform_plane: Transform3D,
+    data_plane: Dict,
+) -> Optional[CollisionResult]:
+    """Box vs Plane collision using the corner deepest along the plane normal"""
+    half_extents = data_box.get("half_extents", Vector3(0.5, 0.5, 0.5))
+    normal, plane_d = _world_plane(transform_plane, data_plane)
+
+    # The deepest corner takes the sign of the local -normal per axis
+    basis = transform_box.basis._m
+    local_corner = np.copysign(half_extents.data, -(basis.T @ normal.data))
+    corner = Vector3.from_numpy(transform_box.origin.data + basis @ local_corner)
+
+    distance = corner.dot(normal) + plane_d
+    if distance > 0.0:
+        return None
+
+    result = get_result()
+    result.collided = True
+    result.normal = normal
+    result.depth = -distance
+    result.point = corner - normal * distance
+    result.point_a = corner
+    result.point_b = result.point
+
+    return result
+
+
+def _world_plane(
+    transform_plane: Transform3D, data_plane: Dict
+) -> Tuple[Vector3, float]:
+    """World normal and offset of a plane shape, as in capsule_vs_plane"""
+    normal = transform_plane.basis.xform(
+        data_plane.get("normal", Vector3(0, 1, 0))
+    ).normalized()
+    return normal, data_plane.get("d", 0.0) - normal.dot(transform_plane.origin)
+
+
+def box_inside_push_out(
+    local_point: np.ndarray, half_extents: np.ndarray, basis: np.ndarray, radius: float
+) -> Tuple[Vector3, float]:
+    """
+    Push-out for a point lying inside the box.
+
+    Picks the face closest to the box-local point and returns its world
+    normal (basis column, signed by side) and the penetration depth.
+    Works on the raw arrays so the whole block is a handful of numpy ops.
+    """
+    face_dist = half_extents - np.abs(local_point)
+    axis = int(face_dist.argmin())
+    sign = 1.0 if local_point[axis] > 0 else -1.0
+    return Vector3.from_numpy(basis[:, axis] * sign), radius + float(face_dist[axis])
+
+
 def get_aabb(shape_type: int, transform: Transform3D, data: Dict) -> AABB:
     """Get axis-aligned bounding box for shape"""
     if shape_type == PhysicsServer3DEnums.SHAPE_SPHERE:
@@ -234,31 +426,9 @@ def get_aabb(shape_type: int, transform: Transform3D, data: Dict) -> AABB:
 
     elif shape_type == PhysicsServer3DEnums.SHAPE_BOX:
         half_extents = data.get("half_extents", Vector3(0.5, 0.5, 0.5))
-        corners = []
-        for i in range(8):
-            x = half_extents.x if (i & 1) else -half_extents.x
-            y = half_extents.y if (i & 2) else -half_extents.y
-            z = half_extents.z if (i & 4) else -half_extents.z
-
-            local = Vector3(x, y, z)
-            world = transform.origin + (
-                transform.basis.x * local.x
-                + transform.basis.y * local.y
-                + transform.basis.z * local.z
-            )
-            corners.append(world)
-
-        min_pos = Vector3(
-            min(c.x for c in corners),
-            min(c.y for c in corners),
-            min(c.z for c in corners),
-        )
-        max_pos = Vector3(
-            max(c.x for c in corners),
-            max(c.y for c in corners),
-            max(c.z for c in corners),
-        )
-        return AABB(min_pos, max_pos - min_pos)
+        # World half size of an oriented box: |basis| projects each extent
+        half = Vector3.from_numpy(np.abs(transform.basis._m) @ half_extents.data)
+        return AABB(transform.origin - half, half * 2.0)
 
     elif shape_type == PhysicsServer3DEnums.SHAPE_CAPSULE:
         radius = data.get("radius", 0.5)
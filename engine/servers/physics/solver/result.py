@@ -1,9 +1,17 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, List
+import numpy as np
 from engine.math.datatypes.vector3 import Vector3
 
+RESULT_POOL_SIZE = 64
+
 
 class CollisionResult:
     """Holds collision detection results"""
 
+    __slots__ = ("collided", "normal", "point", "depth", "point_a", "point_b")
+
     def __init__(self):
         self.collided = False
         self.normal = Vector3()
@@ -13,10 +21,102 @@ class CollisionResult:
         self.point_b = Vector3()
 
 
+class CollisionRecord:
+    """
+    A body-level hit from a motion test: the contact plus which body and
+    shapes produced it. Written in place, so one record per test is reused
+    for every shape pair instead of building a dict per hit.
+    """
+
+    __slots__ = (
+        "fraction",
+        "point",
+        "normal",
+        "depth",
+        "collider",
+        "collider_rid",
+        "collider_shape",
+        "local_shape",
+    )
+
+    def __init__(self):
+        self.fraction = 1.0
+        self.point = Vector3()
+        self.normal = Vector3()
+        self.depth = 0.0
+        self.collider = None
+        self.collider_rid = None
+        self.collider_shape = 0
+        self.local_shape = 0
+
+    def copy_from(self, other: "CollisionRecord"):
+        self.fraction = other.fraction
+        self.point = other.point
+        self.normal = other.normal
+        self.depth = other.depth
+        self.collider = other.collider
+        self.collider_rid = other.collider_rid
+        self.collider_shape = other.collider_shape
+        self.local_shape = other.local_shape
+
+
+# Per thread, since spaces may be stepped concurrently on worker threads
+_result_pools = threading.local()
+
+
+def _result_pool() -> List[CollisionResult]:
+    try:
+        return _result_pools.pool
+    except AttributeError:
+        pool = _result_pools.pool = []
+        return pool
+
+
+def get_result() -> CollisionResult:
+    """
+    Take a CollisionResult from this thread's pool, or allocate one if it is
+    empty. Pooled results keep their old field values; solvers assign every
+    field.
+    """
+    pool = _result_pool()
+    if pool:
+        return pool.pop()
+    return CollisionResult()
+
+
+def release_result(result: CollisionResult):
+    """
+    Hand a result back once its fields have been read. The vectors it points
+    at are never mutated in place, so references taken from it stay valid.
+    """
+    pool = _result_pool()
+    if len(pool) < RESULT_POOL_SIZE:
+        pool.append(result)
+
+
 class SupportPoint:
     """Support point for GJK algorithm"""
 
+    __slots__ = ("minkowski", "point_a", "point_b")
+
     def __init__(self, minkowski: Vector3, point_a: Vector3, point_b: Vector3):
         self.minkowski = minkowski
         self.point_a = point_a
         self.point_b = point_b
+
+
+@dataclass(slots=True)
+class SupportShape:
+    """Shape fields read by the support function, unpacked once per query"""
+
+    radius: float
+    half_extents: np.ndarray
+    height: float
+
+    @classmethod
+    def from_data(cls, data: Dict) -> "SupportShape":
+        return cls(
+            data.get("radius", 0.5),
+            data.get("half_extents", Vector3(0.5, 0.5, 0.5)).data,
+            data.get("height", 2.0),
+        )
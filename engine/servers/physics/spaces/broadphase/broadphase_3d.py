@@ -1,93 +1,374 @@
-from typing import List, Tuple, Dict
-from engine.math.datatypes.aabb import AABB
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum, auto
+from operator import attrgetter
+from typing import Collection, Iterable, List, Tuple, Dict
+import numpy as np
+from engine.math.datatypes.aabb import AABB, segment_hits_bounds
 from engine.math.datatypes.vector3 import Vector3
 from engine.math.datatypes.transform_3d import Transform3D
 from engine.servers.physics.enums import PhysicsServer3DEnums
+from engine.servers.physics.spaces.broadphase.dynamic_bvh import (
+    DynamicBVH,
+    bounds_of,
+)
+from engine.servers.physics.spaces.broadphase.uniform_grid import UniformGrid3D
+
+
+class BroadphaseStrategy(IntEnum):
+    # Dense numpy tests while small, then sweep-and-prune pairs / BVH queries
+    AUTO = auto()
+    # Sweep-and-prune pairs, BVH queries
+    SWEEP = auto()
+    # Pairs and queries both from the BVH
+    BVH = auto()
+    # Pairs and queries from a uniform hash grid
+    GRID = auto()
 
 
 class BroadphaseEntry:
     """Represents a body or area in the broadphase"""
 
-    __slots__ = ("body", "aabb", "collision_layer", "collision_mask")
+    __slots__ = (
+        "body",
+        "aabb",
+        "collision_layer",
+        "collision_mask",
+        "min_x",
+        "max_x",
+        "fat_aabb",
+        "leaf",
+        "row",
+        "static",
+    )
 
     def __init__(self, body, aabb: AABB, layer: int, mask: int):
         self.body = body
-        self.aabb = aabb
         self.collision_layer = layer
         self.collision_mask = mask
+        self.static = body.is_static()
+        self.leaf = None
+        self.row = -1
+        self.set_aabb(aabb)
+        self.fat_aabb = aabb.grow(AABB_MARGIN)
+
+    def set_aabb(self, aabb: AABB):
+        """Store the AABB along with its x interval, the sweep axis"""
+        self.aabb = aabb
+        self.min_x = float(aabb.position.x)
+        self.max_x = float(aabb.end.x)
+
+
+_entry_min_x = attrgetter("min_x")
+
+# How far the fat AABB kept in the tree reaches past the tight one, so small
+# motions do not force a re-insert every step
+AABB_MARGIN = 0.2
+
+# Up to this many entries, pairs come from one dense N x N overlap test;
+# past it the quadratic memory outgrows the sweep
+VECTORIZED_PAIR_LIMIT = 1024
+# From this many entries the dense test is split into row blocks run on a
+# thread pool
+PARALLEL_PAIR_THRESHOLD = 512
+PAIR_BLOCK_ROWS = 128
+# Calls to get_collision_pairs between re-sampling the dominant axis
+DOMINANT_AXIS_INTERVAL = 60
+# Up to this many entries, AABB and ray queries scan the SoA columns in one
+# numpy pass; past it they descend the BVH
+VECTORIZED_QUERY_LIMIT = 8192
 
 
 class Broadphase3D:
-    def __init__(self):
-        self._entries: Dict = {}
+    def __init__(
+        self,
+        strategy: BroadphaseStrategy = BroadphaseStrategy.AUTO,
+        capacity: int = 16,
+    ):
+        self.strategy = strategy
+        capacity = max(capacity, 1)
+        # Entries partitioned by body mode; static-static pairs are never
+        # reported, so pair searches start from the dynamic side
+        self._dynamic: Dict = {}
+        self._static: Dict = {}
+        # Structure-of-arrays copy of the entries for vectorized tests. Only
+        # the first len(self._rows) rows are live; removal swaps in the last
+        self._rows: List[BroadphaseEntry] = []
+        self._mins = np.empty((capacity, 3), dtype=np.float32)
+        self._maxs = np.empty((capacity, 3), dtype=np.float32)
+        self._layers = np.empty(capacity, dtype=np.int64)
+        self._masks = np.empty(capacity, dtype=np.int64)
+        self._statics = np.empty(capacity, dtype=bool)
+        # Integer id of each row's body RID, for vectorized exclusion
+        self._ids = np.empty(capacity, dtype=np.int64)
+        # Same entries ordered by min_x; re-sorted each sweep, which is close
+        # to linear because bodies move little between steps
+        self._sweep_list: List[BroadphaseEntry] = []
+        # Spatial queries (query_aabb, raycast) descend this tree instead of
+        # scanning every entry
+        self._tree = DynamicBVH()
+        # Axis along which entry positions spread the most, and therefore the
+        # one most likely to separate two AABBs; tested first
+        self._dominant_axis = 0
+        self._pair_calls = 0
+        # Only maintained for BroadphaseStrategy.GRID
+        self._grid = UniformGrid3D() if strategy == BroadphaseStrategy.GRID else None
 
     def add_body(self, body, aabb: AABB):
         """Add a body to broadphase"""
 
+        if body.rid in self._dynamic or body.rid in self._static:
+            self.remove_body(body)
+
         entry = BroadphaseEntry(body, aabb, body.collision_layer, body.collision_mask)
-        self._entries[body.rid] = entry
+        entry.leaf = self._tree.insert(entry, entry.fat_aabb)
+        self._partition(entry.static)[body.rid] = entry
+        self._sweep_list.append(entry)
+        self._add_row(entry)
+        if self._grid is not None:
+            self._grid.insert(entry, aabb)
 
     def remove_body(self, body):
         """Remove a body from broadphase"""
-        if body.rid in self._entries:
-            del self._entries[body.rid]
+        entry = self._dynamic.pop(body.rid, None)
+        if entry is None:
+            entry = self._static.pop(body.rid, None)
+        if entry is not None:
+            self._sweep_list.remove(entry)
+            self._tree.remove(entry.leaf)
+            self._remove_row(entry)
+            if self._grid is not None:
+                self._grid.remove(entry, entry.aabb)
 
     def update_body(self, body, aabb: AABB):
         """Update body's AABB"""
-        if body.rid in self._entries:
-            self._entries[body.rid].aabb = aabb
+        entry = self._dynamic.get(body.rid)
+        if entry is None:
+            entry = self._static.get(body.rid)
+        if entry is not None:
+            if self._grid is not None:
+                self._grid.move(entry, entry.aabb, aabb)
+
+            entry.set_aabb(aabb)
+            self._mins[entry.row] = aabb.position.data
+            self._maxs[entry.row] = aabb.end.data
+
+            # The tree only sees the fat AABB: leave it alone until the body
+            # escapes it
+            if not entry.fat_aabb.encloses(aabb):
+                entry.fat_aabb = aabb.grow(AABB_MARGIN)
+                self._tree.move(entry.leaf, entry.fat_aabb)
+
+    def update_body_mode(self, body):
+        """Move a body to the partition matching its current mode"""
+        static = body.is_static()
+        entry = self._partition(not static).pop(body.rid, None)
+        if entry is not None:
+            entry.static = static
+            self._statics[entry.row] = static
+            self._partition(static)[body.rid] = entry
 
     def get_collision_pairs(self) -> List[Tuple]:
         """
         Get all potentially colliding body pairs.
 
+        With BroadphaseStrategy.AUTO, small sets run one vectorized
+        all-pairs test over the SoA columns and larger ones sweep-and-prune
+        along x; the other strategies always use their own structure.
+
         Returns:
             List of (body_a, body_b) tuples that have overlapping AABBs
             and matching layer/mask
         """
-        pairs = []
-        entries = list(self._entries.values())
+        strategy = self.strategy
+
+        self._pair_calls += 1
+        if self._pair_calls >= DOMINANT_AXIS_INTERVAL:
+            self._pair_calls = 0
+            self._update_dominant_axis()
+
+        if strategy == BroadphaseStrategy.GRID:
+            grid = self._grid
+            if grid.needs_rebuild():
+                grid.rebuild([(entry, entry.aabb) for entry in self._rows])
+            return self._filter_pairs(grid.candidate_pairs())
+
+        if strategy == BroadphaseStrategy.BVH:
+            return self._filter_pairs(self._tree_candidate_pairs())
 
-        for i in range(len(entries)):
-            entry_a = entries[i]
+        if (
+            strategy == BroadphaseStrategy.AUTO
+            and len(self._rows) <= VECTORIZED_PAIR_LIMIT
+        ):
+            return self._get_collision_pairs_dense()
 
-            if entry_a.body.is_static():
+        return self._get_collision_pairs_sweep()
+
+    def _filter_pairs(self, candidates: Iterable[Tuple]) -> List[Tuple]:
+        """Apply the static, layer/mask and exact AABB tests to entry pairs"""
+        pairs = []
+        axis = self._dominant_axis
+        for entry_a, entry_b in candidates:
+            if not (entry_a.collision_mask & entry_b.collision_layer):
+                continue
+            if not (entry_b.collision_mask & entry_a.collision_layer):
+                continue
+            if not entry_a.aabb.intersects_axis_first(entry_b.aabb, axis):
+                continue
+            if entry_a.static and entry_b.static:
                 continue
 
-            for j in range(i + 1, len(entries)):
-                entry_b = entries[j]
+            pairs.append((entry_a.body, entry_b.body))
 
-                if entry_a.body.is_static() and entry_b.body.is_static():
-                    continue
+        return pairs
+
+    def _tree_candidate_pairs(self):
+        # Only dynamic entries search the tree: each dynamic pair is kept
+        # once by row order, every dynamic-static pair as found
+        tree = self._tree
+        for entry in self._dynamic.values():
+            row = entry.row
+            for other in tree.query(entry.aabb):
+                if other.static or other.row > row:
+                    yield entry, other
+
+    def _get_collision_pairs_dense(self) -> List[Tuple]:
+        rows = self._rows
+        count = len(rows)
+        if count < 2:
+            return []
+
+        static = self._statics
+
+        if count < PARALLEL_PAIR_THRESHOLD:
+            blocks = [self._dense_pair_block(0, count, count, static)]
+        else:
+            # numpy drops the GIL inside its kernels, so row blocks of the
+            # upper triangle overlap on the worker threads
+            blocks = list(
+                _get_pair_executor().map(
+                    lambda start: self._dense_pair_block(
+                        start, min(start + PAIR_BLOCK_ROWS, count), count, static
+                    ),
+                    range(0, count, PAIR_BLOCK_ROWS),
+                )
+            )
+
+        pairs = []
+        for first, second in blocks:
+            pairs.extend(
+                (rows[i].body, rows[j].body)
+                for i, j in zip(first.tolist(), second.tolist())
+            )
+        return pairs
 
-                if not (entry_a.collision_mask & entry_b.collision_layer):
+    def _dense_pair_block(
+        self, start: int, stop: int, count: int, static: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Row indices (i, j), start <= i < stop and i < j, of candidate pairs"""
+        mins = self._mins[start:count]
+        maxs = self._maxs[start:count]
+        layers = self._layers[start:count]
+        masks = self._masks[start:count]
+        static = static[start:count]
+        rows = stop - start
+
+        # AABB.intersects: min_i < max_j and min_j < max_i on every axis
+        candidates = np.all(mins[:rows, None, :] < maxs[None, :, :], axis=2)
+        candidates &= np.all(maxs[:rows, None, :] > mins[None, :, :], axis=2)
+        candidates &= (masks[:rows, None] & layers[None, :]) != 0
+        candidates &= (layers[:rows, None] & masks[None, :]) != 0
+        candidates &= ~(static[:rows, None] & static[None, :])
+
+        first, second = np.nonzero(np.triu(candidates, k=1))
+        return first + start, second + start
+
+    def _get_collision_pairs_sweep(self) -> List[Tuple]:
+        """
+        Sweep-and-prune along x: only entries whose x intervals overlap are
+        tested against each other, then layer/mask and the full AABB check.
+        """
+        pairs = []
+        entries = self._sweep_list
+        entries.sort(key=_entry_min_x)
+        # x already overlaps for every tested pair; start from the better of y/z
+        axis = 2 if self._dominant_axis == 2 else 1
+
+        # Active entries as (max_x, layer, mask, aabb, body) tuples, read once
+        # per entry instead of once per tested pair. Statics are kept apart
+        # and only ever tested against dynamic entries
+        active_dynamic = []
+        active_static = []
+        for entry in entries:
+            min_x = entry.min_x
+            active_dynamic = [item for item in active_dynamic if item[0] > min_x]
+            active_static = [item for item in active_static if item[0] > min_x]
+
+            body_b = entry.body
+            layer_b = entry.collision_layer
+            mask_b = entry.collision_mask
+            aabb_b = entry.aabb
+
+            if entry.static:
+                active, others = active_static, active_dynamic
+            else:
+                active = active_dynamic
+                others = active_dynamic + active_static
+
+            for _, layer_a, mask_a, aabb_a, body_a in others:
+                if not (mask_a & layer_b):
                     continue
-                if not (entry_b.collision_mask & entry_a.collision_layer):
+                if not (mask_b & layer_a):
                     continue
 
-                if entry_a.aabb.intersects(entry_b.aabb):
-                    pairs.append((entry_a.body, entry_b.body))
+                if aabb_a.intersects_axis_first(aabb_b, axis):
+                    pairs.append((body_a, body_b))
+
+            active.append((entry.max_x, layer_b, mask_b, aabb_b, body_b))
 
         return pairs
 
-    def query_aabb(self, aabb: AABB, collision_mask: int = 0xFFFFFFFF) -> List:
+    def query_aabb(
+        self,
+        aabb: AABB,
+        collision_mask: int = 0xFFFFFFFF,
+        exclude: Collection[int] = (),
+    ) -> List:
         """
         Query all bodies overlapping an AABB.
 
         Args:
             aabb: Query AABB
             collision_mask: Collision mask filter
+            exclude: Integer ids (RID.get_id()) of bodies to leave out
 
         Returns:
             List of bodies overlapping the AABB
         """
+        strategy = self.strategy
+
+        if strategy == BroadphaseStrategy.GRID:
+            candidates = self._grid.query(*bounds_of(aabb))
+        elif (
+            strategy == BroadphaseStrategy.AUTO
+            and len(self._rows) <= VECTORIZED_QUERY_LIMIT
+        ):
+            return self.query_aabb_vectorized(
+                aabb.position.data, aabb.end.data, collision_mask, exclude
+            )
+        else:
+            candidates = self._tree.query(aabb)
+
         results = []
+        axis = self._dominant_axis
 
-        for entry in self._entries.values():
+        for entry in candidates:
             if not (collision_mask & entry.collision_layer):
                 continue
 
-            if aabb.intersects(entry.aabb):
+            if exclude and entry.body.rid.get_id() in exclude:
+                continue
+
+            if aabb.intersects_axis_first(entry.aabb, axis):
                 results.append(entry.body)
 
         return results
@@ -112,79 +393,245 @@ class Broadphase3D:
         """
         results = []
 
-        min_x = min(from_pos.x, to_pos.x)
-        min_y = min(from_pos.y, to_pos.y)
-        min_z = min(from_pos.z, to_pos.z)
-        max_x = max(from_pos.x, to_pos.x)
-        max_y = max(from_pos.y, to_pos.y)
-        max_z = max(from_pos.z, to_pos.z)
+        ox, oy, oz = from_pos.x, from_pos.y, from_pos.z
+        dx, dy, dz = to_pos.x - ox, to_pos.y - oy, to_pos.z - oz
+
+        strategy = self.strategy
+
+        if strategy == BroadphaseStrategy.GRID:
+            entries = [
+                entry
+                for entry in self._grid.query(
+                    (min(ox, to_pos.x), min(oy, to_pos.y), min(oz, to_pos.z)),
+                    (max(ox, to_pos.x), max(oy, to_pos.y), max(oz, to_pos.z)),
+                )
+                if collision_mask & entry.collision_layer
+            ]
+        elif (
+            strategy == BroadphaseStrategy.AUTO
+            and len(self._rows) <= VECTORIZED_QUERY_LIMIT
+        ):
+            # Prefilter on the segment's bounds, inclusive so that axis
+            # aligned rays with a zero-thick bound are kept
+            count = len(self._rows)
+            seg_min = np.minimum(from_pos.data, to_pos.data)
+            seg_max = np.maximum(from_pos.data, to_pos.data)
+            hits = (
+                np.all(self._mins[:count] <= seg_max, axis=1)
+                & np.all(self._maxs[:count] >= seg_min, axis=1)
+                & ((self._layers[:count] & collision_mask) != 0)
+            )
+            rows = self._rows
+            entries = [rows[i] for i in np.flatnonzero(hits).tolist()]
+        else:
+            entries = [
+                entry
+                for entry in self._tree.raycast(from_pos, to_pos)
+                if collision_mask & entry.collision_layer
+            ]
+
+        for entry in entries:
+            lo, hi = bounds_of(entry.aabb)
+            if segment_hits_bounds(ox, oy, oz, dx, dy, dz, lo, hi):
+                results.append(entry.body)
 
-        ray_aabb = AABB(
-            Vector3(min_x, min_y, min_z),
-            Vector3(max_x - min_x, max_y - min_y, max_z - min_z),
-        )
+        return results
 
-        for entry in self._entries.values():
-            if not (collision_mask & entry.collision_layer):
-                continue
+    def query_aabb_vectorized(
+        self,
+        min3: np.ndarray,
+        max3: np.ndarray,
+        collision_mask: int = 0xFFFFFFFF,
+        exclude: Collection[int] = (),
+    ) -> List:
+        """
+        Same test as query_aabb, run over every row in one numpy pass.
 
-            if ray_aabb.intersects(entry.aabb):
-                results.append(entry.body)
+        Args:
+            min3: Query AABB minimum corner
+            max3: Query AABB maximum corner
+            collision_mask: Collision mask filter
+            exclude: Integer ids (RID.get_id()) of bodies to leave out
 
-        return results
+        Returns:
+            List of bodies overlapping the AABB
+        """
+        count = len(self._rows)
+        hits = (
+            np.all(self._mins[:count] < max3, axis=1)
+            & np.all(self._maxs[:count] > min3, axis=1)
+            & ((self._layers[:count] & collision_mask) != 0)
+        )
+        if exclude:
+            hits &= ~np.isin(
+                self._ids[:count], np.fromiter(exclude, np.int64, len(exclude))
+            )
+        rows = self._rows
+        return [rows[i].body for i in np.flatnonzero(hits).tolist()]
 
     def clear(self):
         """Clear all entries"""
-        self._entries.clear()
+        self._dynamic.clear()
+        self._static.clear()
+        self._sweep_list.clear()
+        self._tree.clear()
+        self._rows.clear()
+        if self._grid is not None:
+            self._grid.clear()
+        self._dominant_axis = 0
+        self._pair_calls = 0
 
     def __len__(self):
-        return len(self._entries)
-
-
-def compute_body_aabb(body, shape_storage) -> AABB:
+        return len(self._dynamic) + len(self._static)
+
+    def _partition(self, static: bool) -> Dict:
+        return self._static if static else self._dynamic
+
+    def _update_dominant_axis(self):
+        count = len(self._rows)
+        if count > 1:
+            self._dominant_axis = int(np.argmax(np.var(self._mins[:count], axis=0)))
+
+    def reserve(self, capacity: int):
+        """Grow the SoA columns, by doubling, to hold at least ``capacity`` rows"""
+        current = len(self._mins)
+        if capacity <= current:
+            return
+        while current < capacity:
+            current *= 2
+        self._grow_rows(current)
+
+    def _grow_rows(self, capacity: int):
+        self._mins = _grow(self._mins, capacity)
+        self._maxs = _grow(self._maxs, capacity)
+        self._layers = _grow(self._layers, capacity)
+        self._masks = _grow(self._masks, capacity)
+        self._statics = _grow(self._statics, capacity)
+        self._ids = _grow(self._ids, capacity)
+
+    def _add_row(self, entry: BroadphaseEntry):
+        row = len(self._rows)
+        if row == len(self._mins):
+            self._grow_rows(row * 2)
+
+        entry.row = row
+        self._rows.append(entry)
+        self._mins[row] = entry.aabb.position.data
+        self._maxs[row] = entry.aabb.end.data
+        self._layers[row] = entry.collision_layer
+        self._masks[row] = entry.collision_mask
+        self._statics[row] = entry.static
+        self._ids[row] = entry.body.rid.get_id()
+
+    def _remove_row(self, entry: BroadphaseEntry):
+        row = entry.row
+        last = len(self._rows) - 1
+        if row != last:
+            moved = self._rows[last]
+            moved.row = row
+            self._rows[row] = moved
+            self._mins[row] = self._mins[last]
+            self._maxs[row] = self._maxs[last]
+            self._layers[row] = self._layers[last]
+            self._masks[row] = self._masks[last]
+            self._statics[row] = self._statics[last]
+            self._ids[row] = self._ids[last]
+
+        self._rows.pop()
+        entry.row = -1
+
+
+_pair_executor = None
+
+
+def _get_pair_executor() -> ThreadPoolExecutor:
+    global _pair_executor
+    if _pair_executor is None:
+        _pair_executor = ThreadPoolExecutor(thread_name_prefix="broadphase")
+    return _pair_executor
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+def compute_body_aabb(body, shape_storage, transform: Transform3D = None) -> AABB:
     """
     Compute the combined AABB for all shapes in a body.
 
+    The result is cached on the body and reused while the transform value,
+    the body's shape count and disabled shapes, and the shape storage's data
+    version are all unchanged.
+
     Args:
         body: Body3D instance
         shape_storage: Reference to shape storage for shape data
+        transform: Body transform to use instead of body.transform
 
     Returns:
         Combined AABB in world space
     """
-    if not body.shapes:
-        return AABB(
-            body.transform.origin - Vector3(0.1, 0.1, 0.1), Vector3(0.2, 0.2, 0.2)
-        )
+    if transform is None:
+        transform = body.transform
+
+    key = (
+        transform.basis._m.tobytes() + transform.origin.data.tobytes(),
+        len(body.shapes),
+        body.disabled_shapes,
+        shape_storage._shape_version,
+    )
+    cached = body._aabb_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    aabb = _compute_body_aabb(
+        body.shapes, body.disabled_shapes, transform, shape_storage
+    )
+    body._aabb_cache = (key, aabb)
+    return aabb
+
 
-    first_shape_info = body.shapes[0]
-    if first_shape_info.get("disabled", False):
-        for shape_info in body.shapes:
-            if not shape_info.get("disabled", False):
-                first_shape_info = shape_info
-                break
+def _compute_body_aabb(
+    shapes: List, disabled_shapes: int, transform: Transform3D, shape_storage
+) -> AABB:
+    if not shapes:
+        return AABB(transform.origin - Vector3(0.1, 0.1, 0.1), Vector3(0.2, 0.2, 0.2))
 
-    shape_rid = first_shape_info["shape"]
-    shape_transform = first_shape_info["transform"]
-    global_transform = body.transform * shape_transform
+    # Lowest clear bit of the mask is the first enabled shape; with every
+    # shape disabled the first one still seeds the bounds
+    first = (~disabled_shapes & (disabled_shapes + 1)).bit_length() - 1
+    if first >= len(shapes):
+        first = 0
+    first_shape_info = shapes[first]
+
+    shape_rid = first_shape_info.shape
+    shape_transform = first_shape_info.transform
+    global_transform = _compose(transform, shape_transform)
 
     shape_data = shape_storage._get_shape_data(shape_rid)
     if not shape_data:
-        return AABB(
-            body.transform.origin - Vector3(0.1, 0.1, 0.1), Vector3(0.2, 0.2, 0.2)
-        )
+        return AABB(transform.origin - Vector3(0.1, 0.1, 0.1), Vector3(0.2, 0.2, 0.2))
 
     combined_aabb = _compute_shape_aabb(
         shape_data.type, global_transform, shape_data.data
     )
+    if len(shapes) == 1:
+        return combined_aabb
 
-    for shape_info in body.shapes[1:]:
-        if shape_info.get("disabled", False):
+    # Running bounds as plain floats; one AABB is built at the end
+    min_x, min_y, min_z = combined_aabb.position.data.tolist()
+    max_x, max_y, max_z = combined_aabb.end.data.tolist()
+
+    for i in range(1, len(shapes)):
+        if disabled_shapes >> i & 1:
             continue
 
-        shape_rid = shape_info["shape"]
-        shape_transform = shape_info["transform"]
-        global_transform = body.transform * shape_transform
+        shape_info = shapes[i]
+        shape_rid = shape_info.shape
+        shape_transform = shape_info.transform
+        global_transform = _compose(transform, shape_transform)
 
         shape_data = shape_storage._get_shape_data(shape_rid)
         if not shape_data:
@@ -194,19 +641,41 @@ def compute_body_aabb(body, shape_storage) -> AABB:
             shape_data.type, global_transform, shape_data.data
         )
 
-        min_pos = Vector3(
-            min(combined_aabb.position.x, shape_aabb.position.x),
-            min(combined_aabb.position.y, shape_aabb.position.y),
-            min(combined_aabb.position.z, shape_aabb.position.z),
-        )
-        max_pos = Vector3(
-            max(combined_aabb.end.x, shape_aabb.end.x),
-            max(combined_aabb.end.y, shape_aabb.end.y),
-            max(combined_aabb.end.z, shape_aabb.end.z),
-        )
-        combined_aabb = AABB(min_pos, max_pos - min_pos)
+        lx, ly, lz = shape_aabb.position.data.tolist()
+        hx, hy, hz = shape_aabb.end.data.tolist()
+        if lx < min_x:
+            min_x = lx
+        if ly < min_y:
+            min_y = ly
+        if lz < min_z:
+            min_z = lz
+        if hx > max_x:
+            max_x = hx
+        if hy > max_y:
+            max_y = hy
+        if hz > max_z:
+            max_z = hz
+
+    return AABB(
+        Vector3(min_x, min_y, min_z),
+        Vector3(max_x - min_x, max_y - min_y, max_z - min_z),
+    )
+
+
+_IDENTITY_KEY = Transform3D().basis._m.tobytes() + Vector3().data.tobytes()
+
 
-    return combined_aabb
+def _compose(body_transform: Transform3D, shape_transform: Transform3D) -> Transform3D:
+    """
+    body_transform * shape_transform, skipping the composition and its
+    temporaries when the shape sits at the body's origin (the usual case).
+    """
+    if (
+        shape_transform.basis._m.tobytes() + shape_transform.origin.data.tobytes()
+        == _IDENTITY_KEY
+    ):
+        return body_transform
+    return body_transform * shape_transform
 
 
 def _compute_shape_aabb(shape_type: int, transform: Transform3D, data: dict) -> AABB:
@@ -217,60 +686,26 @@ def _compute_shape_aabb(shape_type: int, transform: Transform3D, data: dict) ->
     """
     if shape_type == PhysicsServer3DEnums.SHAPE_SPHERE:
         radius = data.get("radius", 0.5)
-        center = transform.origin
-        return AABB(
-            center - Vector3(radius, radius, radius),
-            Vector3(radius * 2, radius * 2, radius * 2),
-        )
+        half = Vector3(radius, radius, radius)
+        return AABB(transform.origin - half, half * 2.0)
 
     elif shape_type == PhysicsServer3DEnums.SHAPE_BOX:
         half_extents = data.get("half_extents", Vector3(0.5, 0.5, 0.5))
-
-        corners = [
-            Vector3(half_extents.x, half_extents.y, half_extents.z),
-            Vector3(half_extents.x, half_extents.y, -half_extents.z),
-            Vector3(half_extents.x, -half_extents.y, half_extents.z),
-            Vector3(half_extents.x, -half_extents.y, -half_extents.z),
-            Vector3(-half_extents.x, half_extents.y, half_extents.z),
-            Vector3(-half_extents.x, half_extents.y, -half_extents.z),
-            Vector3(-half_extents.x, -half_extents.y, half_extents.z),
-            Vector3(-half_extents.x, -half_extents.y, -half_extents.z),
-        ]
-
-        transformed = [transform.xform(c) for c in corners]
-
-        min_pos = Vector3(
-            min(c.x for c in transformed),
-            min(c.y for c in transformed),
-            min(c.z for c in transformed),
-        )
-        max_pos = Vector3(
-            max(c.x for c in transformed),
-            max(c.y for c in transformed),
-            max(c.z for c in transformed),
-        )
-        return AABB(min_pos, max_pos - min_pos)
+        # World half size of an oriented box: |basis| projects each extent,
+        # the same bound the eight transformed corners would give
+        half = Vector3.from_numpy(np.abs(transform.basis._m) @ half_extents.data)
+        return AABB(transform.origin - half, half * 2.0)
 
     elif shape_type == PhysicsServer3DEnums.SHAPE_CAPSULE:
         radius = data.get("radius", 0.5)
         height = data.get("height", 2.0)
         half_height = max(0, (height - 2 * radius) * 0.5)
 
-        axis = transform.basis.y
-        p1 = transform.origin - axis * half_height
-        p2 = transform.origin + axis * half_height
-
-        min_pos = Vector3(
-            min(p1.x, p2.x) - radius,
-            min(p1.y, p2.y) - radius,
-            min(p1.z, p2.z) - radius,
-        )
-        max_pos = Vector3(
-            max(p1.x, p2.x) + radius,
-            max(p1.y, p2.y) + radius,
-            max(p1.z, p2.z) + radius,
+        # Segment end points are origin +- axis * half_height, grown by radius
+        half = Vector3.from_numpy(
+            np.abs(transform.basis._m[:, 1]) * half_height + radius
         )
-        return AABB(min_pos, max_pos - min_pos)
+        return AABB(transform.origin - half, half * 2.0)
 
     elif shape_type == PhysicsServer3DEnums.SHAPE_PLANE:
         huge_size = 10000.0
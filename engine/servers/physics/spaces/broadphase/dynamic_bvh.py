@@ -0,0 +1,210 @@
+from typing import List, Optional, Tuple
+from engine.math.datatypes.aabb import AABB, segment_hits_bounds
+from engine.math.datatypes.vector3 import Vector3
+
+Bounds = Tuple[float, float, float]
+
+
+class BVHNode:
+    """
+    Node of a DynamicBVH.
+    Leaves hold a broadphase entry; internal nodes always have two children.
+    """
+
+    __slots__ = ("lo", "hi", "parent", "left", "right", "entry")
+
+    def __init__(self, lo: Bounds, hi: Bounds, entry=None):
+        self.lo = lo
+        self.hi = hi
+        self.parent: Optional["BVHNode"] = None
+        self.left: Optional["BVHNode"] = None
+        self.right: Optional["BVHNode"] = None
+        self.entry = entry
+
+    def is_leaf(self) -> bool:
+        return self.left is None
+
+
+class DynamicBVH:
+    """
+    Incremental bounding volume hierarchy.
+
+    Leaves are inserted next to the sibling that grows the tree's surface
+    area the least. Callers store fattened AABBs and only move a leaf once
+    the tight AABB escapes its fat one.
+    """
+
+    def __init__(self):
+        self.root: Optional[BVHNode] = None
+
+    def insert(self, entry, aabb: AABB) -> BVHNode:
+        """Insert an entry and return its leaf, to be passed to move/remove"""
+        lo, hi = bounds_of(aabb)
+        leaf = BVHNode(lo, hi, entry)
+        self._insert_leaf(leaf)
+        return leaf
+
+    def remove(self, leaf: BVHNode):
+        """Remove a leaf returned by insert()"""
+        if leaf is self.root:
+            self.root = None
+            return
+
+        parent = leaf.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+        grandparent = parent.parent
+
+        sibling.parent = grandparent
+        if grandparent is None:
+            self.root = sibling
+        else:
+            if grandparent.left is parent:
+                grandparent.left = sibling
+            else:
+                grandparent.right = sibling
+            self._refit(grandparent)
+
+        leaf.parent = None
+
+    def move(self, leaf: BVHNode, aabb: AABB):
+        """Re-insert a leaf with a new AABB"""
+        self.remove(leaf)
+        leaf.lo, leaf.hi = bounds_of(aabb)
+        self._insert_leaf(leaf)
+
+    def query(self, aabb: AABB) -> List:
+        """Entries whose stored AABB strictly overlaps ``aabb``"""
+        results = []
+        if self.root is None:
+            return results
+
+        (qlx, qly, qlz), (qhx, qhy, qhz) = bounds_of(aabb)
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            (lx, ly, lz), (hx, hy, hz) = node.lo, node.hi
+            if (
+                hx <= qlx
+                or lx >= qhx
+                or hy <= qly
+                or ly >= qhy
+                or hz <= qlz
+                or lz >= qhz
+            ):
+                continue
+
+            if node.left is None:
+                results.append(node.entry)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return results
+
+    def raycast(self, from_pos: Vector3, to_pos: Vector3) -> List:
+        """Entries whose stored AABB is crossed by the segment from_pos -> to_pos"""
+        results = []
+        if self.root is None:
+            return results
+
+        ox, oy, oz = from_pos.x, from_pos.y, from_pos.z
+        dx, dy, dz = to_pos.x - ox, to_pos.y - oy, to_pos.z - oz
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if not segment_hits_bounds(ox, oy, oz, dx, dy, dz, node.lo, node.hi):
+                continue
+
+            if node.left is None:
+                results.append(node.entry)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return results
+
+    def clear(self):
+        self.root = None
+
+    def _insert_leaf(self, leaf: BVHNode):
+        if self.root is None:
+            leaf.parent = None
+            self.root = leaf
+            return
+
+        # Descend towards the cheapest sibling: every node on the way grows to
+        # the union with the leaf, so that growth is inherited by the children
+        lo, hi = leaf.lo, leaf.hi
+        node = self.root
+        while node.left is not None:
+            area = _area(node.lo, node.hi)
+            combined_area = _area(*_union(node.lo, node.hi, lo, hi))
+
+            cost = 2.0 * combined_area
+            inheritance = 2.0 * (combined_area - area)
+
+            cost_left = _descend_cost(node.left, lo, hi) + inheritance
+            cost_right = _descend_cost(node.right, lo, hi) + inheritance
+
+            if cost < cost_left and cost < cost_right:
+                break
+
+            node = node.left if cost_left < cost_right else node.right
+
+        sibling = node
+        old_parent = sibling.parent
+        new_parent = BVHNode(*_union(sibling.lo, sibling.hi, lo, hi))
+        new_parent.parent = old_parent
+        new_parent.left = sibling
+        new_parent.right = leaf
+        sibling.parent = new_parent
+        leaf.parent = new_parent
+
+        if old_parent is None:
+            self.root = new_parent
+        else:
+            if old_parent.left is sibling:
+                old_parent.left = new_parent
+            else:
+                old_parent.right = new_parent
+            self._refit(old_parent)
+
+    @staticmethod
+    def _refit(node: Optional[BVHNode]):
+        while node is not None:
+            node.lo, node.hi = _union(
+                node.left.lo, node.left.hi, node.right.lo, node.right.hi
+            )
+            node = node.parent
+
+
+def bounds_of(aabb: AABB) -> Tuple[Bounds, Bounds]:
+    """(min, max) corners of an AABB as plain float tuples"""
+    lx, ly, lz = aabb.position.data.tolist()
+    sx, sy, sz = aabb.size.data.tolist()
+    return (lx, ly, lz), (lx + sx, ly + sy, lz + sz)
+
+
+def _union(
+    lo_a: Bounds, hi_a: Bounds, lo_b: Bounds, hi_b: Bounds
+) -> Tuple[Bounds, Bounds]:
+    return (
+        (min(lo_a[0], lo_b[0]), min(lo_a[1], lo_b[1]), min(lo_a[2], lo_b[2])),
+        (max(hi_a[0], hi_b[0]), max(hi_a[1], hi_b[1]), max(hi_a[2], hi_b[2])),
+    )
+
+
+def _area(lo: Bounds, hi: Bounds) -> float:
+    """Half the surface area; only ever compared, so the factor 2 is dropped"""
+    x = hi[0] - lo[0]
+    y = hi[1] - lo[1]
+    z = hi[2] - lo[2]
+    return x * y + y * z + z * x
+
+
+def _descend_cost(child: BVHNode, lo: Bounds, hi: Bounds) -> float:
+    combined_area = _area(*_union(child.lo, child.hi, lo, hi))
+    if child.left is None:
+        return combined_area
+    return combined_area - _area(child.lo, child.hi)
@@ -0,0 +1,181 @@
+import math
+from typing import Dict, Iterator, List, Tuple
+from engine.math.datatypes.aabb import AABB
+
+Cell = Tuple[int, int, int]
+
+DEFAULT_CELL_SIZE = 2.0
+# Entries spanning more cells than this (planes, level geometry) live in an
+# overflow list that is tested against everything instead
+MAX_CELLS_PER_ENTRY = 64
+
+
+class UniformGrid3D:
+    """
+    Uniform hash grid over AABBs.
+
+    Entries are bucketed into every cell their AABB touches. The cell size
+    targets twice the typical AABB extent and is re-applied on rebuild();
+    overflow entries are left out of that estimate.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, List] = {}
+        # id(entry) -> (entry, first cell, last cell); ranges are None for
+        # overflow entries
+        self._ranges: Dict[int, Tuple] = {}
+        self._large: List = []
+        self._extent_sum = 0.0
+
+    def insert(self, entry, aabb: AABB):
+        lo, hi = self._cell_range(aabb)
+
+        if _cell_count(lo, hi) > MAX_CELLS_PER_ENTRY:
+            self._large.append(entry)
+            self._ranges[id(entry)] = (entry, None, None)
+            return
+
+        self._extent_sum += _mean_extent(aabb)
+        self._ranges[id(entry)] = (entry, lo, hi)
+        cells = self._cells
+        for cell in _cells_in(lo, hi):
+            bucket = cells.get(cell)
+            if bucket is None:
+                cells[cell] = [entry]
+            else:
+                bucket.append(entry)
+
+    def remove(self, entry, aabb: AABB):
+        _, lo, hi = self._ranges.pop(id(entry))
+
+        if lo is None:
+            self._large.remove(entry)
+            return
+
+        self._extent_sum -= _mean_extent(aabb)
+        cells = self._cells
+        for cell in _cells_in(lo, hi):
+            bucket = cells[cell]
+            bucket.remove(entry)
+            if not bucket:
+                del cells[cell]
+
+    def move(self, entry, old_aabb: AABB, aabb: AABB):
+        """Re-bucket an entry, skipping the work when its cells are unchanged"""
+        _, old_lo, old_hi = self._ranges[id(entry)]
+        lo, hi = self._cell_range(aabb)
+        if old_lo is not None and lo == old_lo and hi == old_hi:
+            self._extent_sum += _mean_extent(aabb) - _mean_extent(old_aabb)
+            return
+
+        self.remove(entry, old_aabb)
+        self.insert(entry, aabb)
+
+    def needs_rebuild(self) -> bool:
+        """True once the mean entry size has drifted 2x away from the cells"""
+        count = len(self._ranges) - len(self._large)
+        if count <= 0:
+            return False
+        target = 2.0 * self._extent_sum / count
+        return target > 0.0 and not (0.5 < target / self.cell_size < 2.0)
+
+    def rebuild(self, entries_with_aabbs: List[Tuple]):
+        """Re-bucket everything with the cell size tuned to the current entries"""
+        if entries_with_aabbs:
+            # Median, so a few huge entries do not blow up the cells
+            extents = sorted(_mean_extent(aabb) for _, aabb in entries_with_aabbs)
+            typical = extents[len(extents) // 2]
+            if typical > 0.0:
+                self.cell_size = 2.0 * typical
+
+        self.clear()
+        for entry, aabb in entries_with_aabbs:
+            self.insert(entry, aabb)
+
+    def candidate_pairs(self) -> Iterator[Tuple]:
+        """
+        Entry pairs sharing at least one cell, each reported once.
+        Overflow entries are paired with every other entry.
+        """
+        seen = set()
+        for bucket in self._cells.values():
+            count = len(bucket)
+            for i in range(count - 1):
+                entry_a = bucket[i]
+                id_a = id(entry_a)
+                for j in range(i + 1, count):
+                    entry_b = bucket[j]
+                    id_b = id(entry_b)
+                    key = (id_a, id_b) if id_a < id_b else (id_b, id_a)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield entry_a, entry_b
+
+        large = self._large
+        for i, entry_a in enumerate(large):
+            for entry_b in large[i + 1 :]:
+                yield entry_a, entry_b
+            for entry_b, lo, _ in self._ranges.values():
+                if lo is not None:
+                    yield entry_a, entry_b
+
+    def query(self, lo: Tuple, hi: Tuple) -> List:
+        """Entries in any cell touched by the box lo..hi, plus overflow entries"""
+        cell_lo = self._cell_of(lo)
+        cell_hi = self._cell_of(hi)
+
+        found = {}
+        if _cell_count(cell_lo, cell_hi) > len(self._cells):
+            # Cheaper to walk the occupied cells than the query's range
+            for bucket in self._cells.values():
+                for entry in bucket:
+                    found[id(entry)] = entry
+        else:
+            cells = self._cells
+            for cell in _cells_in(cell_lo, cell_hi):
+                bucket = cells.get(cell)
+                if bucket is not None:
+                    for entry in bucket:
+                        found[id(entry)] = entry
+
+        for entry in self._large:
+            found[id(entry)] = entry
+
+        return list(found.values())
+
+    def clear(self):
+        self._cells.clear()
+        self._ranges.clear()
+        self._large.clear()
+        self._extent_sum = 0.0
+
+    def _cell_range(self, aabb: AABB) -> Tuple[Cell, Cell]:
+        lx, ly, lz = aabb.position.data.tolist()
+        sx, sy, sz = aabb.size.data.tolist()
+        return self._cell_of((lx, ly, lz)), self._cell_of((lx + sx, ly + sy, lz + sz))
+
+    def _cell_of(self, point: Tuple) -> Cell:
+        inv = 1.0 / self.cell_size
+        return (
+            math.floor(point[0] * inv),
+            math.floor(point[1] * inv),
+            math.floor(point[2] * inv),
+        )
+
+
+def _cells_in(lo: Cell, hi: Cell) -> Iterator[Cell]:
+    for x in range(lo[0], hi[0] + 1):
+        for y in range(lo[1], hi[1] + 1):
+            for z in range(lo[2], hi[2] + 1):
+                yield x, y, z
+
+
+def _cell_count(lo: Cell, hi: Cell) -> int:
+    return (hi[0] - lo[0] + 1) * (hi[1] - lo[1] + 1) * (hi[2] - lo[2] + 1)
+
+
+def _mean_extent(aabb: AABB) -> float:
+    sx, sy, sz = aabb.size.data.tolist()
+    return (sx + sy + sz) / 3.0
@@ -10,10 +10,18 @@ Provides methods for querying physics state without affecting simulation:
 In Godot 4.x, this is GodotPhysicsDirectSpaceState3D.
 """
 
+from operator import attrgetter
 from typing import TYPE_CHECKING, Dict, List, Optional
 from engine.math.datatypes.vector3 import Vector3
 from engine.math.datatypes.transform_3d import Transform3D
 from engine.core.rid import RID
+from engine.servers.physics.enums import PhysicsServer3DEnums
+from engine.servers.physics.bodies.shape_slot import ShapeSlot
+from engine.servers.physics.solver.result import release_result
+from engine.servers.physics.spaces.ray_kernels import ray_box, ray_sphere
+
+# Pulls both filter fields off a body in one C-level call
+_rid_and_layer = attrgetter("rid", "collision_layer")
 
 if TYPE_CHECKING:
     from engine.servers.physics.spaces.space_3d import Space3D
@@ -60,11 +68,14 @@ class DirectSpaceState3D:
     """
     Direct access to physics space for queries.
 
-    This is a read-only interface that doesn't affect simulation.
-    All methods are thread-safe as they don't modify state.
+    Queries don't affect the simulation, but they are not free of writes:
+    intersect_ray caches each shape's global transform and its inverse on
+    the ShapeSlot. Each cache entry is swapped in with one attribute store,
+    so queries may run concurrently with each other; they read body
+    transforms the step moves, so don't run them during Space3D.step().
     """
 
-    __slots__ = ("space",)
+    __slots__ = ("space", "_ray_dispatch")
 
     def __init__(self, space: "Space3D"):
         """
@@ -74,6 +85,13 @@ class DirectSpaceState3D:
             space: The Space3D to query
         """
         self.space = space
+        # Ray test per shape type, resolved once instead of per tested shape.
+        # Every entry takes (origin, dir, length, transform, data, inv_transform)
+        self._ray_dispatch = {
+            PhysicsServer3DEnums.SHAPE_SPHERE: self._ray_sphere,
+            PhysicsServer3DEnums.SHAPE_BOX: self._ray_box,
+            PhysicsServer3DEnums.SHAPE_CAPSULE: self._ray_capsule,
+        }
 
     def intersect_ray(
         self,
@@ -98,8 +116,7 @@ class DirectSpaceState3D:
         Returns:
             Dictionary with collision data or None
         """
-        if exclude is None:
-            exclude = []
+        exclude_set = set(exclude) if exclude else ()
 
         # Broadphase: Get candidate bodies
         candidates = self.space.broadphase.raycast(from_pos, to_pos, collision_mask)
@@ -108,7 +125,8 @@ class DirectSpaceState3D:
         candidates = [
             b
             for b in candidates
-            if b.rid not in exclude and (collision_mask & b.collision_layer)
+            if (fields := _rid_and_layer(b))[0] not in exclude_set
+            and collision_mask & fields[1]
         ]
 
         if not candidates:
@@ -121,17 +139,29 @@ class DirectSpaceState3D:
         closest_hit = None
         closest_distance = ray_length + 1.0
 
+        # Bodies often share shapes; resolve each shape RID once per query
+        get_shape_data = self.space._shape_storage._get_shape_data
+        shape_cache = {}
+
         for body in candidates:
+            body_key = _transform_key(body.transform)
+            disabled_shapes = body.disabled_shapes
+
             for shape_idx, shape_info in enumerate(body.shapes):
-                if shape_info.get("disabled", False):
+                if disabled_shapes >> shape_idx & 1:
                     continue
 
-                shape_rid = shape_info["shape"]
-                shape_data = self.space._shape_storage._get_shape_data(shape_rid)
+                shape_rid = shape_info.shape
+                if shape_rid in shape_cache:
+                    shape_data = shape_cache[shape_rid]
+                else:
+                    shape_data = shape_cache[shape_rid] = get_shape_data(shape_rid)
                 if not shape_data:
                     continue
 
-                global_transform = body.transform * shape_info["transform"]
+                global_transform, inv_transform = _shape_ray_transforms(
+                    body, body_key, shape_info
+                )
 
                 # Perform ray-shape intersection
                 hit = self._ray_shape_intersect(
@@ -141,6 +171,7 @@ class DirectSpaceState3D:
                     shape_data.type,
                     global_transform,
                     shape_data.data,
+                    inv_transform,
                 )
 
                 if hit and hit["distance"] < closest_distance:
@@ -163,29 +194,22 @@ class DirectSpaceState3D:
         shape_type: int,
         shape_transform: Transform3D,
         shape_data: dict,
+        inv_transform: Optional[Transform3D] = None,
     ) -> Optional[Dict]:
         """
         Ray-shape intersection test.
 
         This implements analytical ray intersection for each shape type.
+        ``inv_transform`` may carry a precomputed shape_transform.inverse().
         """
-        from engine.servers.physics.enums import PhysicsServer3DEnums
-
-        if shape_type == PhysicsServer3DEnums.SHAPE_SPHERE:
-            return self._ray_sphere(
-                ray_origin, ray_dir, ray_length, shape_transform, shape_data
-            )
-        elif shape_type == PhysicsServer3DEnums.SHAPE_BOX:
-            return self._ray_box(
-                ray_origin, ray_dir, ray_length, shape_transform, shape_data
-            )
-        elif shape_type == PhysicsServer3DEnums.SHAPE_CAPSULE:
-            return self._ray_capsule(
-                ray_origin, ray_dir, ray_length, shape_transform, shape_data
-            )
-
-        # Unsupported shape type
-        return None
+        ray_test = self._ray_dispatch.get(shape_type)
+        if ray_test is None:
+            # Unsupported shape type
+            return None
+
+        return ray_test(
+            ray_origin, ray_dir, ray_length, shape_transform, shape_data, inv_transform
+        )
 
     def _ray_sphere(
         self,
@@ -194,36 +218,35 @@ class DirectSpaceState3D:
         ray_length: float,
         transform: Transform3D,
         data: dict,
+        inv_transform: Optional[Transform3D] = None,
     ) -> Optional[Dict]:
         """Ray-sphere intersection"""
-        radius = data.get("radius", 0.5)
-        center = transform.origin
-
-        # Ray-sphere intersection math
-        oc = ray_origin - center
-        a = ray_dir.dot(ray_dir)
-        b = 2.0 * oc.dot(ray_dir)
-        c = oc.dot(oc) - radius * radius
-        discriminant = b * b - 4 * a * c
-
-        if discriminant < 0:
-            return None
-
-        # Compute intersection distance
-        sqrt_disc = discriminant**0.5
-        t1 = (-b - sqrt_disc) / (2 * a)
-        t2 = (-b + sqrt_disc) / (2 * a)
+        return self._ray_sphere_at(
+            ray_origin, ray_dir, ray_length, transform.origin, data.get("radius", 0.5)
+        )
 
-        # Use closest positive intersection
-        t = t1 if t1 >= 0 else t2
-        if t < 0 or t > ray_length:
+    def _ray_sphere_at(
+        self,
+        ray_origin: Vector3,
+        ray_dir: Vector3,
+        ray_length: float,
+        center: Vector3,
+        radius: float,
+    ) -> Optional[Dict]:
+        """Ray-sphere intersection against a bare center and radius"""
+        ox, oy, oz = ray_origin.data.tolist()
+        dx, dy, dz = ray_dir.data.tolist()
+        cx, cy, cz = center.data.tolist()
+        hit = ray_sphere(ox, oy, oz, dx, dy, dz, ray_length, cx, cy, cz, radius)
+        if hit is None:
             return None
 
-        # Compute hit point and normal
-        hit_pos = ray_origin + ray_dir * t
-        normal = (hit_pos - center).normalized()
-
-        return {"distance": t, "position": hit_pos, "normal": normal}
+        t, px, py, pz, nx, ny, nz = hit
+        return {
+            "distance": t,
+            "position": Vector3(px, py, pz),
+            "normal": Vector3(nx, ny, nz),
+        }
 
     def _ray_box(
         self,
@@ -232,52 +255,37 @@ class DirectSpaceState3D:
         ray_length: float,
         transform: Transform3D,
         data: dict,
+        inv_transform: Optional[Transform3D] = None,
     ) -> Optional[Dict]:
         """Ray-box intersection using slab method"""
         half_extents = data.get("half_extents", Vector3(0.5, 0.5, 0.5))
 
-        # Transform ray to box local space
-        inv_transform = transform.inverse()
-        local_origin = inv_transform.xform(ray_origin)
-        local_dir = inv_transform.basis.xform(ray_dir).normalized()
-
-        # Slab intersection
-        tmin = float("-inf")
-        tmax = float("inf")
-        hit_normal = Vector3()
-
-        for i in range(3):
-            if abs(local_dir[i]) < 1e-6:
-                # Ray parallel to slab
-                if abs(local_origin[i]) > half_extents[i]:
-                    return None
-            else:
-                # Compute intersection distances
-                ood = 1.0 / local_dir[i]
-                t1 = (-half_extents[i] - local_origin[i]) * ood
-                t2 = (half_extents[i] - local_origin[i]) * ood
-
-                if t1 > t2:
-                    t1, t2 = t2, t1
-
-                if t1 > tmin:
-                    tmin = t1
-                    # Normal is along axis i
-                    hit_normal = Vector3()
-                    hit_normal.data[i] = -1.0 if local_dir[i] > 0 else 1.0
-
-                tmax = min(tmax, t2)
-
-                if tmin > tmax:
-                    return None
-
-        if tmin < 0 or tmin > ray_length:
+        if inv_transform is None:
+            inv_transform = transform.inverse()
+
+        ox, oy, oz = ray_origin.data.tolist()
+        dx, dy, dz = ray_dir.data.tolist()
+        hit = ray_box(
+            ox,
+            oy,
+            oz,
+            dx,
+            dy,
+            dz,
+            ray_length,
+            inv_transform.basis._m.tolist(),
+            inv_transform.origin.data.tolist(),
+            half_extents.x,
+            half_extents.y,
+            half_extents.z,
+        )
+        if hit is None:
             return None
 
-        # Transform back to world space
-        local_hit = local_origin + local_dir * tmin
-        world_hit = transform.xform(local_hit)
-        world_normal = transform.basis.xform(hit_normal).normalized()
+        # Back to world space
+        tmin, px, py, pz, nx, ny, nz = hit
+        world_hit = transform.xform(Vector3(px, py, pz))
+        world_normal = transform.basis.xform(Vector3(nx, ny, nz)).normalized()
 
         return {"distance": tmin, "position": world_hit, "normal": world_normal}
 
@@ -288,6 +296,7 @@ class DirectSpaceState3D:
         ray_length: float,
         transform: Transform3D,
         data: dict,
+        inv_transform: Optional[Transform3D] = None,
     ) -> Optional[Dict]:
         """Ray-capsule intersection"""
         radius = data.get("radius", 0.5)
@@ -306,20 +315,8 @@ class DirectSpaceState3D:
         # (Simplified - should do proper ray-cylinder test)
 
         # Test against sphere caps
-        hit1 = self._ray_sphere(
-            ray_origin,
-            ray_dir,
-            ray_length,
-            Transform3D(transform.basis, p1),
-            {"radius": radius},
-        )
-        hit2 = self._ray_sphere(
-            ray_origin,
-            ray_dir,
-            ray_length,
-            Transform3D(transform.basis, p2),
-            {"radius": radius},
-        )
+        hit1 = self._ray_sphere_at(ray_origin, ray_dir, ray_length, p1, radius)
+        hit2 = self._ray_sphere_at(ray_origin, ray_dir, ray_length, p2, radius)
 
         # Return closest hit
         if hit1 and hit2:
@@ -349,9 +346,6 @@ class DirectSpaceState3D:
         Returns:
             List of collision dictionaries
         """
-        if exclude is None:
-            exclude = []
-
         shape_data = self.space._shape_storage._get_shape_data(shape_rid)
         if not shape_data:
             return []
@@ -364,41 +358,54 @@ class DirectSpaceState3D:
         query_aabb = _compute_shape_aabb(shape_data.type, transform, shape_data.data)
 
         # Broadphase
-        candidates = self.space.broadphase.query_aabb(query_aabb, collision_mask)
-        candidates = [b for b in candidates if b.rid not in exclude]
+        candidates = self.space.broadphase.query_aabb(
+            query_aabb,
+            collision_mask,
+            {rid.get_id() for rid in exclude} if exclude else (),
+        )
 
         # Narrowphase
         from engine.servers.physics.collision_solver_3d import CollisionSolver3D
 
+        # Bodies often share shapes; resolve each shape RID once per query
+        get_shape_data = self.space._shape_storage._get_shape_data
+        shape_cache = {}
+
+        # The query shape's type is fixed, so resolve its solvers up front
+        solvers = CollisionSolver3D.get_solver_for(shape_data.type)
+
         results = []
         for body in candidates:
             if len(results) >= max_results:
                 break
 
+            disabled_shapes = body.disabled_shapes
             for shape_idx, body_shape_info in enumerate(body.shapes):
-                if body_shape_info.get("disabled", False):
+                if disabled_shapes >> shape_idx & 1:
                     continue
 
-                body_shape_rid = body_shape_info["shape"]
-                body_shape_data = self.space._shape_storage._get_shape_data(
-                    body_shape_rid
-                )
+                body_shape_rid = body_shape_info.shape
+                if body_shape_rid in shape_cache:
+                    body_shape_data = shape_cache[body_shape_rid]
+                else:
+                    body_shape_data = shape_cache[body_shape_rid] = get_shape_data(
+                        body_shape_rid
+                    )
                 if not body_shape_data:
                     continue
 
-                body_shape_transform = body.transform * body_shape_info["transform"]
+                body_shape_transform = body.transform * body_shape_info.transform
 
                 # Test collision
-                col_result = CollisionSolver3D.solve_static(
-                    shape_data.type,
+                col_result = solvers[body_shape_data.type](
                     transform,
                     shape_data.data,
-                    body_shape_data.type,
                     body_shape_transform,
                     body_shape_data.data,
                 )
 
                 if col_result and col_result.collided:
+                    release_result(col_result)
                     results.append(
                         {"rid": body.rid, "collider": body, "shape": shape_idx}
                     )
@@ -484,3 +491,31 @@ class DirectSpaceState3D:
             return results[0]
 
         return None
+
+
+def _transform_key(transform: Transform3D) -> bytes:
+    """Value snapshot of a transform, to tell whether cached data is stale"""
+    return transform.basis._m.tobytes() + transform.origin.data.tobytes()
+
+
+def _shape_ray_transforms(body, body_key: bytes, shape_info: ShapeSlot):
+    """
+    Global transform of a body shape and its inverse.
+
+    Both are cached on the ShapeSlot and reused until the body transform
+    changes value or the shape's local transform is replaced.
+    """
+    local_transform = shape_info.transform
+    cached = shape_info.ray_transforms
+    if cached is not None and cached[0] == body_key and cached[1] is local_transform:
+        return cached[2], cached[3]
+
+    global_transform = body.transform * local_transform
+    inv_transform = global_transform.inverse()
+    shape_info.ray_transforms = (
+        body_key,
+        local_transform,
+        global_transform,
+        inv_transform,
+    )
+    return global_transform, inv_transform
@@ -0,0 +1,163 @@
+"""
+Scalar ray-shape kernels.
+
+Pure functions of plain floats, so the per-shape ray tests allocate nothing
+until a hit is found. Callers wrap the returned tuple into Vector3s.
+"""
+
+import math
+from typing import Optional, Sequence, Tuple
+
+# (t, px, py, pz, nx, ny, nz): distance along the ray, hit point and normal
+RayHit = Tuple[float, float, float, float, float, float, float]
+
+PARALLEL_EPSILON = 1e-6
+
+
+def ray_sphere(
+    ox: float,
+    oy: float,
+    oz: float,
+    dx: float,
+    dy: float,
+    dz: float,
+    length: float,
+    cx: float,
+    cy: float,
+    cz: float,
+    radius: float,
+) -> Optional[RayHit]:
+    """Closest hit within ``length`` of the ray o + t*d on a sphere, if any"""
+    ocx, ocy, ocz = ox - cx, oy - cy, oz - cz
+
+    a = dx * dx + dy * dy + dz * dz
+    b = 2.0 * (ocx * dx + ocy * dy + ocz * dz)
+    c = ocx * ocx + ocy * ocy + ocz * ocz - radius * radius
+    discriminant = b * b - 4 * a * c
+
+    if discriminant < 0:
+        return None
+
+    sqrt_disc = math.sqrt(discriminant)
+    t1 = (-b - sqrt_disc) / (2 * a)
+    t2 = (-b + sqrt_disc) / (2 * a)
+
+    # Use closest positive intersection
+    t = t1 if t1 >= 0 else t2
+    if t < 0 or t > length:
+        return None
+
+    px, py, pz = ox + dx * t, oy + dy * t, oz + dz * t
+    nx, ny, nz = px - cx, py - cy, pz - cz
+    n_len = math.sqrt(nx * nx + ny * ny + nz * nz)
+    if n_len > 0.0:
+        inv = 1.0 / n_len
+        nx, ny, nz = nx * inv, ny * inv, nz * inv
+
+    return t, px, py, pz, nx, ny, nz
+
+
+def ray_box(
+    ox: float,
+    oy: float,
+    oz: float,
+    dx: float,
+    dy: float,
+    dz: float,
+    length: float,
+    inv_basis: Sequence[Sequence[float]],
+    inv_origin: Sequence[float],
+    hx: float,
+    hy: float,
+    hz: float,
+) -> Optional[RayHit]:
+    """
+    Slab test of a world-space ray against a box of half extents h.
+
+    ``inv_basis`` (3x3, rows) and ``inv_origin`` are the box's inverse
+    transform. The returned point and normal are in the box's local space.
+    """
+    (r0x, r0y, r0z), (r1x, r1y, r1z), (r2x, r2y, r2z) = inv_basis
+    iox, ioy, ioz = inv_origin
+
+    # Ray into box local space
+    lox = r0x * ox + r0y * oy + r0z * oz + iox
+    loy = r1x * ox + r1y * oy + r1z * oz + ioy
+    loz = r2x * ox + r2y * oy + r2z * oz + ioz
+    ldx = r0x * dx + r0y * dy + r0z * dz
+    ldy = r1x * dx + r1y * dy + r1z * dz
+    ldz = r2x * dx + r2y * dy + r2z * dz
+    d_len = math.sqrt(ldx * ldx + ldy * ldy + ldz * ldz)
+    if d_len > 0.0:
+        inv = 1.0 / d_len
+        ldx, ldy, ldz = ldx * inv, ldy * inv, ldz * inv
+
+    # One block per axis; the normal is only filled in for the entering slab
+    tmin = float("-inf")
+    tmax = float("inf")
+    nx = ny = nz = 0.0
+
+    if abs(ldx) < PARALLEL_EPSILON:
+        # Ray parallel to slab
+        if abs(lox) > hx:
+            return None
+    else:
+        ood = 1.0 / ldx
+        t1 = (-hx - lox) * ood
+        t2 = (hx - lox) * ood
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > tmin:
+            tmin = t1
+            nx, ny, nz = (-1.0 if ldx > 0 else 1.0), 0.0, 0.0
+        if t2 < tmax:
+            tmax = t2
+        if tmin > tmax:
+            return None
+
+    if abs(ldy) < PARALLEL_EPSILON:
+        if abs(loy) > hy:
+            return None
+    else:
+        ood = 1.0 / ldy
+        t1 = (-hy - loy) * ood
+        t2 = (hy - loy) * ood
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > tmin:
+            tmin = t1
+            nx, ny, nz = 0.0, (-1.0 if ldy > 0 else 1.0), 0.0
+        if t2 < tmax:
+            tmax = t2
+        if tmin > tmax:
+            return None
+
+    if abs(ldz) < PARALLEL_EPSILON:
+        if abs(loz) > hz:
+            return None
+    else:
+        ood = 1.0 / ldz
+        t1 = (-hz - loz) * ood
+        t2 = (hz - loz) * ood
+        if t1 > t2:
+            t1, t2 = t2, t1
+        if t1 > tmin:
+            tmin = t1
+            nx, ny, nz = 0.0, 0.0, (-1.0 if ldz > 0 else 1.0)
+        if t2 < tmax:
+            tmax = t2
+        if tmin > tmax:
+            return None
+
+    if tmin < 0 or tmin > length:
+        return None
+
+    return (
+        tmin,
+        lox + ldx * tmin,
+        loy + ldy * tmin,
+        loz + ldz * tmin,
+        nx,
+        ny,
+        nz,
+    )
@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
+import numpy as np
 from engine.core.rid import RID
 from engine.math.datatypes.vector3 import Vector3
 from engine.math.datatypes.transform_3d import Transform3D
@@ -6,10 +7,22 @@ from engine.math.datatypes.aabb import AABB
 from engine.servers.physics.bodies.body_3d import Body3D, Contact3D
 from engine.servers.physics.bodies.area_3d import Area3D
 from engine.servers.physics.collision_solver_3d import CollisionSolver3D
+from engine.servers.physics.enums import PhysicsServer3DEnums
+from engine.servers.physics.solver.primitives import sphere_vs_sphere_batch
+from engine.servers.physics.solver.result import CollisionRecord, release_result
 from engine.servers.physics.spaces.broadphase.broadphase_3d import (
     Broadphase3D,
     compute_body_aabb,
 )
+from engine.servers.physics.spaces.sweep_kernels import sweep_sphere_sphere
+from engine.servers.physics.storage.body_state import (
+    integrate_forces,
+    slots_by_state,
+)
+
+# Below this many sphere-sphere pairs, filling the batch arrays costs more
+# than solving the pairs one by one
+SPHERE_BATCH_MIN = 4
 
 
 class Space3D:
@@ -34,20 +47,49 @@ class Space3D:
         "_direct_state",
     )
 
-    def __init__(self, rid: RID, shape_storage):
+    def __init__(self, rid: RID, shape_storage, expected_bodies: int = 16):
         """
         Initialize physics space.
 
         Args:
             rid: Space RID
             shape_storage: Reference to shape storage for shape data access
+            expected_bodies: Bodies the broadphase is sized for up front
         """
         self.rid = rid
-        self.bodies: Dict[RID, Body3D] = {}
+        # Keyed by the RID's integer id
+        self.bodies: Dict[int, Body3D] = {}
         self.areas: Dict[RID, Area3D] = {}
-        self.broadphase = Broadphase3D()
+        self.broadphase = Broadphase3D(capacity=expected_bodies)
         self._shape_storage = shape_storage
+        self._init_parameters()
+
+    def reset(self, rid: Optional[RID]):
+        """
+        Empty the space and give it a new RID, as if freshly constructed.
+        The broadphase keeps its grown buffers.
+        """
+        for body in self.bodies.values():
+            body.space = None
+        for area in self.areas.values():
+            area.space = None
+
+        if self._direct_state is not None:
+            # Callers may still hold the freed space's direct state; leave it
+            # querying an empty space instead of the one this becomes
+            self._direct_state.space = Space3D(self.rid, self._shape_storage)
+
+        self.rid = rid
+        self.bodies.clear()
+        self.areas.clear()
+        self.broadphase.clear()
+        self._init_parameters()
+
+    def reserve(self, body_count: int):
+        """Pre-size the broadphase for ``body_count`` bodies"""
+        self.broadphase.reserve(body_count)
 
+    def _init_parameters(self):
         # Physics parameters
         self.default_gravity = Vector3(0, -9.8, 0)
         self.default_linear_damp = 0.1
@@ -67,22 +109,22 @@ class Space3D:
 
     def add_body(self, body: Body3D):
         """Add a body to this space"""
-        if body.rid in self.bodies:
+        body_id = body.rid.get_id()
+        if body_id in self.bodies:
             return
 
-        self.bodies[body.rid] = body
+        self.bodies[body_id] = body
         body.space = self
         aabb = compute_body_aabb(body, self._shape_storage)
         self.broadphase.add_body(body, aabb)
 
     def remove_body(self, body_rid: RID):
         """Remove a body from this space"""
-        if body_rid not in self.bodies:
+        body = self.bodies.pop(body_rid.get_id(), None)
+        if body is None:
             return
 
-        body = self.bodies[body_rid]
         self.broadphase.remove_body(body)
-        del self.bodies[body_rid]
 
     def add_area(self, area: Area3D):
         """Add an area to this space"""
@@ -103,7 +145,7 @@ class Space3D:
         from_transform: Transform3D,
         motion: Vector3,
         margin: float,
-        exclude_rids: List[RID],
+        exclude_rids: Iterable[RID],
         recovery_as_collision: bool = False,
     ) -> Dict:
         """
@@ -149,94 +191,77 @@ class Space3D:
             )
             if initial_collision:
                 result["collided"] = True
-                result["collision_point"] = initial_collision["point"]
-                result["collision_normal"] = initial_collision["normal"]
-                result["collision_depth"] = initial_collision["depth"]
-                result["collider"] = initial_collision["collider"]
-                result["collider_rid"] = initial_collision["collider_rid"]
-                result["collider_shape"] = initial_collision["collider_shape"]
-                result["collision_local_shape"] = initial_collision["local_shape"]
+                result["collision_point"] = initial_collision.point
+                result["collision_normal"] = initial_collision.normal
+                result["collision_depth"] = initial_collision.depth
+                result["collider"] = initial_collision.collider
+                result["collider_rid"] = initial_collision.collider_rid
+                result["collider_shape"] = initial_collision.collider_shape
+                result["collision_local_shape"] = initial_collision.local_shape
                 result["travel"] = Vector3()
                 result["remainder"] = motion
                 return result
 
         motion_aabb = self._compute_motion_aabb(body, from_transform, motion)
-        candidates = self.broadphase.query_aabb(motion_aabb, body.collision_mask)
-
-        candidates = [
-            b
-            for b in candidates
-            if b.rid != body.rid
-            and b.rid not in exclude_rids
-            and (body.collision_mask & b.collision_layer)
-        ]
+        # The mask, the body itself and exclude_rids are all filtered inside
+        # the broadphase query
+        candidates = self.broadphase.query_aabb(
+            motion_aabb, body.collision_mask, _exclusion_ids(exclude_rids, body.rid)
+        )
 
         if not candidates:
             result["travel"] = motion
             result["remainder"] = Vector3()
             return result
 
+        # One scratch record for every sweep, copied into best on improvement
         best_collision = None
-        min_safe_fraction = 1.0
-
-        for shape_idx, my_shape_info in enumerate(body.shapes):
-            if my_shape_info.get("disabled", False):
-                continue
-
-            my_shape_rid = my_shape_info["shape"]
-            my_shape_data = self._shape_storage._get_shape_data(my_shape_rid)
-            if not my_shape_data:
-                continue
+        best = CollisionRecord()
+        hit = CollisionRecord()
 
-            my_local_transform = my_shape_info["transform"]
-
-            for candidate in candidates:
-                for other_shape_idx, other_shape_info in enumerate(candidate.shapes):
-                    if other_shape_info.get("disabled", False):
-                        continue
-
-                    other_shape_rid = other_shape_info["shape"]
-                    other_shape_data = self._shape_storage._get_shape_data(
-                        other_shape_rid
-                    )
-                    if not other_shape_data:
-                        continue
+        # Candidate shapes only depend on the candidate: place them in world
+        # space once instead of once per shape of the moving body
+        candidate_shapes = [
+            (candidate, self._world_shapes(candidate)) for candidate in candidates
+        ]
 
-                    other_local_transform = other_shape_info["transform"]
+        for shape_idx, my_type, my_data, my_local_transform in self._shape_view(body):
+            my_global_transform = from_transform * my_local_transform
 
-                    collision = self._sweep_test(
-                        my_shape_data.type,
-                        from_transform * my_local_transform,
-                        my_shape_data.data,
+            for candidate, other_shapes in candidate_shapes:
+                for other_idx, other_type, other_global, other_data in other_shapes:
+                    collided = self._sweep_test(
+                        my_type,
+                        my_global_transform,
+                        my_data,
                         motion,
-                        other_shape_data.type,
-                        candidate.transform * other_local_transform,
-                        other_shape_data.data,
+                        other_type,
+                        other_global,
+                        other_data,
                         margin,
+                        hit,
                     )
 
-                    if collision and collision["fraction"] < min_safe_fraction:
-                        min_safe_fraction = collision["fraction"]
-                        best_collision = {
-                            **collision,
-                            "collider": candidate,
-                            "collider_rid": candidate.rid,
-                            "collider_shape": other_shape_idx,
-                            "local_shape": shape_idx,
-                        }
+                    if collided and hit.fraction < best.fraction:
+                        best.copy_from(hit)
+                        best.collider = candidate
+                        best.collider_rid = candidate.rid
+                        best.collider_shape = other_idx
+                        best.local_shape = shape_idx
+                        best_collision = best
 
         if best_collision:
             result["collided"] = True
-            result["collision_point"] = best_collision["point"]
-            result["collision_normal"] = best_collision["normal"]
-            result["collision_depth"] = best_collision.get("depth", 0.0)
-            result["collider"] = best_collision["collider"]
-            result["collider_rid"] = best_collision["collider_rid"]
-            result["collider_shape"] = best_collision["collider_shape"]
-            result["collision_local_shape"] = best_collision["local_shape"]
-            result["collision_safe_fraction"] = best_collision["fraction"]
-            result["collision_unsafe_fraction"] = best_collision["fraction"]
-            safe_travel = motion * best_collision["fraction"]
+            result["collision_point"] = best_collision.point
+            result["collision_normal"] = best_collision.normal
+            result["collision_depth"] = best_collision.depth
+            result["collider"] = best_collision.collider
+            result["collider_rid"] = best_collision.collider_rid
+            result["collider_shape"] = best_collision.collider_shape
+            result["collision_local_shape"] = best_collision.local_shape
+            result["collision_safe_fraction"] = best_collision.fraction
+            result["collision_unsafe_fraction"] = best_collision.fraction
+            safe_travel = motion * best_collision.fraction
             result["travel"] = safe_travel
             result["remainder"] = motion - safe_travel
         else:
@@ -250,8 +275,8 @@ class Space3D:
         body: Body3D,
         transform: Transform3D,
         margin: float,
-        exclude_rids: List[RID],
-    ) -> Optional[Dict]:
+        exclude_rids: Iterable[RID],
+    ) -> Optional[CollisionRecord]:
         """
         Check for static collision at a given transform.
         Used when recovery_as_collision is enabled.
@@ -263,72 +288,52 @@ class Space3D:
             exclude_rids: Bodies to exclude
 
         Returns:
-            Collision dict if overlapping, None otherwise
+            CollisionRecord if overlapping, None otherwise
         """
         aabb = self._compute_motion_aabb(body, transform, Vector3())
-        candidates = self.broadphase.query_aabb(aabb, body.collision_mask)
-
-        candidates = [
-            b
-            for b in candidates
-            if b.rid != body.rid
-            and b.rid not in exclude_rids
-            and (body.collision_mask & b.collision_layer)
-        ]
+        candidates = self.broadphase.query_aabb(
+            aabb, body.collision_mask, _exclusion_ids(exclude_rids, body.rid)
+        )
 
         if not candidates:
             return None
 
-        for shape_idx, my_shape_info in enumerate(body.shapes):
-            if my_shape_info.get("disabled", False):
-                continue
-
-            my_shape_rid = my_shape_info["shape"]
-            my_shape_data = self._shape_storage._get_shape_data(my_shape_rid)
-            if not my_shape_data:
-                continue
+        candidate_shapes = [
+            (candidate, self._world_shapes(candidate)) for candidate in candidates
+        ]
+        solve_static = CollisionSolver3D.solve_static
 
-            my_local_transform = my_shape_info["transform"]
+        for shape_idx, my_type, my_data, my_local_transform in self._shape_view(body):
             my_global_transform = transform * my_local_transform
 
-            for candidate in candidates:
-                for other_shape_idx, other_shape_info in enumerate(candidate.shapes):
-                    if other_shape_info.get("disabled", False):
-                        continue
-
-                    other_shape_rid = other_shape_info["shape"]
-                    other_shape_data = self._shape_storage._get_shape_data(
-                        other_shape_rid
-                    )
-                    if not other_shape_data:
-                        continue
-
-                    other_local_transform = other_shape_info["transform"]
-                    other_global_transform = candidate.transform * other_local_transform
-
-                    from engine.servers.physics.collision_solver_3d import (
-                        CollisionSolver3D,
-                    )
-
-                    col_result = CollisionSolver3D.solve_static(
-                        my_shape_data.type,
+            for candidate, other_shapes in candidate_shapes:
+                for (
+                    other_shape_idx,
+                    other_type,
+                    other_global_transform,
+                    other_data,
+                ) in other_shapes:
+                    col_result = solve_static(
+                        my_type,
                         my_global_transform,
-                        my_shape_data.data,
-                        other_shape_data.type,
+                        my_data,
+                        other_type,
                         other_global_transform,
-                        other_shape_data.data,
+                        other_data,
                     )
 
                     if col_result and col_result.collided:
-                        return {
-                            "point": col_result.point,
-                            "normal": col_result.normal,
-                            "depth": col_result.depth,
-                            "collider": candidate,
-                            "collider_rid": candidate.rid,
-                            "collider_shape": other_shape_idx,
-                            "local_shape": shape_idx,
-                        }
+                        collision = CollisionRecord()
+                        collision.fraction = 0.0
+                        collision.point = col_result.point
+                        collision.normal = col_result.normal
+                        collision.depth = col_result.depth
+                        collision.collider = candidate
+                        collision.collider_rid = candidate.rid
+                        collision.collider_shape = other_shape_idx
+                        collision.local_shape = shape_idx
+                        release_result(col_result)
+                        return collision
 
         return None
 
@@ -342,10 +347,14 @@ class Space3D:
         transform_b: Transform3D,
         data_b: dict,
         margin: float,
-    ) -> Optional[Dict]:
+        out: CollisionRecord,
+    ) -> bool:
         """
         Swept collision detection between two shapes.
 
+        On a hit, writes fraction, point, normal and depth into ``out`` and
+        returns True; the collider fields are left to the caller.
+
         This performs continuous collision detection (CCD) by
         testing discrete samples along the motion path.
 
@@ -359,18 +368,31 @@ class Space3D:
         steps = max(1, int(motion.length() / 0.1) + 1)
         steps = min(steps, 10)  # Cap for performance
 
+        if (
+            shape_a_type == PhysicsServer3DEnums.SHAPE_SPHERE
+            and shape_b_type == PhysicsServer3DEnums.SHAPE_SPHERE
+        ):
+            return _sweep_sphere_sphere(
+                transform_a, data_a, motion, transform_b, data_b, steps, out
+            )
+
+        # Resolved once for every sample of the sweep
+        solve = CollisionSolver3D.get_pair_solver(shape_a_type, shape_b_type)
+
+        # One sample transform for the whole sweep, moved in place. It is not
+        # shared across calls: a result may alias its origin, and the hit
+        # below is the last sample taken
+        test_transform = Transform3D(transform_a.basis, Vector3())
+        start = transform_a.origin.data
+        motion_data = motion.data
+        sample_origin = test_transform.origin.data
+
         for i in range(steps + 1):
             fraction = i / steps
-            test_transform = transform_a.translated(motion * fraction)
-
-            col_result = CollisionSolver3D.solve_static(
-                shape_a_type,
-                test_transform,
-                data_a,
-                shape_b_type,
-                transform_b,
-                data_b,
-            )
+            np.multiply(motion_data, fraction, out=sample_origin)
+            sample_origin += start
+
+            col_result = solve(test_transform, data_a, transform_b, data_b)
 
             if col_result and col_result.collided:
                 # Found collision at this fraction
@@ -380,43 +402,32 @@ class Space3D:
                 else:
                     safe_fraction = 0.0
 
-                return {
-                    "fraction": safe_fraction,
-                    "point": col_result.point,
-                    "normal": col_result.normal,
-                    "depth": col_result.depth,
-                }
+                out.fraction = safe_fraction
+                out.point = col_result.point
+                out.normal = col_result.normal
+                out.depth = col_result.depth
+                release_result(col_result)
+                return True
 
         # No collision
-        return None
+        return False
 
     def _compute_motion_aabb(
         self, body: Body3D, from_transform: Transform3D, motion: Vector3
     ) -> AABB:
         """Compute AABB encompassing entire motion path"""
-        # Compute AABB at start
-        temp_body = type(body)(body.rid, self, body.mode)
-        temp_body.shapes = body.shapes
-        temp_body.transform = from_transform
-        start_aabb = compute_body_aabb(temp_body, self._shape_storage)
-
-        # Compute AABB at end
-        temp_body.transform = from_transform.translated(motion)
-        end_aabb = compute_body_aabb(temp_body, self._shape_storage)
-
-        # Merge
-        min_pos = Vector3(
-            min(start_aabb.position.x, end_aabb.position.x),
-            min(start_aabb.position.y, end_aabb.position.y),
-            min(start_aabb.position.z, end_aabb.position.z),
-        )
-        max_pos = Vector3(
-            max(start_aabb.end.x, end_aabb.end.x),
-            max(start_aabb.end.y, end_aabb.end.y),
-            max(start_aabb.end.z, end_aabb.end.z),
-        )
+        start_aabb = compute_body_aabb(body, self._shape_storage, from_transform)
+
+        # A pure translation moves the AABB by exactly the motion, so the end
+        # box is the start box shifted; the union widens it on one side
+        lx, ly, lz = start_aabb.position.data.tolist()
+        sx, sy, sz = start_aabb.size.data.tolist()
+        mx, my, mz = motion.data.tolist()
 
-        return AABB(min_pos, max_pos - min_pos)
+        return AABB(
+            Vector3(lx + min(mx, 0.0), ly + min(my, 0.0), lz + min(mz, 0.0)),
+            Vector3(sx + abs(mx), sy + abs(my), sz + abs(mz)),
+        )
 
     def step(self, delta: float):
         """
@@ -427,9 +438,9 @@ class Space3D:
 
         self._update_area_influences()
 
-        for body in self.bodies.values():
-            if body.is_rigid():
-                body.integrate_forces(delta)
+        integrate_forces(
+            [body for body in self.bodies.values() if body.is_rigid()], delta
+        )
 
         self._detect_collisions()
 
@@ -445,14 +456,12 @@ class Space3D:
 
     def _update_area_influences(self):
         """Compute area influences on all bodies"""
-        # Reset influences
-        for body in self.bodies.values():
-            if not body.is_active():
-                continue
-
-            body.total_gravity = self.default_gravity
-            body.total_linear_damp = self.default_linear_damp
-            body.total_angular_damp = self.default_angular_damp
+        # Reset influences, one column write per state array
+        active = [body for body in self.bodies.values() if body.is_active()]
+        for state, slots in slots_by_state(active):
+            state.total_gravity[slots] = self.default_gravity.data
+            state.total_linear_damp[slots] = self.default_linear_damp
+            state.total_angular_damp[slots] = self.default_angular_damp
 
         # TODO: Implement proper area overlap testing and priority sorting
         for area in self.areas.values():
@@ -469,70 +478,156 @@ class Space3D:
                 body.total_angular_damp = area.angular_damp
 
     def _detect_collisions(self):
-        """Detect all collisions using broadphase + narrowphase"""
+        """
+        Detect all collisions using broadphase + narrowphase.
+
+        Body pairs are flattened into shape pairs first. Sphere-sphere pairs
+        are then solved in one vectorized batch once there are enough of
+        them, the rest one by one, and contacts are added in the original
+        pair order.
+        """
         for body in self.bodies.values():
             body.reset_contact_count()
 
         pairs = self.broadphase.get_collision_pairs()
-        for body_a, body_b in pairs:
-            self._test_body_pair(body_a, body_b)
+        if not pairs:
+            return
 
-    def _test_body_pair(self, body_a: Body3D, body_b: Body3D):
-        """Test collision between two bodies (narrowphase)"""
-        from engine.servers.physics.collision_solver_3d import CollisionSolver3D
+        # Each body's enabled shapes as (index, type, world transform, data),
+        # built once per step however many pairs the body is in
+        body_shapes = {}
+        shape_pairs = []
+        for body_a, body_b in pairs:
+            shapes_a = body_shapes.get(id(body_a))
+            if shapes_a is None:
+                shapes_a = body_shapes[id(body_a)] = self._world_shapes(body_a)
+            shapes_b = body_shapes.get(id(body_b))
+            if shapes_b is None:
+                shapes_b = body_shapes[id(body_b)] = self._world_shapes(body_b)
+
+            for shape_a in shapes_a:
+                for shape_b in shapes_b:
+                    shape_pairs.append((body_a, shape_a, body_b, shape_b))
+
+        # (normal, depth, point_a, point_b) per colliding shape pair
+        contacts = [None] * len(shape_pairs)
+
+        sphere = PhysicsServer3DEnums.SHAPE_SPHERE
+        sphere_rows = [
+            k
+            for k, (_, shape_a, _, shape_b) in enumerate(shape_pairs)
+            if shape_a[1] == sphere and shape_b[1] == sphere
+        ]
+        if len(sphere_rows) >= SPHERE_BATCH_MIN:
+            self._solve_sphere_pairs(shape_pairs, sphere_rows, contacts)
+            batched = set(sphere_rows)
+        else:
+            batched = ()
 
-        for i, shape_a_info in enumerate(body_a.shapes):
-            if shape_a_info.get("disabled", False):
+        solve_static = CollisionSolver3D.solve_static
+        for k, (_, shape_a, _, shape_b) in enumerate(shape_pairs):
+            if k in batched:
                 continue
 
-            shape_a_rid = shape_a_info["shape"]
-            shape_a_data = self._shape_storage._get_shape_data(shape_a_rid)
-            if not shape_a_data:
+            col_result = solve_static(
+                shape_a[1], shape_a[2], shape_a[3], shape_b[1], shape_b[2], shape_b[3]
+            )
+            if col_result and col_result.collided:
+                contacts[k] = (
+                    col_result.normal,
+                    col_result.depth,
+                    col_result.point_a,
+                    col_result.point_b,
+                )
+                release_result(col_result)
+
+        for (body_a, shape_a, body_b, shape_b), contact in zip(shape_pairs, contacts):
+            if contact is None:
                 continue
 
-            transform_a = body_a.transform * shape_a_info["transform"]
+            normal, depth, point_a, point_b = contact
 
-            for j, shape_b_info in enumerate(body_b.shapes):
-                if shape_b_info.get("disabled", False):
-                    continue
+            contact_a = Contact3D()
+            contact_a.local_pos = point_a
+            contact_a.local_normal = normal
+            contact_a.depth = depth
+            contact_a.collider = body_b
+            contact_a.collider_shape = shape_b[0]
+            contact_a.local_shape = shape_a[0]
 
-                shape_b_rid = shape_b_info["shape"]
-                shape_b_data = self._shape_storage._get_shape_data(shape_b_rid)
-                if not shape_b_data:
-                    continue
+            contact_b = Contact3D()
+            contact_b.local_pos = point_b
+            contact_b.local_normal = -normal
+            contact_b.depth = depth
+            contact_b.collider = body_a
+            contact_b.collider_shape = shape_a[0]
+            contact_b.local_shape = shape_b[0]
 
-                transform_b = body_b.transform * shape_b_info["transform"]
+            body_a.add_contact(contact_a)
+            body_b.add_contact(contact_b)
 
-                # Solve collision
-                col_result = CollisionSolver3D.solve_static(
-                    shape_a_data.type,
-                    transform_a,
-                    shape_a_data.data,
-                    shape_b_data.type,
-                    transform_b,
-                    shape_b_data.data,
-                )
+    def _shape_view(self, body: Body3D) -> List[tuple]:
+        """
+        Enabled shapes of a body as (index, type, data, local transform).
+
+        Cached on the body under the same shape count, disabled shapes and
+        shape data version as its AABB, so the shape dicts and storage are
+        only read again after a shape is added or changed.
+        """
+        disabled_shapes = body.disabled_shapes
+        key = (len(body.shapes), disabled_shapes, self._shape_storage._shape_version)
+        cached = body._shape_view
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        get_shape_data = self._shape_storage._get_shape_data
+        view = []
+        for i, shape_info in enumerate(body.shapes):
+            if disabled_shapes >> i & 1:
+                continue
 
-                if col_result and col_result.collided:
-                    # Create contacts
-                    contact_a = Contact3D()
-                    contact_a.local_pos = col_result.point_a
-                    contact_a.local_normal = col_result.normal
-                    contact_a.depth = col_result.depth
-                    contact_a.collider = body_b
-                    contact_a.collider_shape = j
-                    contact_a.local_shape = i
-
-                    contact_b = Contact3D()
-                    contact_b.local_pos = col_result.point_b
-                    contact_b.local_normal = -col_result.normal
-                    contact_b.depth = col_result.depth
-                    contact_b.collider = body_a
-                    contact_b.collider_shape = i
-                    contact_b.local_shape = j
-
-                    body_a.add_contact(contact_a)
-                    body_b.add_contact(contact_b)
+            shape_data = get_shape_data(shape_info.shape)
+            if not shape_data:
+                continue
+
+            view.append((i, shape_data.type, shape_data.data, shape_info.transform))
+
+        body._shape_view = (key, view)
+        return view
+
+    def _world_shapes(self, body: Body3D) -> List[tuple]:
+        """Enabled shapes of a body as (index, type, world transform, data)"""
+        body_transform = body.transform
+        return [
+            (i, shape_type, body_transform * local_transform, data)
+            for i, shape_type, data, local_transform in self._shape_view(body)
+        ]
+
+    @staticmethod
+    def _solve_sphere_pairs(shape_pairs: List[tuple], rows: List[int], contacts: List):
+        """Fill ``contacts`` for the sphere-sphere shape pairs at ``rows``"""
+        count = len(rows)
+        centers_a = np.empty((count, 3), dtype=np.float32)
+        centers_b = np.empty((count, 3), dtype=np.float32)
+        radii_a = np.empty(count, dtype=np.float32)
+        radii_b = np.empty(count, dtype=np.float32)
+        for n, k in enumerate(rows):
+            _, shape_a, _, shape_b = shape_pairs[k]
+            centers_a[n] = shape_a[2].origin.data
+            centers_b[n] = shape_b[2].origin.data
+            radii_a[n] = shape_a[3].get("radius", 0.5)
+            radii_b[n] = shape_b[3].get("radius", 0.5)
+
+        hits, normals, depths, points_a, points_b = sphere_vs_sphere_batch(
+            centers_a, radii_a, centers_b, radii_b
+        )
+        for n, row in enumerate(hits.tolist()):
+            contacts[rows[row]] = (
+                Vector3.from_numpy(normals[n]),
+                float(depths[n]),
+                Vector3.from_numpy(points_a[n]),
+                Vector3.from_numpy(points_b[n]),
+            )
 
     def _solve_collisions_simple(self, delta: float):
         """
@@ -573,4 +668,58 @@ class Space3D:
         return self._direct_state
 
     def __repr__(self):
-        return f"Space3D(RID={self.rid.get_id()}, bodies={len(self.bodies)}, areas={len(self.areas)})"
+        rid_id = self.rid.get_id() if self.rid is not None else None
+        return (
+            f"Space3D(RID={rid_id}, bodies={len(self.bodies)}, "
+            f"areas={len(self.areas)})"
+        )
+
+
+def _sweep_sphere_sphere(
+    transform_a: Transform3D,
+    data_a: dict,
+    motion: Vector3,
+    transform_b: Transform3D,
+    data_b: dict,
+    steps: int,
+    out: CollisionRecord,
+) -> bool:
+    """_sweep_test for two spheres, on plain floats"""
+    radius_a = data_a.get("radius", 0.5)
+    ax, ay, az = transform_a.origin.data.tolist()
+    mx, my, mz = motion.data.tolist()
+    bx, by, bz = transform_b.origin.data.tolist()
+
+    hit = sweep_sphere_sphere(
+        ax,
+        ay,
+        az,
+        mx,
+        my,
+        mz,
+        bx,
+        by,
+        bz,
+        radius_a + data_b.get("radius", 0.5),
+        steps,
+    )
+    if hit is None:
+        return False
+
+    i, nx, ny, nz, depth = hit
+    fraction = i / steps
+    out.fraction = (i - 1) / steps if i > 0 else 0.0
+    # Deepest point on A, as sphere_vs_sphere reports it
+    out.point = Vector3(
+        ax + mx * fraction - nx * radius_a,
+        ay + my * fraction - ny * radius_a,
+        az + mz * fraction - nz * radius_a,
+    )
+    out.normal = Vector3(nx, ny, nz)
+    out.depth = depth
+    return True
+
+
+def _exclusion_ids(exclude_rids, rid: RID) -> frozenset:
+    """Integer ids of ``exclude_rids`` plus ``rid``, as taken by query_aabb"""
+    return frozenset([r.get_id() for r in exclude_rids] + [rid.get_id()])
@@ -0,0 +1,53 @@
+"""
+Scalar kernels for the discrete sweep in Space3D._sweep_test.
+
+Each kernel walks the same samples as the generic path, fractions
+i / steps for i in 0..steps, and returns the first colliding sample
+without building a transform or a CollisionResult per sample.
+"""
+
+import math
+from typing import Optional, Tuple
+
+from engine.servers.physics.solver.primitives import EPSILON
+
+# (sample index, nx, ny, nz, depth); the normal points from B towards A
+SweepHit = Tuple[int, float, float, float, float]
+
+
+def sweep_sphere_sphere(
+    ax: float,
+    ay: float,
+    az: float,
+    mx: float,
+    my: float,
+    mz: float,
+    bx: float,
+    by: float,
+    bz: float,
+    radius_sum: float,
+    steps: int,
+) -> Optional[SweepHit]:
+    """
+    First sample at which a sphere centred at a + m * i / steps overlaps a
+    sphere centred at b, with the same contact as sphere_vs_sphere.
+    """
+    limit_sq = radius_sum * radius_sum
+    for i in range(steps + 1):
+        fraction = i / steps
+        dx = ax + mx * fraction - bx
+        dy = ay + my * fraction - by
+        dz = az + mz * fraction - bz
+        distance_sq = dx * dx + dy * dy + dz * dz
+        if distance_sq >= limit_sq:
+            continue
+
+        distance = math.sqrt(distance_sq)
+        if distance < EPSILON:
+            # Same position, arbitrary normal
+            return i, 1.0, 0.0, 0.0, radius_sum
+
+        inv = 1.0 / distance
+        return i, dx * inv, dy * inv, dz * inv, radius_sum - distance
+
+    return None
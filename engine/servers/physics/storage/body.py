@@ -2,8 +2,10 @@ from typing import Dict, List, Optional, Any, TYPE_CHECKING
 from engine.core.rid import RID
 from engine.math.datatypes.transform_3d import Transform3D
 from engine.math.datatypes.vector3 import Vector3
+from .body_state import BodyStateArrays
 from .enums import BodyStateEnums
 from ..bodies.body_3d import Body3D
+from ..bodies.shape_slot import ShapeSlot
 from ..enums import PhysicsServer3DEnums
 
 if TYPE_CHECKING:
@@ -12,23 +14,41 @@ if TYPE_CHECKING:
 
 class BodyStorage:
     class BodyData:
-        def __init__(self):
+        __slots__ = (
+            "mode",
+            "space",
+            "transform",
+            "shapes",
+            "disabled_shapes",
+            "collision_layer",
+            "collision_mask",
+            "axis_lock",
+            "slot",
+            "runtime_body",
+        )
+
+        def __init__(self, slot: int):
             self.mode = PhysicsServer3DEnums.BODY_MODE_RIGID
             self.space: Optional[RID] = None
             self.transform = Transform3D()
-            self.shapes: List[Dict] = []
+            self.shapes: List[ShapeSlot] = []
+            # Bit i is set while shapes[i] is disabled
+            self.disabled_shapes = 0
             self.collision_layer = 1
             self.collision_mask = 1
             self.axis_lock = 0
 
-            self.linear_velocity = Vector3()
-            self.angular_velocity = Vector3()
+            # Row of BodyStorage._body_state holding the motion state; shared
+            # with the runtime body while it exists
+            self.slot = slot
 
             self.runtime_body: Optional[Body3D] = None
 
     def __init__(self):
-        self._bodies: Dict[RID, BodyStorage.BodyData] = {}
+        # Keyed by the RID's integer id, so lookups hash a plain int
+        self._bodies: Dict[int, BodyStorage.BodyData] = {}
         self._next_body_id: int = 1
+        self._body_state = BodyStateArrays()
 
     def body_create(self) -> RID:
         """
@@ -37,19 +57,18 @@ class BodyStorage:
         rid = RID()
         rid._assign(self._next_body_id)
         self._next_body_id += 1
-        self._bodies[rid] = self.BodyData()
+        self._bodies[rid.get_id()] = self.BodyData(self._body_state.allocate())
         return rid
 
     def body_set_space(self, body: RID, space: RID):
         """Set the space for a body - creates/destroys runtime Body3D"""
-        if body not in self._bodies:
+        b_data = self._bodies.get(body.get_id())
+        if b_data is None:
             return
 
-        b_data = self._bodies[body]
-
         if b_data.space and b_data.space in self._spaces:
             old_space_data = self._spaces[b_data.space]
-            old_space_data.body_rids.discard(body)
+            old_space_data.body_ids.discard(body.get_id())
 
             if old_space_data.space_3d:
                 old_space_data.space_3d.remove_body(body)
@@ -60,18 +79,23 @@ class BodyStorage:
 
         if space and space in self._spaces:
             space_data = self._spaces[space]
-            space_data.body_rids.add(body)
+            space_data.body_ids.add(body.get_id())
 
             if space_data.space_3d:
                 from engine.servers.physics.bodies.body_3d import Body3D
 
-                runtime_body = Body3D(body, space_data.space_3d, b_data.mode)
+                runtime_body = Body3D(
+                    body,
+                    space_data.space_3d,
+                    b_data.mode,
+                    self._body_state,
+                    b_data.slot,
+                )
                 runtime_body.transform = b_data.transform
                 runtime_body.collision_layer = b_data.collision_layer
                 runtime_body.collision_mask = b_data.collision_mask
                 runtime_body.shapes = b_data.shapes
-                runtime_body.linear_velocity = b_data.linear_velocity
-                runtime_body.angular_velocity = b_data.angular_velocity
+                runtime_body.disabled_shapes = b_data.disabled_shapes
                 runtime_body.axis_lock = b_data.axis_lock
 
                 b_data.runtime_body = runtime_body
@@ -79,20 +103,25 @@ class BodyStorage:
 
     def body_set_mode(self, body: RID, mode: int):
         """Set body mode"""
-        if body in self._bodies:
-            b_data = self._bodies[body]
+        b_data = self._bodies.get(body.get_id())
+        if b_data is not None:
             b_data.mode = mode
 
-            if b_data.runtime_body:
-                b_data.runtime_body.set_mode(mode)
+            runtime_body = b_data.runtime_body
+            if runtime_body:
+                runtime_body.set_mode(mode)
+                if runtime_body.space is not None:
+                    runtime_body.space.broadphase.update_body_mode(runtime_body)
 
     def body_set_collision_layer(self, body: RID, layer: int):
-        if body in self._bodies:
-            self._bodies[body].collision_layer = layer
+        b_data = self._bodies.get(body.get_id())
+        if b_data is not None:
+            b_data.collision_layer = layer
 
     def body_set_collision_mask(self, body: RID, mask: int):
-        if body in self._bodies:
-            self._bodies[body].collision_mask = mask
+        b_data = self._bodies.get(body.get_id())
+        if b_data is not None:
+            b_data.collision_mask = mask
 
     def body_add_shape(
         self,
@@ -101,28 +130,44 @@ class BodyStorage:
         transform: Transform3D = None,
         disabled: bool = False,
     ):
-        if body not in self._bodies:
+        b_data = self._bodies.get(body.get_id())
+        if b_data is None:
             return
 
         if transform is None:
             transform = Transform3D()
 
-        shape_info = {"shape": shape, "transform": transform, "disabled": disabled}
-        self._bodies[body].shapes.append(shape_info)
+        shape_info = ShapeSlot(shape, transform, disabled)
+        if disabled:
+            b_data.disabled_shapes |= 1 << len(b_data.shapes)
+        # The runtime body shares this list, so one append covers both
+        b_data.shapes.append(shape_info)
+
+        if b_data.runtime_body:
+            b_data.runtime_body.disabled_shapes = b_data.disabled_shapes
+
+    def body_set_shape_disabled(self, body: RID, shape_idx: int, disabled: bool):
+        b_data = self._bodies.get(body.get_id())
+        if b_data is None or not 0 <= shape_idx < len(b_data.shapes):
+            return
+
+        b_data.shapes[shape_idx].disabled = disabled
+        if disabled:
+            b_data.disabled_shapes |= 1 << shape_idx
+        else:
+            b_data.disabled_shapes &= ~(1 << shape_idx)
 
-        b_data = self._bodies[body]
         if b_data.runtime_body:
-            b_data.runtime_body.shapes.append(shape_info)
+            b_data.runtime_body.disabled_shapes = b_data.disabled_shapes
 
     def body_set_state(self, body: RID, state: int, value: Any):
         """
         Set body state.
         """
-        if body not in self._bodies:
+        b_data = self._bodies.get(body.get_id())
+        if b_data is None:
             return
 
-        b_data = self._bodies[body]
-
         if state == BodyStateEnums.BODY_STATE_TRANSFORM:
             if isinstance(value, Transform3D):
                 b_data.transform = value
@@ -131,15 +176,11 @@ class BodyStorage:
 
         elif state == BodyStateEnums.BODY_STATE_LINEAR_VELOCITY:
             if isinstance(value, Vector3):
-                b_data.linear_velocity = value
-                if b_data.runtime_body:
-                    b_data.runtime_body.linear_velocity = value
+                self._body_state.linear_velocity[b_data.slot] = value.data
 
         elif state == BodyStateEnums.BODY_STATE_ANGULAR_VELOCITY:
             if isinstance(value, Vector3):
-                b_data.angular_velocity = value
-                if b_data.runtime_body:
-                    b_data.runtime_body.angular_velocity = value
+                self._body_state.angular_velocity[b_data.slot] = value.data
 
         elif state == BodyStateEnums.BODY_STATE_CAN_SLEEP:
             if b_data.runtime_body:
@@ -147,29 +188,23 @@ class BodyStorage:
 
     def body_get_state(self, body: RID, state: BodyStateEnums) -> Any:
         """Get body state"""
-        if body not in self._bodies:
+        b_data = self._bodies.get(body.get_id())
+        if b_data is None:
             return None
 
-        b_data = self._bodies[body]
-
-        if b_data.runtime_body:
-            if state == BodyStateEnums.BODY_STATE_TRANSFORM:
-                return b_data.runtime_body.transform
-            elif state == BodyStateEnums.BODY_STATE_LINEAR_VELOCITY:
-                return b_data.runtime_body.linear_velocity
-            elif state == BodyStateEnums.BODY_STATE_ANGULAR_VELOCITY:
-                return b_data.runtime_body.angular_velocity
-
         if state == BodyStateEnums.BODY_STATE_TRANSFORM:
+            if b_data.runtime_body:
+                return b_data.runtime_body.transform
             return b_data.transform
         elif state == BodyStateEnums.BODY_STATE_LINEAR_VELOCITY:
-            return b_data.linear_velocity
+            return Vector3.from_numpy(self._body_state.linear_velocity[b_data.slot])
         elif state == BodyStateEnums.BODY_STATE_ANGULAR_VELOCITY:
-            return b_data.angular_velocity
+            return Vector3.from_numpy(self._body_state.angular_velocity[b_data.slot])
 
         return None
 
     def _get_runtime_body(self, body_rid: RID):
-        if body_rid not in self._bodies:
+        b_data = self._bodies.get(body_rid.get_id())
+        if b_data is None:
             return None
-        return self._bodies[body_rid].runtime_body
+        return b_data.runtime_body
@@ -0,0 +1,107 @@
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+VECTOR_FIELDS = (
+    "linear_velocity",
+    "angular_velocity",
+    "applied_force",
+    "applied_torque",
+    "total_gravity",
+    "inverse_inertia",
+)
+SCALAR_FIELDS = (
+    "inverse_mass",
+    "gravity_scale",
+    "total_linear_damp",
+    "total_angular_damp",
+)
+# Fields that do not start at zero for a fresh slot
+_ONE_FIELDS = ("inverse_inertia", "inverse_mass", "gravity_scale")
+
+
+class BodyStateArrays:
+    """
+    Structure-of-arrays storage for per-body motion state.
+
+    Every body owns one row (its slot) of each column; Body3D reads and
+    writes its row through properties, while Space3D.step updates whole
+    columns at once. Columns are float32 like Vector3, and are replaced when
+    they grow, so rows must not be held across allocations.
+    """
+
+    def __init__(self, capacity: int = 16):
+        for name in VECTOR_FIELDS:
+            setattr(self, name, np.zeros((capacity, 3), dtype=np.float32))
+        for name in SCALAR_FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=np.float32))
+
+        self._capacity = capacity
+        self._count = 0
+        self._free: List[int] = []
+
+    def allocate(self) -> int:
+        """Reserve a slot, reset to a fresh body's state"""
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self._count
+            if slot == self._capacity:
+                self._grow(self._capacity * 2)
+            self._count += 1
+
+        for name in VECTOR_FIELDS + SCALAR_FIELDS:
+            getattr(self, name)[slot] = 0.0
+        for name in _ONE_FIELDS:
+            getattr(self, name)[slot] = 1.0
+        return slot
+
+    def release(self, slot: int):
+        self._free.append(slot)
+
+    def _grow(self, capacity: int):
+        for name in VECTOR_FIELDS + SCALAR_FIELDS:
+            column = getattr(self, name)
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[: self._capacity] = column
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+
+def slots_by_state(bodies: Iterable) -> List[Tuple[BodyStateArrays, np.ndarray]]:
+    """Group bodies by the arrays backing them, as (arrays, slot indices)"""
+    groups: Dict[int, Tuple[BodyStateArrays, List[int]]] = {}
+    for body in bodies:
+        state = body.state
+        group = groups.get(id(state))
+        if group is None:
+            groups[id(state)] = (state, [body.slot])
+        else:
+            group[1].append(body.slot)
+
+    return [(state, np.array(slots, dtype=np.intp)) for state, slots in groups.values()]
+
+
+def integrate_forces(bodies: Iterable, delta: float):
+    """
+    Batched Body3D.integrate_forces over rigid bodies: gravity, applied
+    forces and damping folded into the velocity columns, then the
+    accumulated forces cleared.
+    """
+    for state, slots in slots_by_state(bodies):
+        linear_accel = (
+            state.total_gravity[slots] * state.gravity_scale[slots, None]
+            + state.applied_force[slots] * state.inverse_mass[slots, None]
+        )
+        linear_damp = np.maximum(0.0, 1.0 - state.total_linear_damp[slots] * delta)
+        state.linear_velocity[slots] = (
+            state.linear_velocity[slots] + linear_accel * delta
+        ) * linear_damp[:, None]
+
+        angular_accel = state.applied_torque[slots] * state.inverse_inertia[slots]
+        angular_damp = np.maximum(0.0, 1.0 - state.total_angular_damp[slots] * delta)
+        state.angular_velocity[slots] = (
+            state.angular_velocity[slots] + angular_accel * delta
+        ) * angular_damp[:, None]
+
+        state.applied_force[slots] = 0.0
+        state.applied_torque[slots] = 0.0
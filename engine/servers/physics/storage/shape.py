@@ -1,16 +1,28 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Hashable, Optional, Tuple
 from engine.core.rid import RID
+from engine.math.datatypes.vector3 import Vector3
+
+InternKey = Tuple[int, Hashable]
 
 
 class ShapeStorage:
     class ShapeData:
+        __slots__ = ("type", "data", "users", "intern_key")
+
         def __init__(self, shape_type: int):
             self.type = shape_type
             self.data: Any = None
+            # RIDs pointing at this record, and its key in _intern if shared
+            self.users = 1
+            self.intern_key: Optional[InternKey] = None
 
     def __init__(self):
         self._shapes: Dict[RID, ShapeStorage.ShapeData] = {}
         self._next_shape_id: int = 1
+        # Bumped whenever shape data changes, so cached body AABBs go stale
+        self._shape_version: int = 0
+        # Shapes with identical type and data share one ShapeData
+        self._intern: Dict[InternKey, ShapeStorage.ShapeData] = {}
 
     def shape_create(self, shape_type: int) -> RID:
         """
@@ -22,9 +34,49 @@ class ShapeStorage:
         self._shapes[rid] = self.ShapeData(shape_type)
         return rid
 
+    def shape_create_with_data(self, shape_type: int, data: Any) -> RID:
+        """
+        Create a collision shape with its data in one call.
+        """
+        rid = self.shape_create(shape_type)
+        self.shape_set_data(rid, data)
+        return rid
+
     def shape_set_data(self, shape: RID, data: Any):
-        if shape in self._shapes:
-            self._shapes[shape].data = data
+        """
+        Set shape data.
+
+        RIDs keep their identity; if another shape already holds equal data,
+        this RID is pointed at that record instead. A shared record is never
+        written to: setting data on one of its RIDs forks a fresh record.
+        """
+        current = self._shapes.get(shape)
+        if current is None:
+            return
+
+        key = _intern_key(current.type, data)
+        shared = self._intern.get(key) if key is not None else None
+        if shared is current:
+            return
+
+        self._release(current)
+        if shared is not None:
+            shared.users += 1
+            self._shapes[shape] = shared
+        else:
+            if current.users > 0:
+                current = self.ShapeData(current.type)
+            else:
+                current.users = 1
+            current.intern_key = key
+            if key is not None:
+                # Interned data is shared, so keep it out of the caller's reach
+                data = _copy_data(data)
+                self._intern[key] = current
+            current.data = data
+            self._shapes[shape] = current
+
+        self._shape_version += 1
 
     def shape_get_data(self, shape: RID) -> Any:
         if shape in self._shapes:
@@ -36,7 +88,15 @@ class ShapeStorage:
 
     def _free_shape(self, shape: RID):
         if shape in self._shapes:
-            del self._shapes[shape]
+            self._release(self._shapes.pop(shape))
+            self._shape_version += 1
+
+    def _release(self, shape_data: "ShapeStorage.ShapeData"):
+        """Drop one user; the last one takes the record out of the intern table"""
+        shape_data.users -= 1
+        if shape_data.users == 0 and shape_data.intern_key is not None:
+            self._intern.pop(shape_data.intern_key, None)
+            shape_data.intern_key = None
 
     def _get_shape_data(self, shape: RID) -> Optional["ShapeStorage.ShapeData"]:
         """
@@ -49,3 +109,29 @@ class ShapeStorage:
             ShapeData or None if not found
         """
         return self._shapes.get(shape)
+
+
+def _intern_key(shape_type: int, data: Any) -> Optional[InternKey]:
+    """Hashable snapshot of shape data, or None if it cannot be compared"""
+    if not isinstance(data, dict):
+        return None
+
+    items = []
+    for name, value in data.items():
+        if isinstance(value, Vector3):
+            value = tuple(value.data.tolist())
+        elif not isinstance(value, (int, float, str)):
+            return None
+        items.append((name, value))
+
+    return shape_type, tuple(sorted(items))
+
+
+def _copy_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of internable shape data, with its Vector3 values copied too"""
+    copied = {}
+    for name, value in data.items():
+        if isinstance(value, Vector3):
+            value = Vector3(value.x, value.y, value.z)
+        copied[name] = value
+    return copied
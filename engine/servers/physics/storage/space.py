@@ -1,29 +1,50 @@
-from typing import Dict, Set
+from typing import Dict, List, Set
 from engine.core.rid import RID
 
 
 class SpaceStorage:
     class SpaceData:
-        def __init__(self, rid: RID, shape_storage):
+        def __init__(self, rid: RID, shape_storage, expected_bodies: int):
             from engine.servers.physics.spaces.space_3d import Space3D
 
-            self.space_3d = Space3D(rid, shape_storage)
-            self.body_rids: set[RID] = set()
-            self.area_rids: set[RID] = set()
+            self.space_3d = Space3D(rid, shape_storage, expected_bodies)
+            # Members by RID integer id, like Space3D.bodies
+            self.body_ids: Set[int] = set()
+            self.area_ids: Set[int] = set()
+
+        def reset(self, rid: RID):
+            """Reuse a freed space's data for a new space"""
+            self.space_3d.reset(rid)
+            self.body_ids.clear()
+            self.area_ids.clear()
+
+        def reserve(self, body_count: int):
+            self.space_3d.reserve(body_count)
 
     def __init__(self):
         self._spaces: Dict[RID, SpaceStorage.SpaceData] = {}
         self._active_spaces: Set[RID] = set()
         self._next_space_id: int = 1
+        # Freed spaces, recycled by space_create
+        self._free_data_pool: List[SpaceStorage.SpaceData] = []
 
-    def space_create(self) -> RID:
+    def space_create(self, expected_bodies: int = 1024) -> RID:
         """
         Create a physics space and return a valid RID.
+
+        The broadphase is sized for *expected_bodies* up front, by default a
+        typical level, so stepping never regrows its buffers.
         """
         rid = RID()
         rid._assign(self._next_space_id)
         self._next_space_id += 1
-        self._spaces[rid] = self.SpaceData(rid, self)
+        if self._free_data_pool:
+            space_data = self._free_data_pool.pop()
+            space_data.reset(rid)
+            space_data.reserve(expected_bodies)
+        else:
+            space_data = self.SpaceData(rid, self, expected_bodies)
+        self._spaces[rid] = space_data
         return rid
 
     def space_set_active(self, space: RID, active: bool):
@@ -46,11 +67,9 @@ class SpaceStorage:
         return self._spaces[space_rid].space_3d
 
     def _free_space(self, rid: RID):
-        if rid in self._spaces:
-            space_data = self._spaces[rid]
-            space_data.space_3d.bodies.clear()
-            space_data.space_3d.areas.clear()
-            space_data.space_3d.broadphase.clear()
-
-            del self._spaces[rid]
+        space_data = self._spaces.pop(rid, None)
+        if space_data is not None:
             self._active_spaces.discard(rid)
+            # Emptied now so freed bodies and areas are not kept alive in the pool
+            space_data.reset(None)
+            self._free_data_pool.append(space_data)
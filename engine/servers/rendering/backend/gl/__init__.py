@@ -0,0 +1,8 @@
+import OpenGL
+
+# Read by PyOpenGL when OpenGL.GL is first imported, which happens in this
+# package's modules. Error checking adds a glGetError round trip to every
+# call and array size checking re-validates every buffer argument; shader
+# compile and link failures are still reported through their status queries.
+OpenGL.ERROR_CHECKING = False
+OpenGL.ARRAY_SIZE_CHECKING = False
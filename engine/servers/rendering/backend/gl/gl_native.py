@@ -0,0 +1,106 @@
+"""
+Direct ctypes entry points for the GL calls made every frame.
+
+Each name below starts out as the PyOpenGL wrapper and is swapped for a
+plain ctypes function pointer by load(), once a context is current. The
+raw pointers skip PyOpenGL's argument conversion entirely, so callers must
+pass what the C signature takes: ints, floats, bytes or ctypes pointers.
+Everything else (object creation, shader compile and link, queries) keeps
+going through PyOpenGL.
+
+Callers look these up as module attributes at call time, so they pick up
+the pointers whether they run before or after load().
+"""
+
+from __future__ import annotations
+import ctypes
+from ctypes import c_float, c_int, c_ssize_t, c_ubyte, c_uint, c_void_p
+
+from OpenGL import GL
+
+_c_float_p = ctypes.POINTER(c_float)
+
+# name -> (return type, argument types) of the C entry point
+_SIGNATURES = {
+    "glBindTexture": (None, (c_uint, c_uint)),
+    "glActiveTexture": (None, (c_uint,)),
+    "glBindBuffer": (None, (c_uint, c_uint)),
+    "glBufferSubData": (None, (c_uint, c_ssize_t, c_ssize_t, c_void_p)),
+    "glBindVertexArray": (None, (c_uint,)),
+    "glVertexAttribPointer": (
+        None,
+        (c_uint, c_int, c_uint, c_ubyte, c_int, c_void_p),
+    ),
+    "glUseProgram": (None, (c_uint,)),
+    "glDrawElements": (None, (c_uint, c_int, c_uint, c_void_p)),
+    "glDrawElementsInstanced": (None, (c_uint, c_int, c_uint, c_void_p, c_int)),
+    "glDrawArrays": (None, (c_uint, c_int, c_int)),
+    "glDrawArraysInstanced": (None, (c_uint, c_int, c_int, c_int)),
+    "glUniform1i": (None, (c_int, c_int)),
+    "glUniform1f": (None, (c_int, c_float)),
+    "glUniform2f": (None, (c_int, c_float, c_float)),
+    "glUniform3f": (None, (c_int, c_float, c_float, c_float)),
+    "glUniform4f": (None, (c_int, c_float, c_float, c_float, c_float)),
+    "glUniformMatrix4fv": (None, (c_int, c_int, c_ubyte, _c_float_p)),
+}
+
+if GL is not None:
+    glBindTexture = GL.glBindTexture
+    glActiveTexture = GL.glActiveTexture
+    glBindBuffer = GL.glBindBuffer
+    glBufferSubData = GL.glBufferSubData
+    glBindVertexArray = GL.glBindVertexArray
+    glVertexAttribPointer = GL.glVertexAttribPointer
+    glUseProgram = GL.glUseProgram
+    glDrawElements = GL.glDrawElements
+    glDrawElementsInstanced = GL.glDrawElementsInstanced
+    glDrawArrays = GL.glDrawArrays
+    glDrawArraysInstanced = GL.glDrawArraysInstanced
+    glUniform1i = GL.glUniform1i
+    glUniform1f = GL.glUniform1f
+    glUniform2f = GL.glUniform2f
+    glUniform3f = GL.glUniform3f
+    glUniform4f = GL.glUniform4f
+    glUniformMatrix4fv = GL.glUniformMatrix4fv
+
+loaded = False
+
+
+def _resolve(platform, name: str, restype, argtypes):
+    address = platform.getExtensionProcedure(name.encode("ascii"))
+    if not address:
+        # GL 1.1 entry points are not handed out by every GetProcAddress
+        address = ctypes.cast(getattr(platform.GL, name), c_void_p).value
+    if not address:
+        return None
+    prototype = platform.functionTypeFor(platform.GL)(restype, *argtypes)
+    return prototype(address)
+
+
+def load() -> bool:
+    """Swap in the ctypes entry points; needs a current GL context.
+
+    Returns False, keeping the PyOpenGL wrappers, if any entry point cannot
+    be resolved.
+    """
+    global loaded
+    if GL is None:
+        return False
+    if loaded:
+        return True
+
+    from OpenGL import platform
+
+    resolved = {}
+    for name, (restype, argtypes) in _SIGNATURES.items():
+        try:
+            function = _resolve(platform.PLATFORM, name, restype, argtypes)
+        except (AttributeError, TypeError, ValueError):
+            function = None
+        if function is None:
+            return False
+        resolved[name] = function
+
+    globals().update(resolved)
+    loaded = True
+    return True
@@ -1,30 +1,75 @@
 from __future__ import annotations
 from typing import Optional
 from OpenGL import GL
+from engine.servers.rendering.backend.gl import gl_native
 from engine.servers.rendering.server_enums import BlendMode
 
-_BLEND_FACTORS: dict[BlendMode, tuple[int, int]] = {}
+# GL enums used by the setters, read once instead of through the GL module
+if GL is not None:
+    _GL_BLEND = GL.GL_BLEND
+    _GL_FUNC_ADD = GL.GL_FUNC_ADD
+    _GL_FUNC_SUBTRACT = GL.GL_FUNC_SUBTRACT
+    _GL_DEPTH_TEST = GL.GL_DEPTH_TEST
+    _GL_TRUE = GL.GL_TRUE
+    _GL_FALSE = GL.GL_FALSE
+    _GL_CULL_FACE = GL.GL_CULL_FACE
+    _GL_BACK = GL.GL_BACK
+    _GL_FRONT = GL.GL_FRONT
+    _GL_SCISSOR_TEST = GL.GL_SCISSOR_TEST
+    _GL_TEXTURE_2D = GL.GL_TEXTURE_2D
+    _GL_ARRAY_BUFFER = GL.GL_ARRAY_BUFFER
+    _BLEND_OPAQUE = (GL.GL_ONE, GL.GL_ZERO, GL.GL_FUNC_ADD)
 
+# Texture units tracked by bind_texture; below the 48 combined units GL 3.3
+# guarantees
+MAX_TEXTURE_UNITS = 32
+# glActiveTexture argument per unit
+_TEXTURE_UNITS: tuple[int, ...] = (
+    tuple(GL.GL_TEXTURE0 + i for i in range(MAX_TEXTURE_UNITS))
+    if GL is not None
+    else ()
+)
 
-def _init_blend_factors() -> None:
-    if _BLEND_FACTORS:
+# (src factor, dst factor, blend equation) per mode
+_BLEND_STATE: dict[BlendMode, tuple[int, int, int]] = {}
+
+
+def _init_blend_state() -> None:
+    if _BLEND_STATE:
         return
     if GL is None:
         return
-    _BLEND_FACTORS.update(
+    _BLEND_STATE.update(
         {
-            BlendMode.BLEND_MODE_NORMAL: (GL.GL_SRC_ALPHA, GL.GL_ONE_MINUS_SRC_ALPHA),
-            BlendMode.BLEND_MODE_ADD: (GL.GL_SRC_ALPHA, GL.GL_ONE),
-            BlendMode.BLEND_MODE_SUB: (GL.GL_SRC_ALPHA, GL.GL_ONE),
-            BlendMode.BLEND_MODE_MUL: (GL.GL_DST_COLOR, GL.GL_ONE_MINUS_SRC_ALPHA),
+            BlendMode.BLEND_MODE_NORMAL: (
+                GL.GL_SRC_ALPHA,
+                GL.GL_ONE_MINUS_SRC_ALPHA,
+                GL.GL_FUNC_ADD,
+            ),
+            BlendMode.BLEND_MODE_ADD: (GL.GL_SRC_ALPHA, GL.GL_ONE, GL.GL_FUNC_ADD),
+            BlendMode.BLEND_MODE_SUB: (
+                GL.GL_SRC_ALPHA,
+                GL.GL_ONE,
+                GL.GL_FUNC_SUBTRACT,
+            ),
+            BlendMode.BLEND_MODE_MUL: (
+                GL.GL_DST_COLOR,
+                GL.GL_ONE_MINUS_SRC_ALPHA,
+                GL.GL_FUNC_ADD,
+            ),
             BlendMode.BLEND_MODE_PREMULTIPLIED_ALPHA: (
                 GL.GL_ONE,
                 GL.GL_ONE_MINUS_SRC_ALPHA,
+                GL.GL_FUNC_ADD,
             ),
         }
     )
 
 
+# Filled at import so set_blend_mode is a single dict lookup
+_init_blend_state()
+
+
 class GLPipelineState:
     __slots__ = (
         "_blend_enabled",
@@ -38,11 +83,32 @@ class GLPipelineState:
         "_cull_enabled",
         "_cull_face",
         "_scissor_enabled",
-        "_scissor_rect",
+        "_scissor_x",
+        "_scissor_y",
+        "_scissor_w",
+        "_scissor_h",
         "_current_program",
-        "_viewport_rect",
+        "_viewport_x",
+        "_viewport_y",
+        "_viewport_w",
+        "_viewport_h",
         "_texture_bindings",
+        "_active_texture_unit",
         "_current_vao",
+        "_array_buffer",
+        "_glEnable",
+        "_glDisable",
+        "_glBlendFunc",
+        "_glBlendEquation",
+        "_glDepthMask",
+        "_glCullFace",
+        "_glScissor",
+        "_glUseProgram",
+        "_glViewport",
+        "_glActiveTexture",
+        "_glBindTexture",
+        "_glBindVertexArray",
+        "_glBindBuffer",
     )
 
     def __init__(self) -> None:
@@ -50,7 +116,8 @@ class GLPipelineState:
         self._blend_mode: Optional[BlendMode] = None
         self._blend_src: int = 0
         self._blend_dst: int = 0
-        self._blend_equation: int = 0
+        # GL's initial blend equation
+        self._blend_equation: int = _GL_FUNC_ADD if GL is not None else 0
 
         self._depth_test_enabled: bool = False
         self._depth_write_enabled: bool = True
@@ -60,15 +127,47 @@ class GLPipelineState:
         self._cull_face: int = 0
 
         self._scissor_enabled: bool = False
-        self._scissor_rect: tuple[int, int, int, int] = (0, 0, 0, 0)
+        # Rects kept as separate ints so the no-op checks build no tuple
+        self._scissor_x: int = 0
+        self._scissor_y: int = 0
+        self._scissor_w: int = 0
+        self._scissor_h: int = 0
 
         self._current_program: Optional[int] = None
 
-        self._viewport_rect: tuple[int, int, int, int] = (0, 0, 0, 0)
+        self._viewport_x: int = 0
+        self._viewport_y: int = 0
+        self._viewport_w: int = 0
+        self._viewport_h: int = 0
 
-        self._texture_bindings: dict[int, Optional[int]] = {}
+        self._texture_bindings: list[Optional[int]] = [None] * MAX_TEXTURE_UNITS
+        # Unit last selected with glActiveTexture; -1 until the first bind
+        self._active_texture_unit: int = -1
 
         self._current_vao: Optional[int] = None
+        # GL_ARRAY_BUFFER binding is context state, so it can be cached;
+        # GL_ELEMENT_ARRAY_BUFFER belongs to the bound VAO and is not
+        self._array_buffer: Optional[int] = None
+
+        # PyOpenGL entry points bound once; the setters below run every draw
+        if GL is not None:
+            self._glEnable = GL.glEnable
+            self._glDisable = GL.glDisable
+            self._glBlendFunc = GL.glBlendFunc
+            self._glBlendEquation = GL.glBlendEquation
+            self._glDepthMask = GL.glDepthMask
+            self._glCullFace = GL.glCullFace
+            self._glScissor = GL.glScissor
+            self._glViewport = GL.glViewport
+            self.bind_entry_points()
+
+    def bind_entry_points(self) -> None:
+        """Re-read the binds that gl_native swaps for ctypes pointers on load"""
+        self._glUseProgram = gl_native.glUseProgram
+        self._glActiveTexture = gl_native.glActiveTexture
+        self._glBindTexture = gl_native.glBindTexture
+        self._glBindVertexArray = gl_native.glBindVertexArray
+        self._glBindBuffer = gl_native.glBindBuffer
 
     def reset(self) -> None:
         self._blend_enabled = False
@@ -79,43 +178,55 @@ class GLPipelineState:
         self._cull_face = 0
         self._scissor_enabled = False
         self._current_program = None
-        self._texture_bindings.clear()
+        self._texture_bindings = [None] * MAX_TEXTURE_UNITS
+        self._active_texture_unit = -1
         self._current_vao = None
+        self._array_buffer = None
 
     def set_blend_mode(self, mode: BlendMode) -> None:
-        _init_blend_factors()
-
-        if mode == self._blend_mode:
+        if mode is self._blend_mode:
             return
 
         self._blend_mode = mode
-
-        if mode == BlendMode.BLEND_MODE_NORMAL and not self._blend_enabled:
-            pass
+        if GL is None:
+            return
 
         if not self._blend_enabled:
-            if GL is not None:
-                GL.glEnable(GL.GL_BLEND)
+            self._glEnable(_GL_BLEND)
             self._blend_enabled = True
 
-        src, dst = _BLEND_FACTORS.get(mode, (1, 0))
+        # Unknown modes fall back to plain replacement
+        src, dst, equation = _BLEND_STATE.get(mode, _BLEND_OPAQUE)
 
         if src != self._blend_src or dst != self._blend_dst:
-            if GL is not None:
-                GL.glBlendFunc(src, dst)
+            self._glBlendFunc(src, dst)
             self._blend_src = src
             self._blend_dst = dst
 
-        # ── blend equation (SUB vs ADD) ───────────────────────────────────
-        if mode == BlendMode.BLEND_MODE_SUB:
-            if GL is not None:
-                GL.glBlendEquation(GL.GL_FUNC_SUBTRACT)
-            self._blend_equation = 1  # SUB sentinel
-        else:
-            if self._blend_equation != 0:
-                if GL is not None:
-                    GL.glBlendEquation(GL.GL_FUNC_ADD)
-                self._blend_equation = 0
+        if equation != self._blend_equation:
+            self._glBlendEquation(equation)
+            self._blend_equation = equation
+
+    def apply_state(
+        self,
+        blend_mode: Optional[BlendMode],
+        depth_test: Optional[bool],
+        depth_write: Optional[bool],
+        cull_face: Optional[int],
+    ) -> None:
+        """Set several states at once; ``None`` leaves a state as it is.
+
+        Each state is compared here and its setter only called on a change,
+        so re-applying a pass's unchanged state costs a single call.
+        """
+        if blend_mode is not None and blend_mode is not self._blend_mode:
+            self.set_blend_mode(blend_mode)
+        if depth_test is not None and depth_test != self._depth_test_enabled:
+            self.set_depth_test(depth_test)
+        if depth_write is not None and depth_write != self._depth_write_enabled:
+            self.set_depth_write(depth_write)
+        if cull_face is not None and cull_face != self._cull_face:
+            self.set_cull_face(cull_face)
 
     def set_depth_test(self, enabled: bool) -> None:
         if enabled == self._depth_test_enabled:
@@ -123,16 +234,16 @@ class GLPipelineState:
         self._depth_test_enabled = enabled
         if GL is not None:
             if enabled:
-                GL.glEnable(GL.GL_DEPTH_TEST)
+                self._glEnable(_GL_DEPTH_TEST)
             else:
-                GL.glDisable(GL.GL_DEPTH_TEST)
+                self._glDisable(_GL_DEPTH_TEST)
 
     def set_depth_write(self, enabled: bool) -> None:
         if enabled == self._depth_write_enabled:
             return
         self._depth_write_enabled = enabled
         if GL is not None:
-            GL.glDepthMask(GL.GL_TRUE if enabled else GL.GL_FALSE)
+            self._glDepthMask(_GL_TRUE if enabled else _GL_FALSE)
 
     def set_cull_face(self, mode: int) -> None:
         if mode == self._cull_face:
@@ -142,56 +253,110 @@ class GLPipelineState:
             return
         if mode == 0:
             if self._cull_enabled:
-                GL.glDisable(GL.GL_CULL_FACE)
+                self._glDisable(_GL_CULL_FACE)
                 self._cull_enabled = False
         else:
             if not self._cull_enabled:
-                GL.glEnable(GL.GL_CULL_FACE)
+                self._glEnable(_GL_CULL_FACE)
                 self._cull_enabled = True
-            GL.glCullFace(GL.GL_BACK if mode == 1 else GL.GL_FRONT)
+            self._glCullFace(_GL_BACK if mode == 1 else _GL_FRONT)
 
     def set_scissor(
         self, enabled: bool, x: int = 0, y: int = 0, w: int = 0, h: int = 0
     ) -> None:
-        rect = (x, y, w, h)
-        if enabled == self._scissor_enabled and rect == self._scissor_rect:
+        if (
+            enabled == self._scissor_enabled
+            and x == self._scissor_x
+            and y == self._scissor_y
+            and w == self._scissor_w
+            and h == self._scissor_h
+        ):
             return
         self._scissor_enabled = enabled
-        self._scissor_rect = rect
+        self._scissor_x = x
+        self._scissor_y = y
+        self._scissor_w = w
+        self._scissor_h = h
         if GL is None:
             return
         if enabled:
-            GL.glEnable(GL.GL_SCISSOR_TEST)
-            GL.glScissor(x, y, w, h)
+            self._glEnable(_GL_SCISSOR_TEST)
+            self._glScissor(x, y, w, h)
         else:
-            GL.glDisable(GL.GL_SCISSOR_TEST)
+            self._glDisable(_GL_SCISSOR_TEST)
 
     def set_program(self, program: Optional[int]) -> None:
         if program == self._current_program:
             return
         self._current_program = program
         if GL is not None:
-            GL.glUseProgram(program if program is not None else 0)
+            self._glUseProgram(program if program is not None else 0)
 
     def set_viewport(self, x: int, y: int, w: int, h: int) -> None:
-        rect = (x, y, w, h)
-        if rect == self._viewport_rect:
+        if (
+            x == self._viewport_x
+            and y == self._viewport_y
+            and w == self._viewport_w
+            and h == self._viewport_h
+        ):
             return
-        self._viewport_rect = rect
+        self._viewport_x = x
+        self._viewport_y = y
+        self._viewport_w = w
+        self._viewport_h = h
         if GL is not None:
-            GL.glViewport(x, y, w, h)
+            self._glViewport(x, y, w, h)
 
     def bind_texture(self, unit: int, gl_name: Optional[int]) -> None:
-        if self._texture_bindings.get(unit) == gl_name:
+        if self._texture_bindings[unit] == gl_name:
             return
         self._texture_bindings[unit] = gl_name
         if GL is not None:
-            GL.glActiveTexture(GL.GL_TEXTURE0 + unit)
-            GL.glBindTexture(GL.GL_TEXTURE_2D, gl_name if gl_name is not None else 0)
+            if unit != self._active_texture_unit:
+                self._glActiveTexture(_TEXTURE_UNITS[unit])
+                self._active_texture_unit = unit
+            self._glBindTexture(_GL_TEXTURE_2D, gl_name if gl_name is not None else 0)
+
+    def bind_texture_on_active_unit(self, gl_name: int) -> None:
+        """Bind on whichever unit is active, for uploads that only need the
+        texture bound somewhere."""
+        self.bind_texture(max(self._active_texture_unit, 0), gl_name)
+
+    def forget_texture(self, gl_name: int) -> None:
+        """Deleting a texture unbinds it from every unit"""
+        bindings = self._texture_bindings
+        for unit in range(MAX_TEXTURE_UNITS):
+            if bindings[unit] == gl_name:
+                bindings[unit] = None
+
+    def forget_program(self, program: int) -> None:
+        """Stop treating a deleted program as current, since GL may reuse its
+        name"""
+        if program == self._current_program:
+            self.set_program(None)
+
+    def forget_vao(self, vao: int) -> None:
+        """Deleting the bound VAO reverts the binding to 0"""
+        if vao == self._current_vao:
+            self._current_vao = None
 
     def bind_vao(self, vao: Optional[int]) -> None:
         if vao == self._current_vao:
             return
         self._current_vao = vao
         if GL is not None:
-            GL.glBindVertexArray(vao if vao is not None else 0)
+            self._glBindVertexArray(vao if vao is not None else 0)
+
+    def bind_buffer(self, target: int, name: int) -> None:
+        """glBindBuffer, skipped when *name* is already the bound array buffer"""
+        if target == _GL_ARRAY_BUFFER:
+            if name == self._array_buffer:
+                return
+            self._array_buffer = name
+        if GL is not None:
+            self._glBindBuffer(target, name)
+
+    def forget_buffer(self, name: int) -> None:
+        """Deleting the bound array buffer reverts the binding to 0"""
+        if name == self._array_buffer:
+            self._array_buffer = None
@@ -1,9 +1,11 @@
 from __future__ import annotations
+import ctypes
 from typing import Any, List
+import numpy as np
 from OpenGL import GL
 
 from engine.core.rid import RID
-from engine.servers.rendering.backend.gl import gl_resources
+from engine.servers.rendering.backend.gl import gl_native, gl_resources
 from engine.servers.rendering.backend.gl.gl_pipeline_state import GLPipelineState
 from engine.servers.rendering.backend.gl.gl_resources import buffer_gen, buffer_data
 from engine.servers.rendering.backend.rendering_device import RenderingDevice
@@ -24,15 +26,112 @@ _PRIM_MAP: dict[PrimitiveType, str] = {
 }
 
 
-def _resolve_prim(prim: PrimitiveType) -> int:
-    if GL is None:
-        raise gl_resources.GLResourceError("OpenGL not available")
-    return getattr(GL, _PRIM_MAP[prim])
+# Resolved once so draw calls index a dict instead of calling getattr on GL
+_PRIM_GL: dict[PrimitiveType, int] = (
+    {prim: getattr(GL, name) for prim, name in _PRIM_MAP.items()}
+    if GL is not None
+    else {}
+)
+
+# Index types, resolved once instead of per draw call
+if GL is not None:
+    _GL_UNSIGNED_SHORT = GL.GL_UNSIGNED_SHORT
+    _GL_UNSIGNED_INT = GL.GL_UNSIGNED_INT
 
 
 _INDEX_TYPE_U16 = 0
 _INDEX_TYPE_U32 = 1
 
+_c_float_p = ctypes.POINTER(ctypes.c_float)
+
+# gl_native entry point behind each get_uniform_writer kind, other than mat4
+_UNIFORM_SETTERS: dict[str, str] = {
+    "int": "glUniform1i",
+    "texture": "glUniform1i",
+    "float": "glUniform1f",
+    "vec2": "glUniform2f",
+    "vec3": "glUniform3f",
+    "vec4": "glUniform4f",
+}
+
+
+def _ignore_uniform(*values) -> None:
+    pass
+
+# Byte offsets wrapped for GL pointer arguments; offsets repeat from draw to
+# draw (mostly 0), so each distinct one is only wrapped once
+_OFFSET_CACHE: dict[int, ctypes.c_void_p] = {}
+
+
+def _void_ptr(offset: int) -> ctypes.c_void_p:
+    ptr = _OFFSET_CACHE.get(offset)
+    if ptr is None:
+        ptr = ctypes.c_void_p(offset)
+        _OFFSET_CACHE[offset] = ptr
+    return ptr
+
+
+class _TextureMeta:
+    __slots__ = (
+        "width",
+        "height",
+        "format",
+        "filter",
+        "repeat",
+        "generate_mipmaps",
+        "allocated_levels",
+    )
+
+    def __init__(self, width, height, format, filter_mode, repeat_mode, mipmaps):
+        self.width = width
+        self.height = height
+        self.format = format
+        self.filter = filter_mode
+        self.repeat = repeat_mode
+        self.generate_mipmaps = mipmaps
+        # Bit n is set once level n has storage; later uploads reuse it
+        self.allocated_levels = 0
+
+
+class _BufferMeta:
+    __slots__ = ("target", "stride", "index_type", "size")
+
+    def __init__(self, target: int, size: int, stride: int = 0, index_type=None):
+        self.target = target
+        self.stride = stride
+        self.index_type = index_type
+        self.size = size
+
+
+class _VaoData:
+    """GL name of a VAO plus its index format, resolved once at creation.
+
+    ``instance_attributes`` holds the glVertexAttribPointer arguments of the
+    divisor attributes, so a draw can start them at a later instance;
+    ``first_instance`` is the instance they currently point at.
+    """
+
+    __slots__ = (
+        "gl_name",
+        "index_buffer",
+        "gl_index_type",
+        "index_size",
+        "instance_attributes",
+        "first_instance",
+    )
+
+    def __init__(self, gl_name: int, index_buffer, index_type, instance_attributes):
+        self.gl_name = gl_name
+        self.index_buffer = index_buffer
+        self.instance_attributes = instance_attributes
+        self.first_instance = 0
+        if index_type == _INDEX_TYPE_U32:
+            self.gl_index_type = _GL_UNSIGNED_INT
+            self.index_size = 4
+        else:
+            self.gl_index_type = _GL_UNSIGNED_SHORT
+            self.index_size = 2
+
 
 class GLRenderingDevice(RenderingDevice):
     """Concrete OpenGL back-end.
@@ -44,43 +143,85 @@ class GLRenderingDevice(RenderingDevice):
         self._state: GLPipelineState = GLPipelineState()
 
         self._textures: dict[Any, int] = {}
-        self._tex_meta: dict[Any, dict[str, Any]] = {}
+        self._tex_meta: dict[Any, _TextureMeta] = {}
 
         self._buffers: dict[Any, int] = {}
-        self._buf_meta: dict[Any, dict[str, Any]] = {}
+        self._buf_meta: dict[Any, _BufferMeta] = {}
 
-        self._vaos: dict[Any, int] = {}
-        self._vao_meta: dict[Any, dict[str, Any]] = {}
+        # One record per VAO, so a draw call is a single lookup
+        self._vaos: dict[Any, _VaoData] = {}
 
         self._programs: dict[Any, int] = {}
         self._uniforms: dict[Any, dict[str, int]] = {}
+        # Last value sent to each uniform location, per shader; GL keeps
+        # uniform values per program, so re-sending an equal one is skipped
+        self._uniform_values: dict[Any, dict[int, Any]] = {}
 
         self._render_targets: dict[Any, int] = {}
 
         self._next_rid: int = 1
 
+        # Refilled by every shader_set_uniform_mat4 instead of a new array each
+        self._mat4_scratch = (ctypes.c_float * 16)()
+
+        # Shader whose program the uniform setters last made current
+        self._active_shader_rid: Any = None
+        self._active_program: Any = None
+        self._active_uniforms: dict[str, int] = {}
+        self._active_values: dict[int, Any] = {}
+
     def _alloc_rid(self) -> RID:
         rid = self._next_rid
         self._next_rid += 1
         return rid
 
     def _get_uniform_loc(self, shader_rid, name: str) -> int:
-        """Cached uniform-location lookup."""
+        """Cached uniform-location lookup; also makes the shader's program current.
+
+        Consecutive uniforms on the same shader skip straight to the location
+        cache, without re-resolving or re-binding the program.
+        """
+        if shader_rid != self._active_shader_rid:
+            self._activate_shader(shader_rid)
+        cache = self._active_uniforms
+        loc = cache.get(name)
+        if loc is None:
+            loc = gl_resources.shader_get_uniform_location(self._active_program, name)
+            cache[name] = loc
+        return loc
+
+    def _activate_shader(self, shader_rid) -> None:
         prog = self._programs.get(shader_rid)
         if prog is None:
             raise gl_resources.GLResourceError(f"Unknown shader RID: {shader_rid}")
-        cache = self._uniforms.setdefault(shader_rid, {})
-        if name not in cache:
-            cache[name] = gl_resources.shader_get_uniform_location(prog, name)
-        return cache[name]
+        self._state.set_program(prog)
+        self._active_shader_rid = shader_rid
+        self._active_program = prog
+        self._active_uniforms = self._uniforms.setdefault(shader_rid, {})
+        self._active_values = self._uniform_values.setdefault(shader_rid, {})
+
+    def _clear_active_shader(self) -> None:
+        self._active_shader_rid = None
+        self._active_program = None
+        self._active_uniforms = {}
+        self._active_values = {}
 
     def initialize(self) -> None:
         """Initialize the GL state and log OpenGL context information."""
         from engine.logger import Logger
 
         self._state.reset()
+        self._clear_active_shader()
 
         if GL is not None:
+            if gl_native.load():
+                self._state.bind_entry_points()
+            else:
+                Logger.warn(
+                    "Could not resolve native GL entry points; "
+                    "hot calls stay on PyOpenGL",
+                    "GLRenderingDevice",
+                )
             GL.glEnable(GL.GL_MULTISAMPLE)
             Logger.info("MSAA enabled on default framebuffer", "GLRenderingDevice")
             vendor = GL.glGetString(GL.GL_VENDOR)
@@ -144,14 +285,9 @@ class GLRenderingDevice(RenderingDevice):
         gl_name = gl_resources.texture_gen()
         rid = self._alloc_rid()
         self._textures[rid] = gl_name
-        self._tex_meta[rid] = {
-            "width": width,
-            "height": height,
-            "format": format,
-            "filter": filter_mode,
-            "repeat": repeat_mode,
-            "generate_mipmaps": generate_mipmaps,
-        }
+        self._tex_meta[rid] = _TextureMeta(
+            width, height, format, filter_mode, repeat_mode, generate_mipmaps
+        )
         return rid
 
     def texture_upload(self, gpu_texture_rid, data: bytes, level: int = 0) -> None:
@@ -161,58 +297,141 @@ class GLRenderingDevice(RenderingDevice):
                 f"Unknown texture RID: {gpu_texture_rid}"
             )
         meta = self._tex_meta[gpu_texture_rid]
+        # Bound through the state cache so its record of the unit stays true
+        self._state.bind_texture_on_active_unit(gl_name)
+
+        level_bit = 1 << level
+        if meta.allocated_levels & level_bit:
+            gl_resources.texture_subimage_2d(
+                gl_name,
+                meta.width,
+                meta.height,
+                data,
+                meta.format,
+                level,
+                generate_mipmaps=meta.generate_mipmaps,
+                bind=False,
+            )
+            return
+
         gl_resources.texture_upload_2d(
             gl_name,
-            meta["width"],
-            meta["height"],
+            meta.width,
+            meta.height,
             data,
-            meta["format"],
-            meta["filter"],
-            meta["repeat"],
+            meta.format,
+            meta.filter,
+            meta.repeat,
             level,
-            generate_mipmaps=meta["generate_mipmaps"],
+            generate_mipmaps=meta.generate_mipmaps,
+            bind=False,
         )
+        meta.allocated_levels |= level_bit
 
     def texture_free(self, gpu_texture_rid) -> None:
         gl_name = self._textures.pop(gpu_texture_rid, None)
         if gl_name is not None:
             gl_resources.texture_delete(gl_name)
+            self._state.forget_texture(gl_name)
         self._tex_meta.pop(gpu_texture_rid, None)
 
-    def buffer_create_vertex(self, data: bytes, stride: int) -> Any:
+    def buffer_create_vertex(
+        self, data: bytes, stride: int, dynamic: bool = False
+    ) -> Any:
         if GL is None:
             raise gl_resources.GLResourceError("OpenGL not available")
         gl_name = gl_resources.buffer_gen()
-        gl_resources.buffer_data(gl_name, GL.GL_ARRAY_BUFFER, data, GL.GL_STATIC_DRAW)
+        usage = GL.GL_DYNAMIC_DRAW if dynamic else GL.GL_STATIC_DRAW
+        self._state.bind_buffer(GL.GL_ARRAY_BUFFER, gl_name)
+        gl_resources.buffer_data(
+            gl_name, GL.GL_ARRAY_BUFFER, data, usage, bind=False
+        )
         rid = self._alloc_rid()
         self._buffers[rid] = gl_name
-        self._buf_meta[rid] = {
-            "target": GL.GL_ARRAY_BUFFER,
-            "stride": stride,
-            "size": len(data),
-        }
+        self._buf_meta[rid] = _BufferMeta(GL.GL_ARRAY_BUFFER, len(data), stride=stride)
         return rid
 
     def buffer_create_index(self, data: bytes, index_type: int) -> Any:
         if GL is None:
             raise gl_resources.GLResourceError("OpenGL not available")
         gl_name = gl_resources.buffer_gen()
+        # The element array binding is VAO state: unbind so the upload does
+        # not replace the index buffer of whichever VAO is bound
+        self._state.bind_vao(None)
+        self._state.bind_buffer(GL.GL_ELEMENT_ARRAY_BUFFER, gl_name)
         gl_resources.buffer_data(
-            gl_name, GL.GL_ELEMENT_ARRAY_BUFFER, data, GL.GL_STATIC_DRAW
+            gl_name, GL.GL_ELEMENT_ARRAY_BUFFER, data, GL.GL_STATIC_DRAW, bind=False
         )
         rid = self._alloc_rid()
         self._buffers[rid] = gl_name
-        self._buf_meta[rid] = {
-            "target": GL.GL_ELEMENT_ARRAY_BUFFER,
-            "index_type": index_type,
-            "size": len(data),
-        }
+        self._buf_meta[rid] = _BufferMeta(
+            GL.GL_ELEMENT_ARRAY_BUFFER, len(data), index_type=index_type
+        )
         return rid
 
+    def buffer_create_uniform(self, size: int) -> Any:
+        if GL is None:
+            raise gl_resources.GLResourceError("OpenGL not available")
+        gl_name = gl_resources.buffer_gen()
+        self._state.bind_buffer(GL.GL_UNIFORM_BUFFER, gl_name)
+        gl_resources.buffer_data(
+            gl_name, GL.GL_UNIFORM_BUFFER, bytes(size), GL.GL_DYNAMIC_DRAW, bind=False
+        )
+        rid = self._alloc_rid()
+        self._buffers[rid] = gl_name
+        self._buf_meta[rid] = _BufferMeta(GL.GL_UNIFORM_BUFFER, size)
+        return rid
+
+    def buffer_bind_uniform(self, binding: int, buffer_rid) -> None:
+        gl_name = self._buffers.get(buffer_rid)
+        if gl_name is None:
+            raise gl_resources.GLResourceError(f"Unknown buffer RID: {buffer_rid}")
+        gl_resources.bind_buffer_base(GL.GL_UNIFORM_BUFFER, binding, gl_name)
+
+    def buffer_update(self, buffer_rid, data: bytes, offset: int = 0) -> None:
+        gl_name = self._buffers.get(buffer_rid)
+        if gl_name is None:
+            raise gl_resources.GLResourceError(f"Unknown buffer RID: {buffer_rid}")
+        meta = self._buf_meta[buffer_rid]
+        if offset + len(data) > meta.size:
+            raise gl_resources.GLResourceError(
+                f"buffer_update past the end of buffer {buffer_rid}: "
+                f"{offset} + {len(data)} > {meta.size}"
+            )
+        if meta.target == GL.GL_ELEMENT_ARRAY_BUFFER:
+            self._state.bind_vao(None)
+        self._state.bind_buffer(meta.target, gl_name)
+        gl_resources.buffer_subdata(gl_name, meta.target, offset, data, bind=False)
+
+    def buffer_create_mapped(self, size: int, stride: int):
+        if GL is None:
+            raise gl_resources.GLResourceError("OpenGL not available")
+        if not gl_resources.buffer_storage_supported():
+            return None
+        gl_name = gl_resources.buffer_gen()
+        self._state.bind_buffer(GL.GL_ARRAY_BUFFER, gl_name)
+        address = gl_resources.buffer_storage_mapped(
+            gl_name, GL.GL_ARRAY_BUFFER, size, bind=False
+        )
+        rid = self._alloc_rid()
+        self._buffers[rid] = gl_name
+        self._buf_meta[rid] = _BufferMeta(GL.GL_ARRAY_BUFFER, size, stride=stride)
+        memory = np.frombuffer(
+            (ctypes.c_ubyte * size).from_address(address), dtype=np.float32
+        )
+        return rid, memory
+
+    def fence_insert(self) -> Any:
+        return gl_resources.fence_sync()
+
+    def fence_wait(self, fence) -> None:
+        gl_resources.fence_wait(fence)
+
     def buffer_free(self, buffer_rid) -> None:
         gl_name = self._buffers.pop(buffer_rid, None)
         if gl_name is not None:
             gl_resources.buffer_delete(gl_name)
+            self._state.forget_buffer(gl_name)
         self._buf_meta.pop(buffer_rid, None)
 
     def vao_create(self, index_buffer, layout: List) -> Any:
@@ -220,17 +439,18 @@ class GLRenderingDevice(RenderingDevice):
             raise gl_resources.GLResourceError("OpenGL not available")
 
         vao_name = gl_resources.vao_gen()
-        GL.glBindVertexArray(vao_name)
+        self._state.bind_vao(vao_name)
+        instance_attributes = []
 
         for attr in layout:
             buf_gl = self._buffers.get(attr["buffer_rid"])
             if buf_gl is None:
-                gl_resources.vao_delete(vao_name)
+                self._vao_delete(vao_name)
                 raise gl_resources.GLResourceError(
                     f"VAO layout references unknown buffer: {attr['buffer_rid']}"
                 )
 
-            GL.glBindBuffer(GL.GL_ARRAY_BUFFER, buf_gl)
+            self._state.bind_buffer(GL.GL_ARRAY_BUFFER, buf_gl)
 
             location = attr["location"]
             size = attr["size"]
@@ -239,9 +459,8 @@ class GLRenderingDevice(RenderingDevice):
 
             GL.glEnableVertexAttribArray(location)
 
-            import ctypes
             if isinstance(offset, int):
-                offset_ptr = ctypes.c_void_p(offset)
+                offset_ptr = _void_ptr(offset)
             else:
                 offset_ptr = offset
 
@@ -257,31 +476,48 @@ class GLRenderingDevice(RenderingDevice):
             divisor = attr.get("divisor", 0)
             if divisor != 0:
                 GL.glVertexAttribDivisor(location, divisor)
+                if isinstance(offset, int):
+                    instance_attributes.append(
+                        (
+                            buf_gl,
+                            location,
+                            size,
+                            attr.get("type", GL.GL_FLOAT),
+                            attr.get("normalized", False),
+                            stride,
+                            offset,
+                        )
+                    )
 
         if index_buffer is not None:
             idx_gl = self._buffers.get(index_buffer)
             if idx_gl is None:
-                gl_resources.vao_delete(vao_name)
+                self._vao_delete(vao_name)
                 raise gl_resources.GLResourceError(
                     f"VAO index references unknown buffer: {index_buffer}"
                 )
             GL.glBindBuffer(GL.GL_ELEMENT_ARRAY_BUFFER, idx_gl)
 
-        GL.glBindVertexArray(0)
+        self._state.bind_vao(None)
+
+        index_type = None
+        if index_buffer is not None:
+            index_type = self._buf_meta[index_buffer].index_type
 
         rid = self._alloc_rid()
-        self._vaos[rid] = vao_name
-        self._vao_meta[rid] = {
-            "has_index": index_buffer is not None,
-            "index_buffer": index_buffer,
-        }
+        self._vaos[rid] = _VaoData(
+            vao_name, index_buffer, index_type, tuple(instance_attributes)
+        )
         return rid
 
     def vao_free(self, vao_rid) -> None:
-        vao_name = self._vaos.pop(vao_rid, None)
-        if vao_name is not None:
-            gl_resources.vao_delete(vao_name)
-        self._vao_meta.pop(vao_rid, None)
+        vao = self._vaos.pop(vao_rid, None)
+        if vao is not None:
+            self._vao_delete(vao.gl_name)
+
+    def _vao_delete(self, gl_name: int) -> None:
+        gl_resources.vao_delete(gl_name)
+        self._state.forget_vao(gl_name)
 
     def shader_create(self, vertex_source: str, fragment_source: str) -> Any:
         if GL is None:
@@ -293,13 +529,26 @@ class GLRenderingDevice(RenderingDevice):
         rid = self._alloc_rid()
         self._programs[rid] = program
         self._uniforms[rid] = {}
+        self._uniform_values[rid] = {}
         return rid
 
     def shader_free(self, shader_rid) -> None:
         prog = self._programs.pop(shader_rid, None)
         if prog is not None:
             gl_resources.shader_delete(prog)
+            self._state.forget_program(prog)
         self._uniforms.pop(shader_rid, None)
+        self._uniform_values.pop(shader_rid, None)
+        if shader_rid == self._active_shader_rid:
+            self._clear_active_shader()
+
+    def shader_bind_uniform_block(
+        self, shader_rid, block_name: str, binding: int
+    ) -> None:
+        prog = self._programs.get(shader_rid)
+        if prog is None:
+            raise gl_resources.GLResourceError(f"Unknown shader RID: {shader_rid}")
+        gl_resources.shader_bind_uniform_block(prog, block_name, binding)
 
     def shader_bind(self, shader_rid) -> None:
         """Bind the shader program identified by *shader_rid* as the active program.
@@ -316,23 +565,25 @@ class GLRenderingDevice(RenderingDevice):
                 "GLRenderingDevice",
             )
             return
-        self._state.set_program(prog)
+        self._activate_shader(shader_rid)
 
     def shader_set_uniform_int(self, shader_rid, name: str, value: int) -> None:
         loc = self._get_uniform_loc(shader_rid, name)
         if loc < 0:
             return
-        self._state.set_program(self._programs[shader_rid])
-        if GL is not None:
-            GL.glUniform1i(loc, value)
+        if self._active_values.get(loc) != value:
+            self._active_values[loc] = value
+            if GL is not None:
+                gl_native.glUniform1i(loc, value)
 
     def shader_set_uniform_float(self, shader_rid, name: str, value: float) -> None:
         loc = self._get_uniform_loc(shader_rid, name)
         if loc < 0:
             return
-        self._state.set_program(self._programs[shader_rid])
-        if GL is not None:
-            GL.glUniform1f(loc, value)
+        if self._active_values.get(loc) != value:
+            self._active_values[loc] = value
+            if GL is not None:
+                gl_native.glUniform1f(loc, value)
 
     def shader_set_uniform_vec2(
         self, shader_rid, name: str, x: float, y: float
@@ -340,9 +591,11 @@ class GLRenderingDevice(RenderingDevice):
         loc = self._get_uniform_loc(shader_rid, name)
         if loc < 0:
             return
-        self._state.set_program(self._programs[shader_rid])
-        if GL is not None:
-            GL.glUniform2f(loc, x, y)
+        value = (x, y)
+        if self._active_values.get(loc) != value:
+            self._active_values[loc] = value
+            if GL is not None:
+                gl_native.glUniform2f(loc, x, y)
 
     def shader_set_uniform_vec3(
         self, shader_rid, name: str, x: float, y: float, z: float
@@ -350,9 +603,11 @@ class GLRenderingDevice(RenderingDevice):
         loc = self._get_uniform_loc(shader_rid, name)
         if loc < 0:
             return
-        self._state.set_program(self._programs[shader_rid])
-        if GL is not None:
-            GL.glUniform3f(loc, x, y, z)
+        value = (x, y, z)
+        if self._active_values.get(loc) != value:
+            self._active_values[loc] = value
+            if GL is not None:
+                gl_native.glUniform3f(loc, x, y, z)
 
     def shader_set_uniform_vec4(
         self, shader_rid, name: str, r: float, g: float, b: float, a: float
@@ -360,26 +615,38 @@ class GLRenderingDevice(RenderingDevice):
         loc = self._get_uniform_loc(shader_rid, name)
         if loc < 0:
             return
-        self._state.set_program(self._programs[shader_rid])
-        if GL is not None:
-            GL.glUniform4f(loc, r, g, b, a)
+        value = (r, g, b, a)
+        if self._active_values.get(loc) != value:
+            self._active_values[loc] = value
+            if GL is not None:
+                gl_native.glUniform4f(loc, r, g, b, a)
 
     def shader_set_uniform_mat4(self, shader_rid, name: str, matrix) -> None:
         loc = self._get_uniform_loc(shader_rid, name)
         if loc < 0:
             return
-        self._state.set_program(self._programs[shader_rid])
-        if GL is not None:
-            import ctypes
-
-            if hasattr(matrix, "shape") and len(matrix.shape) == 2:
-                flat = matrix.flatten(order="F")
-            elif hasattr(matrix, "__len__") and len(matrix) == 16:
-                flat = matrix
-            else:
-                flat = matrix
-            c_matrix = (ctypes.c_float * 16)(*flat)
-            GL.glUniformMatrix4fv(loc, 1, False, c_matrix)
+        if hasattr(matrix, "shape") and len(matrix.shape) == 2:
+            # Arrays are not compared; just forget the cached value
+            self._active_values.pop(loc, None)
+            if GL is None:
+                return
+            if matrix.dtype == np.float32 and matrix.flags.f_contiguous:
+                # Column-major float32 already matches GL's layout
+                gl_native.glUniformMatrix4fv(
+                    loc, 1, False, matrix.ctypes.data_as(_c_float_p)
+                )
+                return
+            flat = matrix.flatten(order="F")
+        else:
+            flat = tuple(matrix)
+            if self._active_values.get(loc) == flat:
+                return
+            self._active_values[loc] = flat
+            if GL is None:
+                return
+        c_matrix = self._mat4_scratch
+        c_matrix[:] = flat
+        gl_native.glUniformMatrix4fv(loc, 1, False, c_matrix)
 
     def shader_set_uniform_texture(
         self, shader_rid, name: str, texture_unit: int
@@ -387,21 +654,99 @@ class GLRenderingDevice(RenderingDevice):
         loc = self._get_uniform_loc(shader_rid, name)
         if loc < 0:
             return
-        self._state.set_program(self._programs[shader_rid])
-        if GL is not None:
-            GL.glUniform1i(loc, texture_unit)
+        if self._active_values.get(loc) != texture_unit:
+            self._active_values[loc] = texture_unit
+            if GL is not None:
+                gl_native.glUniform1i(loc, texture_unit)
+
+    def get_uniform_writer(self, shader_rid, name: str, kind: str):
+        """Writer bound to the uniform's location and GL entry point.
 
+        Per call it only checks that the shader is still the active one and
+        that the value changed, then calls GL directly; mat4 writers take a
+        flat column-major sequence and fill a buffer of their own.
+        """
+        if kind != "mat4" and kind not in _UNIFORM_SETTERS and GL is not None:
+            raise gl_resources.GLResourceError(f"Unknown uniform kind: {kind}")
+        loc = self._get_uniform_loc(shader_rid, name)
+        if loc < 0 or GL is None:
+            return _ignore_uniform
+        values = self._active_values
+
+        if kind == "mat4":
+            upload = gl_native.glUniformMatrix4fv
+            c_matrix = (ctypes.c_float * 16)()
+
+            def write_mat4(matrix) -> None:
+                if self._active_shader_rid != shader_rid:
+                    self._activate_shader(shader_rid)
+                flat = tuple(matrix)
+                if values.get(loc) != flat:
+                    values[loc] = flat
+                    c_matrix[:] = flat
+                    upload(loc, 1, False, c_matrix)
+
+            return write_mat4
+
+        gl_setter = getattr(gl_native, _UNIFORM_SETTERS[kind])
+
+        def write(*args) -> None:
+            if self._active_shader_rid != shader_rid:
+                self._activate_shader(shader_rid)
+            # Same keys as the shader_set_uniform_* methods use
+            value = args[0] if len(args) == 1 else args
+            if values.get(loc) != value:
+                values[loc] = value
+                gl_setter(loc, *args)
+
+        return write
+
+    # Current fixed-function state, so callers can skip redundant setters
+    @property
+    def blend_mode(self) -> BlendMode | None:
+        return self._state._blend_mode
+
+    @property
+    def depth_test_enabled(self) -> bool:
+        return self._state._depth_test_enabled
+
+    @property
+    def depth_write_enabled(self) -> bool:
+        return self._state._depth_write_enabled
+
+    @property
+    def cull_face(self) -> int:
+        return self._state._cull_face
+
+    # The setters compare first too, saving the call into the state cache
     def set_blend_mode(self, mode: BlendMode) -> None:
-        self._state.set_blend_mode(mode)
+        state = self._state
+        if mode is not state._blend_mode:
+            state.set_blend_mode(mode)
 
     def set_depth_test(self, enabled: bool) -> None:
-        self._state.set_depth_test(enabled)
+        state = self._state
+        if enabled != state._depth_test_enabled:
+            state.set_depth_test(enabled)
 
     def set_depth_write(self, enabled: bool) -> None:
-        self._state.set_depth_write(enabled)
+        state = self._state
+        if enabled != state._depth_write_enabled:
+            state.set_depth_write(enabled)
 
     def set_cull_face(self, mode: int) -> None:
-        self._state.set_cull_face(mode)
+        state = self._state
+        if mode != state._cull_face:
+            state.set_cull_face(mode)
+
+    def set_render_state(
+        self,
+        blend_mode: BlendMode | None = None,
+        depth_test: bool | None = None,
+        depth_write: bool | None = None,
+        cull_face: int | None = None,
+    ) -> None:
+        self._state.apply_state(blend_mode, depth_test, depth_write, cull_face)
 
     def set_scissor(
         self, enabled: bool, x: int = 0, y: int = 0, w: int = 0, h: int = 0
@@ -421,6 +766,7 @@ class GLRenderingDevice(RenderingDevice):
             index_count: int,
             instance_count: int = 1,
             first_index: int = 0,
+            first_instance: int = 0,
     ) -> None:
         """Unified indexed draw call with optional instancing.
 
@@ -434,6 +780,9 @@ class GLRenderingDevice(RenderingDevice):
             index_count: Number of indices to draw from the index buffer
             instance_count: Number of instances to render (default: 1)
             first_index: Starting offset in the index buffer (default: 0)
+            first_instance: Instance the divisor attributes start at
+                (default: 0); GL 3.3 has no base instance, so the VAO's
+                instance attribute pointers are moved instead
 
         Note:
             For instancing (instance_count > 1), the VAO must be configured with
@@ -442,40 +791,35 @@ class GLRenderingDevice(RenderingDevice):
         if GL is None:
             return
 
-        vao_name = self._vaos.get(vao_rid)
-        if vao_name is None:
+        vao = self._vaos.get(vao_rid)
+        if vao is None:
             raise gl_resources.GLResourceError(f"Unknown VAO RID: {vao_rid}")
 
-        meta = self._vao_meta[vao_rid]
-        idx_buf_rid = meta.get("index_buffer")
-
-        if idx_buf_rid is None:
+        if vao.index_buffer is None:
             raise gl_resources.GLResourceError(
                 f"VAO {vao_rid} has no index buffer (use draw_list_draw_array for non-indexed)"
             )
 
-        idx_meta = self._buf_meta.get(idx_buf_rid, {})
-        idx_type = idx_meta.get("index_type", _INDEX_TYPE_U16)
-        gl_idx_type = (
-            GL.GL_UNSIGNED_SHORT if idx_type == _INDEX_TYPE_U16 else GL.GL_UNSIGNED_INT
-        )
-
-        import ctypes
-        bytes_per_index = 2 if idx_type == _INDEX_TYPE_U16 else 4
-        offset = ctypes.c_void_p(first_index * bytes_per_index)
+        gl_idx_type = vao.gl_index_type
+        offset = _void_ptr(first_index * vao.index_size)
 
-        self._state.bind_vao(vao_name)
+        # Checked here so repeated draws of one VAO skip the bind_vao call
+        state = self._state
+        if state._current_vao != vao.gl_name:
+            state.bind_vao(vao.gl_name)
+        if vao.first_instance != first_instance:
+            self._point_instances(vao, first_instance)
 
         if instance_count <= 1:
-            GL.glDrawElements(
-                _resolve_prim(primitive),
+            gl_native.glDrawElements(
+                _PRIM_GL[primitive],
                 index_count,
                 gl_idx_type,
                 offset,
             )
         else:
-            GL.glDrawElementsInstanced(
-                _resolve_prim(primitive),
+            gl_native.glDrawElementsInstanced(
+                _PRIM_GL[primitive],
                 index_count,
                 gl_idx_type,
                 offset,
@@ -489,26 +833,48 @@ class GLRenderingDevice(RenderingDevice):
             vertex_count: int,
             instance_count: int = 1,
             first_vertex: int = 0,
+            first_instance: int = 0,
     ) -> None:
         if GL is None:
             return
 
-        vao_name = self._vaos.get(vao_rid)
-        if vao_name is None:
+        vao = self._vaos.get(vao_rid)
+        if vao is None:
             raise gl_resources.GLResourceError(f"Unknown VAO RID: {vao_rid}")
 
-        self._state.bind_vao(vao_name)
+        state = self._state
+        if state._current_vao != vao.gl_name:
+            state.bind_vao(vao.gl_name)
+        if vao.first_instance != first_instance:
+            self._point_instances(vao, first_instance)
 
         if instance_count <= 1:
-            GL.glDrawArrays(
-                _resolve_prim(primitive),
+            gl_native.glDrawArrays(
+                _PRIM_GL[primitive],
                 first_vertex,
                 vertex_count,
             )
         else:
-            GL.glDrawArraysInstanced(
-                _resolve_prim(primitive),
+            gl_native.glDrawArraysInstanced(
+                _PRIM_GL[primitive],
                 first_vertex,
                 vertex_count,
                 instance_count,
-            )
\ No newline at end of file
+            )
+
+    def _point_instances(self, vao: _VaoData, first_instance: int) -> None:
+        """Re-point the bound VAO's divisor attributes at *first_instance*"""
+        bind_buffer = self._state.bind_buffer
+        for buf_gl, location, size, gl_type, normalized, stride, offset in (
+            vao.instance_attributes
+        ):
+            bind_buffer(GL.GL_ARRAY_BUFFER, buf_gl)
+            gl_native.glVertexAttribPointer(
+                location,
+                size,
+                gl_type,
+                normalized,
+                stride,
+                _void_ptr(offset + first_instance * stride),
+            )
+        vao.first_instance = first_instance
@@ -1,7 +1,9 @@
 from __future__ import annotations
-from typing import Tuple
+import ctypes
+from typing import Any, Optional, Tuple
 from OpenGL import GL
 from OpenGL.GL import shaders as _GL_shaders
+from engine.servers.rendering.backend.gl import gl_native
 from engine.servers.rendering.server_enums import (
     TextureFormat,
     TextureFilter,
@@ -96,7 +98,10 @@ def texture_upload_2d(
     rep: TextureRepeat,
     level: int = 0,
     generate_mipmaps: bool = True,
+    bind: bool = True,
 ) -> None:
+    """Upload *data* into *gl_name*; pass ``bind=False`` when the caller has
+    already bound it to the active unit through its state cache."""
     if GL is None:
         raise GLResourceError("OpenGL not available")
 
@@ -112,7 +117,8 @@ def texture_upload_2d(
     min_f, mag_f = _filter_to_gl(actual_filter)
     wrap = _repeat_to_gl(rep)
 
-    GL.glBindTexture(GL.GL_TEXTURE_2D, gl_name)
+    if bind:
+        GL.glBindTexture(GL.GL_TEXTURE_2D, gl_name)
     GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, min_f)
     GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, mag_f)
     GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_WRAP_S, wrap)
@@ -134,6 +140,41 @@ def texture_upload_2d(
         GL.glGenerateMipmap(GL.GL_TEXTURE_2D)
 
 
+def texture_subimage_2d(
+    gl_name: int,
+    width: int,
+    height: int,
+    data: bytes,
+    fmt: TextureFormat,
+    level: int = 0,
+    generate_mipmaps: bool = True,
+    bind: bool = True,
+) -> None:
+    """Overwrite a level already allocated by texture_upload_2d in place,
+    reusing its storage instead of reallocating it."""
+    if GL is None:
+        raise GLResourceError("OpenGL not available")
+
+    _, src_fmt, src_type = _texture_format_to_gl(fmt)
+
+    if bind:
+        GL.glBindTexture(GL.GL_TEXTURE_2D, gl_name)
+    GL.glTexSubImage2D(
+        GL.GL_TEXTURE_2D,
+        level,
+        0,
+        0,
+        width,
+        height,
+        src_fmt,
+        src_type,
+        data,
+    )
+
+    if generate_mipmaps and level == 0:
+        GL.glGenerateMipmap(GL.GL_TEXTURE_2D)
+
+
 def buffer_gen() -> int:
     if GL is None:
         raise GLResourceError("OpenGL not available")
@@ -146,18 +187,87 @@ def buffer_delete(name: int) -> None:
     GL.glDeleteBuffers(1, [name])
 
 
-def buffer_data(name: int, target: int, data: bytes, usage: int) -> None:
+def buffer_data(
+    name: int, target: int, data: bytes, usage: int, bind: bool = True
+) -> None:
+    """Pass ``bind=False`` when the caller has already bound *name* to
+    *target* through its state cache."""
     if GL is None:
         raise GLResourceError("OpenGL not available")
-    GL.glBindBuffer(target, name)
+    if bind:
+        gl_native.glBindBuffer(target, name)
     GL.glBufferData(target, len(data), data, usage)
 
 
-def buffer_subdata(name: int, target: int, offset: int, data: bytes) -> None:
+def buffer_subdata(
+    name: int, target: int, offset: int, data: bytes, bind: bool = True
+) -> None:
     if GL is None:
         raise GLResourceError("OpenGL not available")
-    GL.glBindBuffer(target, name)
-    GL.glBufferSubData(target, offset, len(data), data)
+    if bind:
+        gl_native.glBindBuffer(target, name)
+    gl_native.glBufferSubData(target, offset, len(data), data)
+
+
+def bind_buffer_base(target: int, index: int, name: int) -> None:
+    """Attach a whole buffer to an indexed binding point of *target*."""
+    if GL is None:
+        raise GLResourceError("OpenGL not available")
+    GL.glBindBufferBase(target, index, name)
+
+
+# Whether the context has ARB_buffer_storage (core in GL 4.4); checked once
+_buffer_storage_supported: Optional[bool] = None
+
+
+def buffer_storage_supported() -> bool:
+    global _buffer_storage_supported
+    if GL is None:
+        return False
+    if _buffer_storage_supported is None:
+        from OpenGL.GL.ARB.buffer_storage import glInitBufferStorageARB
+
+        _buffer_storage_supported = bool(glInitBufferStorageARB())
+    return _buffer_storage_supported
+
+
+def buffer_storage_mapped(
+    name: int, target: int, size: int, bind: bool = True
+) -> int:
+    """Give a buffer immutable storage mapped for writing for its lifetime.
+
+    The mapping is coherent, so writes reach the GPU without a flush; the
+    caller fences any region a draw may still be reading. Returns the
+    mapped address. Requires buffer_storage_supported().
+    """
+    if GL is None:
+        raise GLResourceError("OpenGL not available")
+    flags = GL.GL_MAP_WRITE_BIT | GL.GL_MAP_PERSISTENT_BIT | GL.GL_MAP_COHERENT_BIT
+    if bind:
+        gl_native.glBindBuffer(target, name)
+    GL.glBufferStorage(target, size, None, flags)
+    address = ctypes.cast(GL.glMapBufferRange(target, 0, size, flags), ctypes.c_void_p)
+    if not address.value:
+        raise GLResourceError(f"glMapBufferRange failed for buffer {name}")
+    return address.value
+
+
+def fence_sync() -> Any:
+    """Fence signalled once every command issued so far has completed."""
+    if GL is None:
+        raise GLResourceError("OpenGL not available")
+    return GL.glFenceSync(GL.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+
+
+def fence_wait(fence: Any) -> None:
+    """Block until *fence* is signalled, then delete it."""
+    if GL is None:
+        return
+    while True:
+        status = GL.glClientWaitSync(fence, GL.GL_SYNC_FLUSH_COMMANDS_BIT, 1_000_000)
+        if status != GL.GL_TIMEOUT_EXPIRED:
+            break
+    GL.glDeleteSync(fence)
 
 
 def vao_gen() -> int:
@@ -229,6 +339,20 @@ def shader_get_uniform_location(program: int, name: str) -> int:
     return int(GL.glGetUniformLocation(program, name.encode("ascii")))
 
 
+def shader_bind_uniform_block(program: int, block_name: str, binding: int) -> bool:
+    """Point a program's uniform block at *binding*.
+
+    Returns False if the program has no active block of that name.
+    """
+    if GL is None:
+        raise GLResourceError("OpenGL not available")
+    index = GL.glGetUniformBlockIndex(program, block_name.encode("ascii"))
+    if index == GL.GL_INVALID_INDEX:
+        return False
+    GL.glUniformBlockBinding(program, index, binding)
+    return True
+
+
 def shader_get_attrib_location(program: int, name: str) -> int:
     if GL is None:
         raise GLResourceError("OpenGL not available")
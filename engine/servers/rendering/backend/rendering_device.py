@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from typing import Any, List
+from typing import Any, Callable, List, Optional, Tuple
 
 from engine.servers.rendering.server_enums import (
     TextureFormat,
@@ -65,8 +65,13 @@ class RenderingDevice(ABC):
         pass
 
     @abstractmethod
-    def buffer_create_vertex(self, data: bytes, stride: int) -> Any:
-        """Create a vertex buffer and return an opaque handle."""
+    def buffer_create_vertex(
+        self, data: bytes, stride: int, dynamic: bool = False
+    ) -> Any:
+        """Create a vertex buffer and return an opaque handle.
+
+        *dynamic* hints that the contents are rewritten with buffer_update.
+        """
         pass
 
     @abstractmethod
@@ -76,6 +81,43 @@ class RenderingDevice(ABC):
         """
         pass
 
+    @abstractmethod
+    def buffer_create_uniform(self, size: int) -> Any:
+        """Create a zeroed uniform buffer of *size* bytes, filled with
+        buffer_update and attached with buffer_bind_uniform."""
+        pass
+
+    @abstractmethod
+    def buffer_bind_uniform(self, binding: int, buffer_rid) -> None:
+        """Attach a uniform buffer to uniform block binding point *binding*."""
+        pass
+
+    @abstractmethod
+    def buffer_update(self, buffer_rid, data: bytes, offset: int = 0) -> None:
+        """Overwrite part of a buffer, starting *offset* bytes in."""
+        pass
+
+    def buffer_create_mapped(
+        self, size: int, stride: int
+    ) -> Optional[Tuple[Any, Any]]:
+        """Create a vertex buffer of *size* bytes that stays mapped for
+        writing, returned as (handle, float32 array over the mapping).
+
+        Writes land directly in GPU-visible memory, so the caller must fence
+        regions a draw may still read, and drop the array once the buffer is
+        freed. Returns None where the back-end has no persistent mapping;
+        callers then fall back to buffer_update.
+        """
+        return None
+
+    def fence_insert(self) -> Any:
+        """Fence signalled once the commands issued so far have completed."""
+        return None
+
+    def fence_wait(self, fence) -> None:
+        """Block until *fence* from fence_insert is signalled, and release it."""
+        pass
+
     @abstractmethod
     def buffer_free(self, buffer_rid) -> None:
         """Destroy a GPU buffer."""
@@ -98,6 +140,14 @@ class RenderingDevice(ABC):
         """Destroy a shader program."""
         pass
 
+    @abstractmethod
+    def shader_bind_uniform_block(
+        self, shader_rid, block_name: str, binding: int
+    ) -> None:
+        """Read the shader's uniform block *block_name* from binding point
+        *binding*. Shaders without that block are left alone."""
+        pass
+
     @abstractmethod
     def shader_bind(self, shader_rid) -> None:
         """Bind the shader program identified by *shader_rid* as the active program."""
@@ -143,6 +193,18 @@ class RenderingDevice(ABC):
         """Bind a texture-unit index to a sampler uniform on the shader."""
         pass
 
+    def get_uniform_writer(
+        self, shader_rid, name: str, kind: str
+    ) -> Callable[..., None]:
+        """Return a callable that sets one uniform, taking the values the
+        matching ``shader_set_uniform_<kind>`` takes after *name*.
+
+        Callers that set the same uniform every frame keep the writer, so
+        back-ends can resolve the location and entry point only once.
+        """
+        setter = getattr(self, f"shader_set_uniform_{kind}")
+        return lambda *values: setter(shader_rid, name, *values)
+
     @abstractmethod
     def set_blend_mode(self, mode: BlendMode) -> None:
         pass
@@ -160,6 +222,24 @@ class RenderingDevice(ABC):
         """0 = off, 1 = back, 2 = front."""
         pass
 
+    def set_render_state(
+        self,
+        blend_mode: Optional[BlendMode] = None,
+        depth_test: Optional[bool] = None,
+        depth_write: Optional[bool] = None,
+        cull_face: Optional[int] = None,
+    ) -> None:
+        """Set a pass's fixed-function state in one call; ``None`` leaves a
+        state untouched. Back-ends may override to skip unchanged states."""
+        if blend_mode is not None:
+            self.set_blend_mode(blend_mode)
+        if depth_test is not None:
+            self.set_depth_test(depth_test)
+        if depth_write is not None:
+            self.set_depth_write(depth_write)
+        if cull_face is not None:
+            self.set_cull_face(cull_face)
+
     @abstractmethod
     def set_scissor(
         self,
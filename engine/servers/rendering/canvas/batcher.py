@@ -0,0 +1,114 @@
+from __future__ import annotations
+from typing import Any, List
+
+import numpy as np
+
+from engine.servers.rendering.canvas.commands import (
+    CanvasDrawType,
+    CanvasRenderCommand,
+)
+
+# Floats per instance row:
+#   0..3   rect x, y, w, h in item space
+#   4..7   uv rect u0, v0, u1, v1 (flips already applied)
+#   8..11  color r, g, b, a (item modulate * command color)
+#   12..17 item transform x.x, x.y, y.x, y.y, origin.x, origin.y
+INSTANCE_FLOATS = 18
+INSTANCE_STRIDE = INSTANCE_FLOATS * 4
+
+# Instances drawn by one call
+MAX_BATCH = 1024
+
+_FULL_UV = (0.0, 0.0, 1.0, 1.0)
+
+
+class CanvasBatch:
+    """A run of instance rows drawn with one texture (None for plain rects)"""
+
+    __slots__ = ("texture_rid", "start", "count")
+
+    def __init__(self, texture_rid: Any, start: int):
+        self.texture_rid = texture_rid
+        self.start = start
+        self.count = 0
+
+
+class CanvasBatcher:
+    """
+    Packs a sorted canvas render list into instance rows, one per rect,
+    and groups consecutive rows that share a texture into batches.
+
+    The canvas pass draws with a single shader and blend mode, so the
+    texture is the only thing that breaks a batch. Rows live in one array
+    reused from frame to frame and grown when a frame needs more.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.instances = np.empty((capacity, INSTANCE_FLOATS), dtype=np.float32)
+        self.batches: List[CanvasBatch] = []
+
+    def build(self, render_list: List[CanvasRenderCommand]) -> List[CanvasBatch]:
+        batches = self.batches
+        batches.clear()
+
+        if len(render_list) > len(self.instances):
+            self.instances = np.empty(
+                (len(render_list), INSTANCE_FLOATS), dtype=np.float32
+            )
+        instances = self.instances
+
+        batch = None
+        row = 0
+        for _z_index, transform, cmd, modulate in render_list:
+            draw_type = cmd.draw_type
+            if draw_type == CanvasDrawType.DRAW_RECT:
+                texture_rid = None
+                rect = (cmd.x, cmd.y, cmd.w, cmd.h)
+                uv = _FULL_UV
+                color = cmd.color
+            elif draw_type == CanvasDrawType.DRAW_TEXTURE_RECT:
+                texture_rid = cmd.texture_rid
+                rect = (cmd.dst_x, cmd.dst_y, cmd.dst_w, cmd.dst_h)
+                uv = _resolve_uvs(cmd)
+                color = cmd.modulate
+            else:
+                continue
+
+            if (
+                batch is None
+                or batch.texture_rid != texture_rid
+                or batch.count == MAX_BATCH
+            ):
+                batch = CanvasBatch(texture_rid, row)
+                batches.append(batch)
+
+            out = instances[row]
+            out[0:4] = rect
+            out[4:8] = uv
+            out[8:12] = modulate.data * color.data
+            out[12:14] = transform.x.data
+            out[14:16] = transform.y.data
+            out[16:18] = transform.origin.data
+
+            batch.count += 1
+            row += 1
+
+        return batches
+
+
+def _resolve_uvs(cmd) -> tuple:
+    """
+    UV rect of a DrawTextureRect. The source rect is given in UV units;
+    without one the whole texture is used.
+    """
+    if cmd.src_x is None:
+        u0, v0, u1, v1 = _FULL_UV
+    else:
+        u0, v0 = cmd.src_x, cmd.src_y
+        u1, v1 = u0 + cmd.src_w, v0 + cmd.src_h
+
+    if cmd.flip_x:
+        u0, u1 = u1, u0
+    if cmd.flip_y:
+        v0, v1 = v1, v0
+    return u0, v0, u1, v1
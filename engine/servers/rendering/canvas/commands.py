@@ -8,12 +8,9 @@ from engine.math.datatypes import Color, Transform2D
 from engine.servers.rendering.server_enums import PrimitiveType
 
 
-@dataclass(slots=True)
-class CanvasRenderCommand:
-    transform: Transform2D
-    draw_command: CanvasCommand
-    z_index: int
-    modulate_rgba: Color
+# One entry of CanvasServer.build_render_list:
+# (z_index, global transform, draw command, modulate)
+CanvasRenderCommand = Tuple[int, Transform2D, "CanvasCommand", Color]
 
 
 class CanvasDrawType(IntEnum):
@@ -6,7 +6,7 @@ from engine.math.datatypes import Transform2D, Color
 from engine.servers.rendering.canvas.commands import CanvasCommand
 
 
-@dataclass
+@dataclass(slots=True)
 class CanvasItemData:
     rid: RID
 
@@ -23,5 +23,7 @@ class CanvasItemData:
     z_as_relative: bool = True
 
     modulate_rgba: Color = Color(1, 1, 1, 1)
+    # Applies to the item's own commands only, not its children
+    self_modulate_rgba: Color = Color(1, 1, 1, 1)
 
     commands: list[CanvasCommand] = field(default_factory=list)
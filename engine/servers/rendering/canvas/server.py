@@ -1,8 +1,8 @@
 from __future__ import annotations
+from operator import itemgetter
 from typing import Any, TYPE_CHECKING
 from engine.core.rid import RID
 from engine.math.datatypes import Transform2D, Color
-from engine.math.datatypes.transform_3d import Transform3D
 from engine.servers.rendering.canvas.storage import CanvasStorage
 from engine.servers.rendering.canvas.commands import (
     DrawRect,
@@ -82,11 +82,11 @@ class CanvasServer:
                 canvas.item_rids.remove(item.rid)
         item.canvas_rid = None
 
-    def canvas_item_set_transform(self, item_rid: Any, transform: Transform3D) -> None:
+    def canvas_item_set_transform(self, item_rid: Any, transform: Transform2D) -> None:
         item = self._canvas_storage.canvas_item_get(item_rid)
         if item is None:
             return
-        item.transform = transform
+        item.local_transform = transform
         self._render_state.mark_canvas_dirty()
 
     def canvas_item_set_visible(self, item_rid: Any, visible: bool) -> None:
@@ -116,8 +116,7 @@ class CanvasServer:
         item = self._canvas_storage.canvas_item_get(item_rid)
         if item is None:
             return
-        item.modulate_r, item.modulate_g = r, g
-        item.modulate_b, item.modulate_a = b, a
+        item.modulate_rgba = Color(r, g, b, a)
         self._render_state.mark_canvas_dirty()
 
     def canvas_item_set_self_modulate(
@@ -126,16 +125,14 @@ class CanvasServer:
         item = self._canvas_storage.canvas_item_get(item_rid)
         if item is None:
             return
-        item.self_modulate_r, item.self_modulate_g = r, g
-        item.self_modulate_b, item.self_modulate_a = b, a
+        item.self_modulate_rgba = Color(r, g, b, a)
         self._render_state.mark_canvas_dirty()
 
     def canvas_item_set_update(self, item_rid: Any, update: bool) -> None:
-        item = self._canvas_storage.canvas_item_get(item_rid)
-        if item is None:
-            return
-        item.update_requested = update
-        self._render_state.mark_canvas_dirty()
+        # The render list is rebuilt from the items, so an update request
+        # only has to mark the canvas dirty
+        if update and self._canvas_storage.canvas_item_get(item_rid) is not None:
+            self._render_state.mark_canvas_dirty()
 
     def canvas_item_add_rect(
         self,
@@ -224,57 +221,50 @@ class CanvasServer:
         self._render_state.mark_canvas_dirty()
 
     def build_render_list(self, canvas_rid: RID) -> list[CanvasRenderCommand]:
+        """
+        Flatten the canvas tree into ``(z_index, transform, command, modulate)``
+        tuples, sorted by z_index and otherwise in tree order.
+        """
         canvas = self._canvas_storage.canvas_get(canvas_rid)
         if canvas is None:
             return []
 
         out: list[CanvasRenderCommand] = []
-
-        for root_item in canvas.item_rids:
-            self._collect_item(
-                item_rid=root_item,
-                parent_transform=Transform2D(),
-                parent_z=0,
-                parent_modulate=Color.white(),
-                out=out,
-            )
-        out.sort(key=lambda c: c.z_index)
+        append = out.append
+        items_get = self._canvas_storage._items.get
+
+        root_transform = Transform2D()
+        root_modulate = Color.white()
+        # Iterative pre-order walk; children are pushed reversed so they pop
+        # in their draw order
+        stack = [
+            (item_rid, root_transform, 0, root_modulate)
+            for item_rid in reversed(canvas.item_rids)
+        ]
+        pop = stack.pop
+        push = stack.append
+
+        while stack:
+            item_rid, parent_transform, parent_z, parent_modulate = pop()
+            item = items_get(item_rid)
+            if item is None or not item.visible:
+                continue
+
+            global_transform = parent_transform * item.local_transform
+            item.global_transform = global_transform
+
+            final_z = parent_z + item.z_index if item.z_as_relative else item.z_index
+            final_modulate = parent_modulate * item.modulate_rgba
+
+            commands = item.commands
+            if commands:
+                self_modulate = final_modulate * item.self_modulate_rgba
+                for cmd in commands:
+                    append((final_z, global_transform, cmd, self_modulate))
+
+            children = item.children
+            for index in range(len(children) - 1, -1, -1):
+                push((children[index], global_transform, final_z, final_modulate))
+
+        out.sort(key=itemgetter(0))
         return out
-
-    def _collect_item(
-        self,
-        item_rid: RID,
-        parent_transform: Transform2D,
-        parent_z: int,
-        parent_modulate: Color,
-        out: list[CanvasRenderCommand],
-    ):
-        item = self._canvas_storage.canvas_item_get(item_rid)
-        if item is None or not item.visible:
-            return
-
-        global_transform = parent_transform * item.local_transform
-        item.global_transform = global_transform
-
-        final_z = parent_z + item.z_index if item.z_as_relative else item.z_index
-
-        final_modulate = parent_modulate * item.modulate_rgba
-
-        for cmd in item.commands:
-            out.append(
-                CanvasRenderCommand(
-                    transform=global_transform,
-                    draw_command=cmd,
-                    z_index=final_z,
-                    modulate_rgba=final_modulate,
-                )
-            )
-
-        for child in item.children:
-            self._collect_item(
-                item_rid=child,
-                parent_transform=global_transform,
-                parent_z=final_z,
-                parent_modulate=final_modulate,
-                out=out,
-            )
@@ -1,149 +1,314 @@
 from __future__ import annotations
+import struct
 from typing import TYPE_CHECKING
-from engine.math.datatypes import Transform2D, Color
-from engine.servers.rendering.canvas.commands import (
-    CanvasDrawType,
-    DrawRect,
-    CanvasRenderCommand,
-    DrawTextureRect,
+
+from engine.math.datatypes import Transform2D
+import numpy as np
+
+from engine.servers.rendering.canvas.batcher import (
+    CanvasBatch,
+    CanvasBatcher,
+    INSTANCE_FLOATS,
+    INSTANCE_STRIDE,
+    MAX_BATCH,
 )
+from engine.servers.rendering.canvas.commands import CanvasRenderCommand
 from engine.servers.rendering.server_enums import PrimitiveType, BlendMode
 
 if TYPE_CHECKING:
     from engine.servers.rendering.backend.rendering_device import RenderingDevice
 
 
+_CANVAS_VERTEX_SHADER = """#version 330 core
+layout(location = 0) in vec2 a_vertex;
+layout(location = 1) in vec4 a_rect;
+layout(location = 2) in vec4 a_uv_rect;
+layout(location = 3) in vec4 a_color;
+layout(location = 4) in vec4 a_basis;
+layout(location = 5) in vec2 a_origin;
+
+layout(std140) uniform CanvasData {
+    mat4 u_screen_transform;
+};
+
+out vec2 v_uv;
+out vec4 v_color;
+
+void main() {
+    vec2 local_pos = a_rect.xy + a_vertex * a_rect.zw;
+    vec2 canvas_pos = a_basis.xy * local_pos.x + a_basis.zw * local_pos.y + a_origin;
+    v_uv = mix(a_uv_rect.xy, a_uv_rect.zw, a_vertex);
+    v_color = a_color;
+    gl_Position = u_screen_transform * vec4(canvas_pos, 0.0, 1.0);
+}
+"""
+
+_CANVAS_FRAGMENT_SHADER = """#version 330 core
+in vec2 v_uv;
+in vec4 v_color;
+
+uniform sampler2D u_texture;
+uniform int u_use_texture;
+
+out vec4 frag_color;
+
+void main() {
+    vec4 color = v_color;
+    if (u_use_texture != 0) {
+        color *= texture(u_texture, v_uv);
+    }
+    frag_color = color;
+}
+"""
+
+# Uniform block binding point of CanvasData; SceneData holds binding 0
+CANVAS_DATA_BINDING = 1
+
+# Unit quad the instances stretch over their rect, and its two triangles
+_QUAD_VERTICES = struct.pack("8f", 0.0, 0.0, 1.0, 0.0, 1.0, 1.0, 0.0, 1.0)
+_QUAD_INDICES = struct.pack("6H", 0, 1, 2, 0, 2, 3)
+
+# Regions of the mapped instance stream. Each frame writes the rows of all
+# its canvas layers to the next one, first waiting out the fence of the
+# frame that last read it
+_STREAM_REGIONS = 3
+
+# Rows a region holds at first; the stream is rebuilt larger for a frame
+# with more rows than that
+_FRAME_ROWS = 4 * MAX_BATCH
+
+# (location, float count, byte offset) of each per-instance attribute
+_INSTANCE_ATTRIBUTES = (
+    (1, 4, 0),
+    (2, 4, 16),
+    (3, 4, 32),
+    (4, 4, 48),
+    (5, 2, 64),
+)
+
+
 class CanvasRenderer:
     """
     Converts canvas render lists into RenderingDevice draw calls.
+
+    Every rect is an instance of one unit quad; a CanvasBatcher groups the
+    render list into runs that share a texture, and each run is a single
+    instanced draw.
+
+    render() is called once per canvas layer, between begin_frame() and
+    end_frame(). Each layer's rows follow the previous layer's in the
+    frame's stream region.
     """
 
     def __init__(self, device: RenderingDevice):
         self._device = device
+        self._batcher = CanvasBatcher()
+
         self._shader = None
+        self._write_use_texture = None
+        self._quad_vertex_buffer = None
+        self._quad_index_buffer = None
+        self._instance_buffer = None
+        # Mapped float32 view of the instance buffer, None when the device
+        # cannot map persistently and batches go through buffer_update
+        self._instance_memory = None
+        self._canvas_data_buffer = None
 
-    def render(
-        self,
-        render_list: list[CanvasRenderCommand],
-        viewport_transform: Transform2D,
-    ) -> None:
-        self._ensure_shader()
+        # One VAO per stream region, its instance attributes offset into it;
+        # batches pick out their rows with first_instance
+        self._stream_rows = 0
+        self._vaos: list = []
+        self._fences: list = []
+        self._region = 0
+        # Rows already written to the current region this frame
+        self._frame_rows = 0
 
-        self._device.set_depth_test(False)
-        self._device.set_depth_write(False)
-        self._device.set_blend_mode(BlendMode.BLEND_MODE_NORMAL)
+    def _ensure_resources(self) -> None:
+        if self._shader is not None:
+            return
 
-        self._device.shader_set_uniform_mat3(
-            self._shader,
-            "u_screen_transform",
-            viewport_transform.to_mat3(),
+        device = self._device
+        self._shader = device.shader_create(
+            _CANVAS_VERTEX_SHADER, _CANVAS_FRAGMENT_SHADER
         )
+        self._quad_vertex_buffer = device.buffer_create_vertex(_QUAD_VERTICES, 8)
+        self._quad_index_buffer = device.buffer_create_index(_QUAD_INDICES, 0)
+
+        self._canvas_data_buffer = device.buffer_create_uniform(64)
+        device.shader_bind_uniform_block(
+            self._shader, "CanvasData", CANVAS_DATA_BINDING
+        )
+        device.shader_set_uniform_texture(self._shader, "u_texture", 0)
+        self._write_use_texture = device.get_uniform_writer(
+            self._shader, "u_use_texture", "int"
+        )
+
+    def _ensure_stream(self, rows: int) -> None:
+        """Create the instance stream, or rebuild it so a region fits *rows*"""
+        if rows <= self._stream_rows:
+            return
 
-        for entry in render_list:
-            self._device.shader_set_uniform_mat3(
-                self._shader,
-                "u_canvas_transform",
-                entry.transform.to_mat3(),
+        device = self._device
+        stream_rows = max(self._stream_rows, _FRAME_ROWS)
+        while stream_rows < rows:
+            stream_rows *= 2
+
+        if self._instance_buffer is not None:
+            for fence in self._fences:
+                if fence is not None:
+                    device.fence_wait(fence)
+            for vao in self._vaos:
+                device.vao_free(vao)
+            self._instance_memory = None
+            device.buffer_free(self._instance_buffer)
+
+        region_bytes = stream_rows * INSTANCE_STRIDE
+        mapped = device.buffer_create_mapped(
+            _STREAM_REGIONS * region_bytes, INSTANCE_STRIDE
+        )
+        if mapped is None:
+            self._instance_buffer = device.buffer_create_vertex(
+                bytes(region_bytes), INSTANCE_STRIDE, dynamic=True
             )
+            regions = 1
+        else:
+            self._instance_buffer, self._instance_memory = mapped
+            regions = _STREAM_REGIONS
 
-            self._execute_command(entry)
+        self._vaos = [
+            device.vao_create(self._quad_index_buffer, self._layout(r * region_bytes))
+            for r in range(regions)
+        ]
+        self._fences = [None] * regions
+        self._region = 0
+        self._frame_rows = 0
+        self._stream_rows = stream_rows
 
-    def _execute_command(self, entry: CanvasRenderCommand):
-        cmd = entry.draw_command
-        modulate = entry.modulate_rgba
+    def _layout(self, instance_offset: int) -> list:
+        layout = [
+            {
+                "buffer_rid": self._quad_vertex_buffer,
+                "location": 0,
+                "size": 2,
+                "offset": 0,
+                "stride": 8,
+            }
+        ]
+        for location, size, offset in _INSTANCE_ATTRIBUTES:
+            layout.append(
+                {
+                    "buffer_rid": self._instance_buffer,
+                    "location": location,
+                    "size": size,
+                    "offset": instance_offset + offset,
+                    "stride": INSTANCE_STRIDE,
+                    "divisor": 1,
+                }
+            )
+        return layout
 
-        if cmd.draw_type == CanvasDrawType.DRAW_RECT:
-            self._draw_rect(cmd, modulate)
+    def begin_frame(self) -> None:
+        self._frame_rows = 0
 
-        elif cmd.draw_type == CanvasDrawType.DRAW_TEXTURE_RECT:
-            self._draw_texture_rect(cmd, modulate)
+    def end_frame(self) -> None:
+        """Fence the frame's region and move on to the next one"""
+        if self._frame_rows == 0:
+            return
+        region = self._region
+        if self._instance_memory is not None:
+            self._fences[region] = self._device.fence_insert()
+        self._region = (region + 1) % len(self._vaos)
+        self._frame_rows = 0
 
-    @staticmethod
-    def _expand_color(color: Color) -> list[float]:
-        r, g, b, a = color
-        return [r, g, b, a] * 4
+    def render(
+        self,
+        render_list: list[CanvasRenderCommand],
+        viewport_transform: Transform2D,
+        viewport_size: tuple[int, int],
+    ) -> None:
+        self._ensure_resources()
 
-    def _draw_rect(self, cmd: DrawRect, item_modulate: Color):
-        vertices, indices = self._build_quad(cmd.x, cmd.y, cmd.w, cmd.h)
+        batches = self._batcher.build(render_list)
+        if not batches:
+            return
 
-        final_color = item_modulate * cmd.color
-        colors = self._expand_color(final_color)
+        self._device.set_render_state(
+            blend_mode=BlendMode.BLEND_MODE_NORMAL,
+            depth_test=False,
+            depth_write=False,
+        )
 
-        self._render_immediate_colored_2d(
-            vertices,
-            colors,
-            indices,
-            PrimitiveType.PRIMITIVE_TYPE_TRIANGLES,
+        screen_matrix = self._screen_matrix(viewport_transform, viewport_size)
+        self._device.buffer_update(
+            self._canvas_data_buffer, struct.pack("16f", *screen_matrix)
+        )
+        self._device.buffer_bind_uniform(
+            CANVAS_DATA_BINDING, self._canvas_data_buffer
         )
 
-    def _draw_texture_rect(self, cmd: DrawTextureRect, item_modulate: Color):
-        vertices, indices = self._build_quad(cmd.dst_x, cmd.dst_y, cmd.dst_w, cmd.dst_h)
+        last = batches[-1]
+        rows = self._batcher.instances[: last.start + last.count]
+        # Rebuilding the stream starts the frame over in a fresh region
+        self._ensure_stream(self._frame_rows + len(rows))
 
-        final_color = item_modulate * cmd.modulate
-        colors = self._expand_color(final_color)
+        first_row = self._frame_rows
+        self._write_instances(first_row, rows)
+        self._frame_rows = first_row + len(rows)
 
-        uvs = self._resolve_uvs(cmd)
+        vao = self._vaos[self._region]
+        for batch in batches:
+            self._draw_batch(vao, batch, first_row)
 
-        self._render_textured_2d(
-            vertices,
-            uvs,
-            colors,
-            indices,
-            cmd.texture_rid,
-        )
+    def _write_instances(self, first_row: int, rows: np.ndarray) -> None:
+        device = self._device
+        memory = self._instance_memory
+        if memory is None:
+            device.buffer_update(
+                self._instance_buffer, rows.tobytes(), first_row * INSTANCE_STRIDE
+            )
+            return
 
-    @staticmethod
-    def _build_quad(x, y, w, h):
-        return [
-            x,
-            y,
-            x + w,
-            y,
-            x + w,
-            y + h,
-            x,
-            y + h,
-        ], [0, 1, 2, 0, 2, 3]
-
-    def _render_immediate_colored_2d(
-        self,
-        vertices: list[float],
-        colors: list[float],
-        indices: list[int],
-        primitive: PrimitiveType,
-    ) -> None:
-        vertex_buffer = self._device.buffer_create_vertex(
-            self._interleave_2d_color(vertices, colors),
-            stride=24,
-        )
+        region = self._region
+        fence = self._fences[region]
+        if fence is not None:
+            device.fence_wait(fence)
+            self._fences[region] = None
+        start = (region * self._stream_rows + first_row) * INSTANCE_FLOATS
+        memory[start : start + rows.size] = rows.ravel()
 
-        index_buffer = self._device.buffer_create_index(
-            bytes(indices),
-            index_type=4,
-        )
+    def _draw_batch(self, vao, batch: CanvasBatch, first_row: int) -> None:
+        device = self._device
+        if batch.texture_rid is None:
+            self._write_use_texture(0)
+        else:
+            self._write_use_texture(1)
+            device.texture_bind(0, batch.texture_rid)
 
-        vao = self._device.vao_create(
-            index_buffer=index_buffer,
-            layout=[
-                {
-                    "buffer_rid": vertex_buffer,
-                    "location": 0,
-                    "size": 2,
-                    "offset": 0,
-                    "stride": 24,
-                },
-                {
-                    "buffer_rid": vertex_buffer,
-                    "location": 1,
-                    "size": 4,
-                    "offset": 8,
-                    "stride": 24,
-                },
-            ],
+        device.draw_list_draw(
+            vao,
+            PrimitiveType.PRIMITIVE_TYPE_TRIANGLES,
+            6,
+            instance_count=batch.count,
+            first_instance=first_row + batch.start,
         )
 
-        self._device.draw_indexed(vao, primitive, len(indices))
-
-        self._device.vao_free(vao)
-        self._device.buffer_free(vertex_buffer)
-        self._device.buffer_free(index_buffer)
+    @staticmethod
+    def _screen_matrix(
+        viewport_transform: Transform2D, viewport_size: tuple[int, int]
+    ) -> list[float]:
+        """
+        Column-major mat4 taking canvas pixels (origin top-left, y down)
+        through *viewport_transform* into clip space.
+        """
+        width, height = viewport_size
+        sx = 2.0 / max(width, 1)
+        sy = -2.0 / max(height, 1)
+        xx, xy = viewport_transform.x.data.tolist()
+        yx, yy = viewport_transform.y.data.tolist()
+        ox, oy = viewport_transform.origin.data.tolist()
+        return [
+            sx * xx, sy * xy, 0.0, 0.0,
+            sx * yx, sy * yy, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            sx * ox - 1.0, sy * oy + 1.0, 0.0, 1.0,
+        ]
@@ -22,18 +22,23 @@ class Renderer:
         self._canvas_server = canvas_server
         self._viewport_server = viewport_server
 
+        # Kept across frames: its canvas renderer streams instances through
+        # a ring of GPU regions
+        self._viewport_renderer = ViewportRenderer(
+            device=device,
+            render_state=render_state,
+            scene_server=scene_server,
+            canvas_server=canvas_server,
+            viewport_server=viewport_server,
+            renderer_storage=renderer_storage,
+        )
+
     def render(self) -> None:
         if self._viewport_server is None:
             return
 
-        viewport_renderer = ViewportRenderer(
-            device=self._device,
-            render_state=self._render_state,
-            scene_server=self._scene_server,
-            canvas_server=self._canvas_server,
-            viewport_server=self._viewport_server,
-            renderer_storage=self._renderer_storage,
-        )
-
+        viewport_renderer = self._viewport_renderer
+        viewport_renderer.begin_frame()
         for viewport_data in self._viewport_server.get_render_data():
             viewport_renderer.render_viewport(viewport_data)
+        viewport_renderer.end_frame()
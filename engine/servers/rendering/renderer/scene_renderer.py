@@ -1,9 +1,20 @@
 from __future__ import annotations
+import numpy as np
 from engine.logger import Logger
 from engine.servers.rendering.scene.render_data import RenderData
 from engine.servers.rendering.server_enums import PrimitiveType
+from engine.servers.rendering.shader_compiler import MAX_LIGHTS, SCENE_DATA_BINDING
 from engine.servers.rendering.storage.renderer_storage import RendererStorage
 
+# Float offsets of the SceneData block members, in std140 layout
+_VIEW = 0
+_PROJECTION = 16
+_CAMERA_POSITION = 32
+_LIGHT_COUNT = 35
+_LIGHTS = 36
+_LIGHT_FLOATS = 16
+_SCENE_DATA_FLOATS = _LIGHTS + MAX_LIGHTS * _LIGHT_FLOATS
+
 
 class SceneRenderer:
 
@@ -12,6 +23,13 @@ class SceneRenderer:
         self._render_state = render_state
         self._storage: RendererStorage = renderer_storage
 
+        # Host copy of the SceneData uniform block, uploaded once per frame
+        self._scene_data = np.zeros(_SCENE_DATA_FLOATS, dtype=np.float32)
+        self._scene_data_buffer = None
+
+        # u_model writer per pipeline shader, set once for every drawn surface
+        self._model_writers: dict = {}
+
     def render(self, render_data: RenderData) -> None:
         if not render_data.items:
             Logger.debug(
@@ -22,20 +40,75 @@ class SceneRenderer:
 
         self._render_state.begin_scene()
 
-        self._device.set_depth_test(True)
-        self._device.set_depth_write(True)
-        self._device.set_cull_face(1)
+        self._device.set_render_state(depth_test=True, depth_write=True, cull_face=1)
 
         self._render_state.current_lights = render_data.lights
+        self._upload_scene_data(render_data.lights or [])
 
         for item in render_data.mesh_items:
-            self._draw_item(item, render_data.lights)
+            self._draw_item(item)
 
         for item in render_data.multimesh_items:
             self._draw_multimesh(item)
 
         self._render_state.end_scene()
 
+    def _upload_scene_data(self, lights) -> None:
+        """
+        Fill the SceneData block shared by all material shaders: camera
+        matrices and position, and the lights.
+        """
+        if self._scene_data_buffer is None:
+            self._scene_data_buffer = self._device.buffer_create_uniform(
+                self._scene_data.nbytes
+            )
+
+        data = self._scene_data
+        data.fill(0.0)
+
+        view = self._render_state.view_matrix
+        if view is not None:
+            data[_VIEW : _VIEW + 16] = view.to_opengl_matrix()
+
+        proj = self._render_state.projection_matrix
+        if proj is not None:
+            data[_PROJECTION : _PROJECTION + 16] = proj.to_opengl_matrix()
+
+        camera_pos = self._render_state.camera_position
+        if camera_pos is not None:
+            data[_CAMERA_POSITION : _CAMERA_POSITION + 3] = (
+                camera_pos.x,
+                camera_pos.y,
+                camera_pos.z,
+            )
+
+        light_count = min(len(lights), MAX_LIGHTS)
+        data.view(np.int32)[_LIGHT_COUNT] = light_count
+
+        for i in range(light_count):
+            light = lights[i]
+            pos = light.transform.origin
+            direction = -light.transform.basis.z
+
+            # Light is position, direction and color, each padded to a vec4,
+            # with energy riding in color's padding
+            base = _LIGHTS + i * _LIGHT_FLOATS
+            data[base : base + 3] = (pos.x, pos.y, pos.z)
+            data[base + 4 : base + 7] = (direction.x, direction.y, direction.z)
+            data[base + 8 : base + 16] = (
+                light.color.r,
+                light.color.g,
+                light.color.b,
+                light.energy,
+                light.range,
+                light.spot_angle_inner,
+                light.spot_angle_outer,
+                light.spot_attenuation,
+            )
+
+        self._device.buffer_update(self._scene_data_buffer, data.tobytes())
+        self._device.buffer_bind_uniform(SCENE_DATA_BINDING, self._scene_data_buffer)
+
     def _draw_multimesh(self, item):
         """Render a MultiMesh using GPU instancing.
 
@@ -82,65 +155,6 @@ class SceneRenderer:
         if self._render_state.bind_pipeline(pipeline):
             self._device.shader_bind(pipeline)
 
-        view = self._render_state.view_matrix
-        proj = self._render_state.projection_matrix
-
-        self._device.shader_set_uniform_mat4(
-            pipeline, "u_view", view.to_opengl_matrix()
-        )
-        self._device.shader_set_uniform_mat4(
-            pipeline, "u_projection", proj.to_opengl_matrix()
-        )
-
-        lights = self._render_state.current_lights or []
-        light_count = min(len(lights), 8)
-        self._device.shader_set_uniform_int(
-            pipeline,
-            "u_light_count",
-            light_count,
-        )
-
-        for i in range(light_count):
-            light = lights[i]
-            pos = light.transform.origin
-            direction = -light.transform.basis.z
-            prefix = f"u_lights[{i}]"
-
-            self._device.shader_set_uniform_vec3(
-                pipeline, f"{prefix}.position", pos.x, pos.y, pos.z
-            )
-            self._device.shader_set_uniform_vec3(
-                pipeline, f"{prefix}.direction", direction.x, direction.y, direction.z
-            )
-            self._device.shader_set_uniform_vec3(
-                pipeline, f"{prefix}.color", light.color.r, light.color.g, light.color.b
-            )
-            self._device.shader_set_uniform_float(
-                pipeline, f"{prefix}.energy", light.energy
-            )
-            self._device.shader_set_uniform_float(
-                pipeline, f"{prefix}.range", light.range
-            )
-            self._device.shader_set_uniform_float(
-                pipeline, f"{prefix}.spot_angle_inner", light.spot_angle_inner
-            )
-            self._device.shader_set_uniform_float(
-                pipeline, f"{prefix}.spot_angle_outer", light.spot_angle_outer
-            )
-            self._device.shader_set_uniform_float(
-                pipeline, f"{prefix}.spot_attenuation", light.spot_attenuation
-            )
-
-        camera_pos = self._render_state.camera_position
-        if camera_pos is not None:
-            self._device.shader_set_uniform_vec3(
-                pipeline,
-                "u_camera_position",
-                camera_pos.x,
-                camera_pos.y,
-                camera_pos.z,
-            )
-
         storage.bind_material(material_rid, self._device)
 
         vao_rid = storage.resolve_multimesh_vao(item.multimesh_rid, material_rid)
@@ -166,7 +180,7 @@ class SceneRenderer:
                 instance_count=mm.instance_count,
             )
 
-    def _draw_item(self, item, lights) -> None:
+    def _draw_item(self, item) -> None:
         """
         Draw a mesh instance. Loops through all surfaces and draws each with its material.
         """
@@ -186,9 +200,9 @@ class SceneRenderer:
             return
 
         for surface_index in range(len(mesh.surfaces)):
-            self._draw_surface(item, surface_index, lights)
+            self._draw_surface(item, surface_index)
 
-    def _draw_surface(self, item, surface_index: int, lights) -> None:
+    def _draw_surface(self, item, surface_index: int) -> None:
         """
         Draw a single surface of a mesh.
         """
@@ -216,106 +230,11 @@ class SceneRenderer:
         if self._render_state.bind_pipeline(pipeline):
             self._device.shader_bind(pipeline)
 
-        view = self._render_state.view_matrix
-        if view is not None:
-            self._device.shader_set_uniform_mat4(
-                pipeline,
-                "u_view",
-                view.to_opengl_matrix(),
-            )
-
-        proj = self._render_state.projection_matrix
-        if proj is not None:
-            self._device.shader_set_uniform_mat4(
-                pipeline,
-                "u_projection",
-                proj.to_opengl_matrix(),
-            )
-
-        self._device.shader_set_uniform_mat4(
-            pipeline,
-            "u_model",
-            item.transform.to_opengl_matrix(),
-        )
-
-        light_count = min(len(lights), 8)
-        self._device.shader_set_uniform_int(
-            pipeline,
-            "u_light_count",
-            light_count,
-        )
-
-        for i in range(light_count):
-            light = lights[i]
-
-            pos = light.transform.origin
-            direction = -light.transform.basis.z
-
-            prefix = f"u_lights[{i}]"
-
-            self._device.shader_set_uniform_vec3(
-                pipeline,
-                f"{prefix}.position",
-                pos.x,
-                pos.y,
-                pos.z,
-            )
-
-            self._device.shader_set_uniform_vec3(
-                pipeline,
-                f"{prefix}.direction",
-                direction.x,
-                direction.y,
-                direction.z,
-            )
-
-            self._device.shader_set_uniform_vec3(
-                pipeline,
-                f"{prefix}.color",
-                light.color.r,
-                light.color.g,
-                light.color.b,
-            )
-
-            self._device.shader_set_uniform_float(
-                pipeline,
-                f"{prefix}.energy",
-                light.energy,
-            )
-
-            self._device.shader_set_uniform_float(
-                pipeline,
-                f"{prefix}.range",
-                light.range,
-            )
-
-            self._device.shader_set_uniform_float(
-                pipeline,
-                f"{prefix}.spot_angle_inner",
-                light.spot_angle_inner,
-            )
-
-            self._device.shader_set_uniform_float(
-                pipeline,
-                f"{prefix}.spot_angle_outer",
-                light.spot_angle_outer,
-            )
-
-            self._device.shader_set_uniform_float(
-                pipeline,
-                f"{prefix}.spot_attenuation",
-                light.spot_attenuation,
-            )
-
-        camera_pos = self._render_state.camera_position
-        if camera_pos is not None:
-            self._device.shader_set_uniform_vec3(
-                pipeline,
-                "u_camera_position",
-                camera_pos.x,
-                camera_pos.y,
-                camera_pos.z,
-            )
+        write_model = self._model_writers.get(pipeline)
+        if write_model is None:
+            write_model = self._device.get_uniform_writer(pipeline, "u_model", "mat4")
+            self._model_writers[pipeline] = write_model
+        write_model(item.transform.to_opengl_matrix())
 
         self._storage.bind_material(material_rid, self._device)
 
@@ -37,6 +37,12 @@ class ViewportRenderer:
             renderer_storage,
         )
 
+    def begin_frame(self) -> None:
+        self._canvas_renderer.begin_frame()
+
+    def end_frame(self) -> None:
+        self._canvas_renderer.end_frame()
+
     def render_viewport(self, viewport) -> None:
         self._device.set_render_target(viewport.render_target)
         self._device.set_viewport(0, 0, viewport.width, viewport.height)
@@ -183,4 +189,5 @@ class ViewportRenderer:
             self._canvas_renderer.render(
                 render_list=render_list,
                 viewport_transform=viewport_transform,
+                viewport_size=(viewport.width, viewport.height),
             )
@@ -45,6 +45,7 @@ class RenderingServer:
         self.canvas_server: CanvasServer | None = None
         self.scene_server: SceneServer | None = None
         self.viewport_server: ViewportServer | None = None
+        self.renderer: Renderer | None = None
 
         RenderingServer._singleton = self
 
@@ -112,16 +113,17 @@ class RenderingServer:
                 self.render_state.dirty_materials
             )
 
-        renderer = Renderer(
-            device=self.rendering_device,
-            render_state=self.render_state,
-            renderer_storage=self.renderer_storage,
-            scene_server=self.scene_server,
-            canvas_server=self.canvas_server,
-            viewport_server=self.viewport_server,
-        )
+        if self.renderer is None:
+            self.renderer = Renderer(
+                device=self.rendering_device,
+                render_state=self.render_state,
+                renderer_storage=self.renderer_storage,
+                scene_server=self.scene_server,
+                canvas_server=self.canvas_server,
+                viewport_server=self.viewport_server,
+            )
 
-        renderer.render()
+        self.renderer.render()
 
         self.render_state.clear()
 
@@ -1,6 +1,36 @@
 from engine.resources.material.base_material_3d import MaterialFeature
 from engine.resources.material.standard_material_3d import TransparencyMode
 
+# Uniform block binding point of SceneData, filled once per frame by the
+# scene renderer and shared by every material shader
+SCENE_DATA_BINDING = 0
+MAX_LIGHTS = 8
+
+# std140 layout: u_view at byte 0, u_projection at 64, u_camera_position at
+# 128, u_light_count at 140 and u_lights at 144, 64 bytes per Light
+SCENE_DATA_BLOCK = f"""
+        #define MAX_LIGHTS {MAX_LIGHTS}
+
+        struct Light {{
+            vec3 position;
+            vec3 direction;
+            vec3 color;
+            float energy;
+            float range;
+            float spot_angle_inner;
+            float spot_angle_outer;
+            float spot_attenuation;
+        }};
+
+        layout(std140) uniform SceneData {{
+            mat4 u_view;
+            mat4 u_projection;
+            vec3 u_camera_position;
+            int u_light_count;
+            Light u_lights[MAX_LIGHTS];
+        }};
+        """
+
 
 class ShaderCompiler:
     @staticmethod
@@ -28,16 +58,11 @@ class ShaderCompiler:
             layout(location = 7) in vec4 i_custom_data;
             """
 
-        if use_instancing:
-            vertex_uniforms = """
-        uniform mat4 u_view;
-        uniform mat4 u_projection;
-        """
-        else:
-            vertex_uniforms = """
+        vertex_uniforms = SCENE_DATA_BLOCK
+
+        if not use_instancing:
+            vertex_uniforms += """
         uniform mat4 u_model;
-        uniform mat4 u_view;
-        uniform mat4 u_projection;
         """
 
         vertex_uniforms += """
@@ -176,23 +201,7 @@ class ShaderCompiler:
         uniform float u_alpha_scissor_threshold;
         #endif
         
-        uniform vec3 u_camera_position;
-        
-        #define MAX_LIGHTS 8
-        
-        struct Light {{
-            vec3 position;
-            vec3 direction;
-            vec3 color;
-            float energy;
-            float range;
-            float spot_angle_inner;
-            float spot_angle_outer;
-            float spot_attenuation;
-        }};
-        
-        uniform int u_light_count;
-        uniform Light u_lights[MAX_LIGHTS];
+        {SCENE_DATA_BLOCK}
         
         float saturate(float v) {{
             return clamp(v, 0.0, 1.0);
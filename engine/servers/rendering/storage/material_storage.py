@@ -71,7 +71,10 @@ class MaterialStorage:
         if isinstance(material, StandardMaterial3D):
             transparency_mode = material._transparency_mode
 
-        from engine.servers.rendering.shader_compiler import ShaderCompiler
+        from engine.servers.rendering.shader_compiler import (
+            SCENE_DATA_BINDING,
+            ShaderCompiler,
+        )
 
         vs, fs = ShaderCompiler.generate_standard_material_shader(
             features, transparency_mode, use_instancing=False
@@ -91,12 +94,17 @@ class MaterialStorage:
         self._register_shader_uniforms(shader_rid)
         self._register_shader_uniforms(shader_rid_instanced)
 
+        self._shader_storage.shader_bind_uniform_block(
+            shader_rid, "SceneData", SCENE_DATA_BINDING
+        )
+        self._shader_storage.shader_bind_uniform_block(
+            shader_rid_instanced, "SceneData", SCENE_DATA_BINDING
+        )
+
     def _register_shader_uniforms(self, shader_rid: Any) -> None:
         s = self._shader_storage
 
         s.shader_set_uniform_meta(shader_rid, "u_model", "mat4")
-        s.shader_set_uniform_meta(shader_rid, "u_view", "mat4")
-        s.shader_set_uniform_meta(shader_rid, "u_projection", "mat4")
 
         s.shader_set_uniform_meta(shader_rid, "u_albedo_color", "vec4")
         s.shader_set_uniform_meta(shader_rid, "u_metallic", "float")
@@ -104,7 +112,6 @@ class MaterialStorage:
         s.shader_set_uniform_meta(shader_rid, "u_uv1_scale", "vec3")
         s.shader_set_uniform_meta(shader_rid, "u_uv1_offset", "vec3")
 
-        s.shader_set_uniform_meta(shader_rid, "u_camera_position", "vec3")
         s.shader_set_uniform_meta(shader_rid, "u_specular", "float")
         s.shader_set_uniform_meta(shader_rid, "u_use_blinn", "int")
 
@@ -126,6 +126,14 @@ class ShaderStorage:
         elif tag == "sampler2d":
             self._device.shader_set_uniform_texture(gpu, name, int(value))
 
+    def shader_bind_uniform_block(
+        self, shader_rid: Any, block_name: str, binding: int
+    ) -> None:
+        shader = self._shaders.get(shader_rid)
+        if shader is None:
+            return
+        self._device.shader_bind_uniform_block(shader.gpu_rid, block_name, binding)
+
     def shader_get(self, shader_rid: Any) -> Optional[ShaderData]:
         return self._shaders.get(shader_rid)
 
@@ -0,0 +1,157 @@
+"""
+Contact normals of the narrowphase solvers.
+
+Every solver reports the normal pointing from shape B towards shape A, the
+direction Space3D pushes body A along to separate the pair.
+"""
+
+import pytest
+
+import engine.core  # noqa: F401  (resolves the engine import order)
+from engine.math.datatypes.transform_3d import Transform3D
+from engine.math.datatypes.vector3 import Vector3
+from engine.servers.physics.collision_solver_3d import CollisionSolver3D
+from engine.servers.physics.enums import PhysicsServer3DEnums
+from engine.servers.physics.server import PhysicsServer3D
+from engine.servers.physics.solver.gjk import solve_gjk_epa
+from engine.servers.physics.storage.enums import BodyStateEnums
+
+DELTA = 1.0 / 60.0
+
+SPHERE = PhysicsServer3DEnums.SHAPE_SPHERE
+BOX = PhysicsServer3DEnums.SHAPE_BOX
+CAPSULE = PhysicsServer3DEnums.SHAPE_CAPSULE
+CYLINDER = PhysicsServer3DEnums.SHAPE_CYLINDER
+PLANE = PhysicsServer3DEnums.SHAPE_PLANE
+
+# Shape data and half height along Y of every shape the tests place
+SHAPES = {
+    SPHERE: ({"radius": 0.5}, 0.5),
+    BOX: ({"half_extents": Vector3(0.5, 0.5, 0.5)}, 0.5),
+    CAPSULE: ({"radius": 0.5, "height": 2.0}, 1.0),
+}
+
+# Pairs with a dedicated solver in CollisionSolver3D, each in both orders
+SOLVER_PAIRS = [
+    (SPHERE, SPHERE),
+    (BOX, BOX),
+    (CAPSULE, CAPSULE),
+    (CAPSULE, SPHERE),
+    (SPHERE, CAPSULE),
+    (CAPSULE, BOX),
+    (BOX, CAPSULE),
+    (CAPSULE, PLANE),
+    (PLANE, CAPSULE),
+    (SPHERE, BOX),
+    (BOX, SPHERE),
+    (SPHERE, PLANE),
+    (PLANE, SPHERE),
+    (BOX, PLANE),
+    (PLANE, BOX),
+]
+
+
+def _at(x, y, z):
+    transform = Transform3D()
+    transform.origin = Vector3(x, y, z)
+    return transform
+
+
+def _box_body(server, space, mode, y):
+    shape = server.shape_create(PhysicsServer3DEnums.SHAPE_BOX)
+    server.shape_set_data(shape, {"half_extents": Vector3(0.5, 0.5, 0.5)})
+    body = server.body_create()
+    server.body_set_mode(body, mode)
+    server.body_add_shape(body, shape)
+    transform = Transform3D()
+    transform.origin = Vector3(0.0, y, 0.0)
+    server.body_set_state(body, BodyStateEnums.BODY_STATE_TRANSFORM, transform)
+    server.body_set_space(body, space)
+    return body
+
+
+def test_box_resting_on_box():
+    server = PhysicsServer3D.get_singleton()
+    space_rid = server.space_create()
+    _box_body(server, space_rid, PhysicsServer3DEnums.BODY_MODE_STATIC, 0.0)
+    body_rid = _box_body(server, space_rid, PhysicsServer3DEnums.BODY_MODE_RIGID, 0.95)
+
+    space = server._spaces[space_rid].space_3d
+    body = space.bodies[body_rid.get_id()]
+
+    for _ in range(60):
+        body.linear_velocity = Vector3(0.0, -9.8 * DELTA, 0.0)
+        body.transform.origin += body.linear_velocity * DELTA
+        space._detect_collisions()
+        space._solve_collisions_simple(DELTA)
+
+        assert len(body.contacts) == 1
+        normal = body.contacts[0].local_normal
+        assert normal.y > 0.99
+        assert body.linear_velocity.y >= 0.0
+
+    assert body.transform.origin.y >= 0.95 - 1e-6
+
+    server.free_rid(space_rid)
+
+
+def test_epa_normal_matches_sphere_vs_sphere():
+    transform_A = _at(0.3, 0.5, 0.1)
+    transform_B = _at(0.0, 0.0, 0.0)
+    data = {"radius": 0.5}
+
+    analytic = CollisionSolver3D.solve_static(
+        SPHERE, transform_A, data, SPHERE, transform_B, data
+    )
+    epa = solve_gjk_epa(SPHERE, transform_A, data, SPHERE, transform_B, data)
+
+    assert epa.normal.dot(analytic.normal) > 0.99
+    assert (epa.point_a - analytic.point_a).length() < 0.05
+    assert (epa.point_b - analytic.point_b).length() < 0.05
+
+
+def test_epa_normal_points_from_b_to_a():
+    transform_A = _at(0.0, 0.8, 0.0)
+    transform_B = _at(0.0, 0.0, 0.0)
+
+    cylinder = CollisionSolver3D.solve_static(
+        CYLINDER,
+        transform_A,
+        {"radius": 0.5, "height": 1.0},
+        SPHERE,
+        transform_B,
+        {"radius": 0.5},
+    )
+    spheres = CollisionSolver3D.solve_static(
+        SPHERE, transform_A, {"radius": 0.5}, SPHERE, transform_B, {"radius": 0.5}
+    )
+
+    assert cylinder.normal.y > 0.99
+    assert cylinder.normal.dot(spheres.normal) > 0.99
+
+
+@pytest.mark.parametrize("shape_A_type, shape_B_type", SOLVER_PAIRS)
+def test_solver_normal_points_from_b_to_a(shape_A_type, shape_B_type):
+    # Place A overlapping B from above, so B to A is +Y
+    if shape_A_type == PLANE:
+        data_B, half_B = SHAPES[shape_B_type]
+        data_A = {"normal": Vector3(0.0, -1.0, 0.0), "d": 0.0}
+        transform_A = _at(0.0, 0.0, 0.0)
+        transform_B = _at(0.0, 0.1 - half_B, 0.0)
+    elif shape_B_type == PLANE:
+        data_A, half_A = SHAPES[shape_A_type]
+        data_B = {"normal": Vector3(0.0, 1.0, 0.0), "d": 0.0}
+        transform_A = _at(0.0, half_A - 0.1, 0.0)
+        transform_B = _at(0.0, 0.0, 0.0)
+    else:
+        data_A, half_A = SHAPES[shape_A_type]
+        data_B, half_B = SHAPES[shape_B_type]
+        transform_A = _at(0.0, half_A + half_B - 0.1, 0.0)
+        transform_B = _at(0.0, 0.0, 0.0)
+
+    result = CollisionSolver3D.solve_static(
+        shape_A_type, transform_A, data_A, shape_B_type, transform_B, data_B
+    )
+
+    assert result is not None
+    assert result.normal.y > 0.99